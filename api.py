@@ -1,5 +1,5 @@
 import os
-from typing import Literal, Union, Dict, Any
+from typing import Literal, Optional, Tuple, Union, Dict, Any
 from dotenv import load_dotenv
 from openai import OpenAI
 import ollama
@@ -11,6 +11,10 @@ load_dotenv()
 # LLMの種類を定義
 LLMType = Literal["deepseek", "local"]
 
+# 各LLMで使用するモデル
+DEEPSEEK_MODEL = "deepseek-chat"
+LOCAL_MODEL = "qwen2.5:latest"
+
 def get_client(llm_type: LLMType = "local") -> Union[OpenAI, ollama]:
     """LLMクライアントを取得
     
@@ -33,14 +37,13 @@ def get_client(llm_type: LLMType = "local") -> Union[OpenAI, ollama]:
                 "DeepSeek APIを使用するには DEEPSEEK_API_KEY を環境変数に設定してください。"
                 "\n.envファイルに DEEPSEEK_API_KEY=your_api_key_here を追加してください。"
             )
-        print("DeepSeek APIモデル 'deepseek-chat' を使用します。")
+        print(f"DeepSeek APIモデル '{DEEPSEEK_MODEL}' を使用します。")
         return OpenAI(api_key=api_key, base_url="https://api.deepseek.com/v1")
     
     elif llm_type == "local":
         # Ollamaが利用可能かチェック
         try:
-            required_model = "qwen2.5:latest"
-            print(f"Local LLMモデル '{required_model}' を使用します。")
+            print(f"Local LLMモデル '{LOCAL_MODEL}' を使用します。")
             return ollama
             
         except Exception as e:
@@ -53,12 +56,17 @@ def get_client(llm_type: LLMType = "local") -> Union[OpenAI, ollama]:
     
     raise ValueError(f"未対応のLLMタイプです: {llm_type}")
 
+def get_model_name(client: Union[OpenAI, ollama]) -> str:
+    """クライアントで使用するモデル名を取得"""
+    return DEEPSEEK_MODEL if isinstance(client, OpenAI) else LOCAL_MODEL
+
 # LLMの共通インターフェース
 def generate_chat_completion(
     client: Union[OpenAI, ollama],
     messages: list,
     response_format: dict = None,
-    temperature: float = 0.1
+    temperature: float = 0.1,
+    num_ctx: Optional[int] = None
 ) -> Dict[str, Any]:
     """LLMを使用してチャット応答を生成
     
@@ -67,6 +75,7 @@ def generate_chat_completion(
         messages: チャットメッセージのリスト
         response_format: 応答フォーマットの指定（DeepSeekのみ対応）
         temperature: 応答の多様性（0-1）
+        num_ctx: コンテキスト長（Local LLMのみ。省略時はOllamaの既定値で、超えたプロンプトは切り捨てられる）
         
     Returns:
         Dict[str, Any]: 統一された形式の応答
@@ -78,14 +87,15 @@ def generate_chat_completion(
                 },
                 'finish_reason': str
             }],
-            'model': str
+            'model': str,
+            'usage': {'prompt_tokens': int, 'completion_tokens': int}
         }
     """
     try:
         if isinstance(client, OpenAI):
             # DeepSeek APIを使用
             response = client.chat.completions.create(
-                model="deepseek-chat",
+                model=DEEPSEEK_MODEL,
                 messages=messages,
                 response_format=response_format,
                 temperature=temperature,
@@ -94,12 +104,15 @@ def generate_chat_completion(
             
         else:
             # Local LLM (Ollama) を使用
+            options = {"temperature": temperature}
+            if num_ctx is not None:
+                options["num_ctx"] = num_ctx
             response = client.chat(
-                model='qwen2.5:latest',
+                model=LOCAL_MODEL,
                 messages=messages,
                 stream=False,
                 format="json" if response_format else None,
-                options={"temperature": temperature}
+                options=options
             )
             
             # Ollamaの応答をDeepSeekと同じ形式に変換
@@ -111,7 +124,11 @@ def generate_chat_completion(
                     },
                     'finish_reason': 'stop'  # Ollamaは明示的なfinish_reasonを返さないため
                 }],
-                'model': response['model']
+                'model': response['model'],
+                'usage': {
+                    'prompt_tokens': response.get('prompt_eval_count'),
+                    'completion_tokens': response.get('eval_count')
+                }
             }
             
             # response_formatが指定されている場合、JSONとしてパースを試みる
@@ -132,3 +149,29 @@ def generate_chat_completion(
         error_msg = f"LLMの実行中にエラーが発生しました: {str(e)}"
         raise Exception(error_msg)
 
+
+def get_token_usage(response) -> Tuple[Optional[int], Optional[int]]:
+    """generate_chat_completionの応答から (プロンプトのトークン数, 出力のトークン数) を取得（不明な値はNone）"""
+    if isinstance(response, dict):
+        usage = response.get('usage') or {}
+        return usage.get('prompt_tokens'), usage.get('completion_tokens')
+    usage = getattr(response, 'usage', None)
+    if usage is None:
+        return None, None
+    return usage.prompt_tokens, usage.completion_tokens
+
+
+def generate_embeddings(texts: list, model: str) -> list:
+    """Ollamaの埋め込みモデルでテキストごとのベクトルを生成
+    
+    Args:
+        texts: 埋め込むテキストのリスト
+        model: Ollamaの埋め込みモデル名（nomic-embed-textなど）
+        
+    Returns:
+        list: テキストと同じ順のベクトル（floatのリスト）のリスト
+    """
+    try:
+        return [ollama.embeddings(model=model, prompt=text)['embedding'] for text in texts]
+    except Exception as e:
+        raise Exception(f"埋め込みの生成中にエラーが発生しました: {str(e)}")
@@ -0,0 +1,213 @@
+"""JobExtractorの抽出性能を合成ページと記録済みの実ページで計測し、コミット間で比較できる形で出力する
+
+パーサーごと（全体解析・部分解析）、ページ群ごとに以下を計測する。
+
+- ページ/秒・カード/秒（rounds回の最短）
+- ピークRSS（計測ごとに新しいプロセスで実行し、ページ読み込み後からの増加量も記録）
+- カード1件あたりのメモリ確保量（tracemallocで計測したPython側の確保量のピーク）
+- 抽出結果のダイジェスト（html.parserと一致しない場合は終了コード1）
+
+記録済みページは--recorded-dirの*.html（既定: benchmarks/recorded、リポジトリには含めない）。
+--record-from-archive Nで、HTMLアーカイブの保存済みページN件をそこへ書き出して固定できる。
+
+使い方:
+    python -m benchmarks.extraction_suite --synthetic 20 --cards 50 --json results.json
+    python -m benchmarks.extraction_suite --record-from-archive 30
+    python -m benchmarks.extraction_suite --compare base.json --json head.json --max-regression 0.1
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.processors.card_parser import PARSER_BACKENDS
+from src.processors.job_extractor import JobExtractor, job_to_dict
+from benchmarks.synthetic_pages import generate_page
+
+REFERENCE_BACKEND = "html.parser"
+RECORDED_DIR = Path(__file__).resolve().parent / "recorded"
+
+def load_corpora(args) -> dict:
+    """名前 -> ページ（HTML文字列）のリスト"""
+    corpora = {}
+    if args.synthetic:
+        corpora["synthetic"] = [generate_page(args.cards, seed=i) for i in range(args.synthetic)]
+    recorded = sorted(args.recorded_dir.glob("*.html"))
+    if recorded:
+        corpora["recorded"] = [page.read_text(encoding='utf-8') for page in recorded]
+    return corpora
+
+def record_from_archive(count: int, directory: Path) -> int:
+    """HTMLアーカイブの保存済みページ（内容が異なるもの）をcount件まで書き出す"""
+    from src.storage.html_archive import HTMLArchive
+
+    directory.mkdir(parents=True, exist_ok=True)
+    archive = HTMLArchive()
+    written = 0
+    try:
+        for page in archive.iter_pages(unique=True):
+            if written >= count:
+                break
+            (directory / f"{page.content_hash[:16]}.html").write_text(page.html, encoding='utf-8')
+            written += 1
+    finally:
+        archive.close()
+    return written
+
+def _max_rss_kb() -> int:
+    # Linuxではキロバイト、macOSではバイト単位
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+def _digest(results: list) -> str:
+    data = json.dumps([[job_to_dict(job) for job in jobs] for jobs in results], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+def run_case(backend: str, partial: bool, pages: list, rounds: int) -> dict:
+    """1つのパーサー・ページ群を計測する（新しいプロセスの中で呼ばれる）"""
+    baseline_rss = _max_rss_kb()
+    extractor = JobExtractor(parser=backend, partial_parse=partial)
+    results = [extractor.extract_jobs_from_html(html) for html in pages]  # ウォームアップを兼ねる
+    cards = sum(len(jobs) for jobs in results)
+
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for html in pages:
+            extractor.extract_jobs_from_html(html)
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    for html in pages:
+        extractor.extract_jobs_from_html(html)
+    _, peak_alloc = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    largest_page_cards = max(len(jobs) for jobs in results) if results else 0
+
+    return {
+        "backend": backend,
+        "partial": partial,
+        "pages": len(pages),
+        "cards": cards,
+        "seconds": best,
+        "pages_per_sec": len(pages) / best if best else 0.0,
+        "cards_per_sec": cards / best if best else 0.0,
+        "peak_rss_kb": _max_rss_kb(),
+        "rss_growth_kb": _max_rss_kb() - baseline_rss,
+        # ページは1件ずつ抽出するため、ピークは最も大きいページのカード数で割る
+        "alloc_bytes_per_card": peak_alloc / largest_page_cards if largest_page_cards else 0.0,
+        "digest": _digest(results),
+    }
+
+def run_isolated(backend: str, partial: bool, pages: list, rounds: int) -> dict:
+    """ピークRSSが他の計測の影響を受けないよう、計測ごとに新しいプロセスで実行する"""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(run_case, (backend, partial, pages, rounds))
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def _case_key(result: dict) -> tuple:
+    return result["corpus"], result["backend"], result["partial"]
+
+def compare(previous: dict, results: list, max_regression: float) -> bool:
+    """前回の結果と比べてカード/秒を表示し、max_regressionを超えて遅くなった計測があればTrueを返す"""
+    before = {_case_key(result): result for result in previous["results"]}
+    regressed = False
+    print(f"\n前回（{previous.get('commit') or '不明'}）との比較:")
+    for result in results:
+        old = before.get(_case_key(result))
+        if old is None or not old["cards_per_sec"]:
+            continue
+        ratio = result["cards_per_sec"] / old["cards_per_sec"]
+        mark = ""
+        if ratio < 1 - max_regression:
+            regressed = True
+            mark = "  ← 低下"
+        print(f"  {result['corpus']:>9} {_label(result):>16}: カード/秒 {ratio:.2f}倍"
+              f"（ピークRSS {result['peak_rss_kb'] - old['peak_rss_kb']:+,}KB）{mark}")
+    return regressed
+
+def _label(result: dict) -> str:
+    return result["backend"] + ("（部分）" if result["partial"] else "")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synthetic", type=int, default=20, help="合成ページの件数（0で合成ページを使わない）")
+    parser.add_argument("--cards", type=int, default=50, help="合成ページ1件あたりの案件数")
+    parser.add_argument("--recorded-dir", type=Path, default=RECORDED_DIR)
+    parser.add_argument("--record-from-archive", type=int, metavar="N",
+                        help="HTMLアーカイブのページをN件--recorded-dirに書き出して終了する")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--backends", nargs="+", default=list(PARSER_BACKENDS), choices=list(PARSER_BACKENDS))
+    parser.add_argument("--full-only", action="store_true", help="部分解析を計測しない")
+    parser.add_argument("--json", type=Path, help="結果をJSONで保存するパス")
+    parser.add_argument("--compare", type=Path, help="比較する前回の結果（--jsonで保存したもの）")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="--compare時、カード/秒がこの割合を超えて低下したら終了コード1")
+    args = parser.parse_args()
+
+    if args.record_from_archive:
+        written = record_from_archive(args.record_from_archive, args.recorded_dir)
+        print(f"{written}ページを {args.recorded_dir} に書き出しました")
+        return
+
+    corpora = load_corpora(args)
+    if not corpora:
+        sys.exit("計測するページがありません（--syntheticを指定するか、--recorded-dirにHTMLファイルを置いてください）")
+
+    backends = [REFERENCE_BACKEND] + [b for b in args.backends if b != REFERENCE_BACKEND]
+    results = []
+    mismatched = False
+    for corpus, pages in corpora.items():
+        print(f"[{corpus}] {len(pages)}ページ（{sum(map(len, pages)) / 1024:.0f}KB）")
+        reference_digest = None
+        for backend in backends:
+            for partial in ([False] if args.full_only else [False, True]):
+                result = {"corpus": corpus, **run_isolated(backend, partial, pages, args.rounds)}
+                results.append(result)
+                reference_digest = reference_digest or result["digest"]
+                matches = result["digest"] == reference_digest
+                mismatched = mismatched or not matches
+                print(f"  {_label(result):>16}: {result['pages_per_sec']:8.1f}ページ/秒 {result['cards_per_sec']:10,.0f}カード/秒 "
+                      f"ピークRSS {result['peak_rss_kb'] / 1024:6.1f}MB（+{result['rss_growth_kb'] / 1024:.1f}MB） "
+                      f"確保 {result['alloc_bytes_per_card']:,.0f}バイト/カード"
+                      f"{'' if matches else '  ← 抽出結果が' + REFERENCE_BACKEND + 'と不一致'}")
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {"synthetic": args.synthetic, "cards": args.cards, "rounds": args.rounds},
+        "results": results,
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding='utf-8')
+        print(f"\n結果を {args.json} に保存しました")
+
+    regressed = False
+    if args.compare:
+        regressed = compare(json.loads(args.compare.read_text(encoding='utf-8')), results, args.max_regression)
+
+    if mismatched:
+        sys.exit(f"{REFERENCE_BACKEND}と抽出結果が異なるパーサーがあります")
+    if regressed:
+        sys.exit(f"カード/秒が{args.max_regression:.0%}を超えて低下した計測があります")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""保存済みページを配信するローカルHTTPサーバーで取得方式のスループットを比較する
+
+使い方:
+    python -m benchmarks.fetch_throughput --pages-dir data/html --rounds 5 [--browser]
+"""
+import argparse
+import functools
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.scrapers.http_fetcher import HTTPFetcher
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve_directory(directory: Path) -> ThreadingHTTPServer:
+    """directoryを配信するHTTPサーバーを別スレッドで起動する"""
+    handler = functools.partial(_QuietHandler, directory=str(directory))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def bench_http(urls, rounds: int) -> dict:
+    fallbacks = 0
+    started = time.perf_counter()
+    with HTTPFetcher() as fetcher:
+        for _ in range(rounds):
+            for url in urls:
+                if fetcher.fetch(url).needs_browser:
+                    fallbacks += 1
+    elapsed = time.perf_counter() - started
+    return {"backend": "http", "pages": len(urls) * rounds, "seconds": elapsed, "needs_browser": fallbacks}
+
+def bench_browser(urls, rounds: int) -> dict:
+    from src.scrapers.html_scraper import HTMLScraper
+    from src.scrapers.page_readiness import load_listing_page
+
+    started = time.perf_counter()
+    with HTMLScraper() as scraper:
+        with scraper.pool.page() as page:
+            blocker = scraper._attach_blocker(page)
+            for _ in range(rounds):
+                for url in urls:
+                    load_listing_page(page, url, blocker, timeout=5)
+                    scraper.pool.record_navigation()
+                    page.content()
+    elapsed = time.perf_counter() - started
+    return {"backend": "browser", "pages": len(urls) * rounds, "seconds": elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages-dir", type=Path, default=Path("data/html"))
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--browser", action="store_true", help="ブラウザ経由の取得も計測する")
+    args = parser.parse_args()
+
+    pages = sorted(args.pages_dir.glob("*.html"))
+    if not pages:
+        sys.exit(f"HTMLファイルが見つかりません: {args.pages_dir}")
+
+    server = serve_directory(args.pages_dir)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/{page.name}" for page in pages]
+
+    try:
+        results = [bench_http(urls, args.rounds)]
+        if args.browser:
+            results.append(bench_browser(urls, args.rounds))
+    finally:
+        server.shutdown()
+
+    for result in results:
+        rate = result["pages"] / result["seconds"] if result["seconds"] else 0.0
+        extra = f", ブラウザ必要 {result['needs_browser']}件" if "needs_browser" in result else ""
+        print(f"{result['backend']:>8}: {result['pages']}ページ {result['seconds']:.2f}秒 ({rate:.1f}ページ/秒{extra})")
+
+if __name__ == "__main__":
+    main()
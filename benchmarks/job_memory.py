@@ -0,0 +1,66 @@
+"""案件の履歴をメモリに保持したときの1件あたりのメモリ使用量を、辞書とJobItemで比較する
+
+JSONから読み込んだ辞書（従来の形式）と、job_from_dictで復元したJobItem
+（__slots__・文字列のインターン・予算と掲載日の共有）をそれぞれN件保持し、
+tracemallocで計測した増加量から1件あたりの大きさと50万件時の見積もりを表示する。
+
+使い方:
+    python -m benchmarks.job_memory --jobs 100000
+"""
+import argparse
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.processors.job_extractor import JobExtractor, JobView, job_from_dict, job_to_dict
+from benchmarks.synthetic_pages import generate_page
+
+def load_records(num_jobs: int) -> list:
+    """合成ページから抽出した案件を、案件IDと説明文を変えながらnum_jobs件のJSON文字列にする"""
+    base = [job_to_dict(job) for job in JobExtractor().extract_jobs_from_html(generate_page(1000, seed=0))]
+    records = []
+    for i in range(num_jobs):
+        record = dict(base[i % len(base)])
+        record['job_id'] = str(1_000_000 + i)
+        record['url'] = f"/public/jobs/{1_000_000 + i}"
+        record['description'] = f"{record['description']}\n（{i}）"  # 説明文は案件ごとに異なる
+        records.append(json.dumps(record, ensure_ascii=False))
+    return records
+
+def measure(records: list, convert) -> float:
+    """recordsを全件読み込んで保持したときのメモリ増加量（バイト）"""
+    gc.collect()
+    tracemalloc.start()
+    held = [convert(json.loads(record)) for record in records]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=100_000)
+    args = parser.parse_args()
+
+    records = load_records(args.jobs)
+    results = {
+        "辞書": measure(records, lambda data: data),
+        "JobItem": measure(records, job_from_dict),
+    }
+
+    # JobViewは辞書と同じ値を返すこと（マッチング処理にそのまま渡せること）を確認する
+    data = json.loads(records[0])
+    assert JobView(job_from_dict(data)) == data
+
+    print(f"案件 {args.jobs:,}件を保持したときのメモリ使用量")
+    for label, size in results.items():
+        per_job = size / args.jobs
+        print(f"  {label:>8}: 1件あたり {per_job:,.0f}バイト（50万件で約{per_job * 500_000 / 1024 / 1024:,.0f}MB）")
+    print(f"  削減率: {1 - results['JobItem'] / results['辞書']:.0%}")
+
+if __name__ == "__main__":
+    main()
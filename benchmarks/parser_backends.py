@@ -0,0 +1,88 @@
+"""同じページ群に対してHTMLパーサーごとの抽出速度を比較し、結果が従来の実装と一致するか確認する
+
+各パーサーを全体解析と部分解析（案件カードのみ）の両方で計測する。
+メモリはtracemallocで計測するため、Python側で確保した分のみを表す（lxml内部のメモリは含まない）。
+
+使い方:
+    python -m benchmarks.parser_backends --pages-dir data/html --rounds 3
+    python -m benchmarks.parser_backends --synthetic 20 --cards 50
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.processors.card_parser import PARSER_BACKENDS
+from src.processors.job_extractor import JobExtractor
+from benchmarks.synthetic_pages import generate_page
+
+REFERENCE_BACKEND = "html.parser"
+
+def load_corpus(args) -> list:
+    if args.synthetic:
+        return [generate_page(args.cards, seed=i) for i in range(args.synthetic)]
+    pages = sorted(args.pages_dir.glob("*.html"))
+    if not pages:
+        sys.exit(f"HTMLファイルが見つかりません: {args.pages_dir}（--syntheticで合成ページを使用できます）")
+    return [page.read_text(encoding='utf-8') for page in pages]
+
+def bench_backend(backend: str, partial: bool, corpus: list, rounds: int) -> dict:
+    extractor = JobExtractor(parser=backend, partial_parse=partial)
+    results = [extractor.extract_jobs_from_html(html) for html in corpus]  # 比較用（計測前のウォームアップも兼ねる）
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for html in corpus:
+            extractor.extract_jobs_from_html(html)
+    elapsed = time.perf_counter() - started
+
+    # 最も大きいページ1件を抽出する間のメモリ使用量のピーク
+    tracemalloc.start()
+    extractor.extract_jobs_from_html(max(corpus, key=len))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "backend": backend + ("（部分）" if partial else ""),
+        "pages": len(corpus) * rounds,
+        "cards": sum(len(jobs) for jobs in results) * rounds,
+        "seconds": elapsed,
+        "peak_kb": peak / 1024,
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages-dir", type=Path, default=Path("data/html"))
+    parser.add_argument("--synthetic", type=int, default=0, help="保存済みページの代わりに合成ページをN件使う")
+    parser.add_argument("--cards", type=int, default=50, help="合成ページ1件あたりの案件数")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--full-only", action="store_true", help="部分解析を計測しない")
+    parser.add_argument("--backends", nargs="+", default=list(PARSER_BACKENDS), choices=list(PARSER_BACKENDS))
+    args = parser.parse_args()
+
+    corpus = load_corpus(args)
+    backends = [REFERENCE_BACKEND] + [b for b in args.backends if b != REFERENCE_BACKEND]
+    results = [
+        bench_backend(backend, partial, corpus, args.rounds)
+        for backend in backends
+        for partial in ([False] if args.full_only else [False, True])
+    ]
+    reference = results[0]
+
+    mismatched = False
+    for result in results:
+        rate = result["pages"] / result["seconds"] if result["seconds"] else 0.0
+        speedup = reference["seconds"] / result["seconds"] if result["seconds"] else 0.0
+        diff_pages = sum(1 for a, b in zip(reference["results"], result["results"]) if a != b)
+        mismatched = mismatched or diff_pages > 0
+        print(f"{result['backend']:>16}: {result['pages']}ページ {result['cards']}件 {result['seconds']:.2f}秒 "
+              f"({rate:.1f}ページ/秒, {speedup:.1f}倍, ピーク {result['peak_kb']:.0f}KB, 不一致 {diff_pages}ページ)")
+
+    if mismatched:
+        sys.exit(f"{REFERENCE_BACKEND}と抽出結果が異なるパーサーがあります")
+
+if __name__ == "__main__":
+    main()
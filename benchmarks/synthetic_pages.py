@@ -0,0 +1,83 @@
+"""CrowdWorksの一覧ページと同じクラス構造を持つ合成HTMLを生成する
+
+案件カード（div.UNzN7）の中に、タイトル・説明・予算（div.mLant）・
+クライアント名と掲載日（div.rGkuO）・掲載日（div.cAtkF）・詳細リンクを配置する。
+実際のページに近づけるため、ヘッダー・サイドバー・スクリプトなどのカード外の要素や、
+PR案件・URLなし・コメント・文字参照などの揺れも含める。
+"""
+import random
+from html import escape
+
+_TITLES = [
+    "LPデザインの作成", "ChatGPTを使った社内チャットボット開発", "機械学習モデルの精度改善",
+    "Figmaでのアプリ画面デザイン", "データサイエンス分析レポート作成", "AIアノテーション作業",
+    "WordPressサイトの保守・運用", "Python & Django API開発", "画像認識システムのPoC",
+]
+_CATEGORIES = [
+    "AI・機械学習", "機械学習・ディープラーニング", "AI・チャットボット開発",
+    "ChatGPT開発", "AIアノテーション", "データサイエンス", "Webデザイン", "",
+]
+_DESCRIPTIONS = [
+    "フルリモートで対応可能な方を募集します。",
+    "経験者優遇。継続案件になる可能性があります。",
+    "<b>Python</b>での開発経験がある方を募集しています。",
+    "詳細はメッセージにてご相談ください &amp; お気軽にどうぞ。",
+    "週10時間程度の稼働を想定しています。<br>納期は相談可能です。",
+]
+_CLIENTS = ["株式会社サンプル", "合同会社テスト", "山田太郎", "AIラボ株式会社", "デザイン事務所A"]
+
+def _budget(rng: random.Random) -> str:
+    kind = rng.random()
+    low = rng.randint(1, 300) * 1000
+    if kind < 0.55:
+        return f"固定報酬制 {low:,}円 〜 {low + rng.randint(1, 100) * 1000:,}円"
+    if kind < 0.8:
+        return f"時間単価制 {rng.randint(1, 5) * 500:,}円 / 時間"
+    if kind < 0.9:
+        return "固定報酬制 相談して決める"
+    return f"コンペ {low:,}円"
+
+def generate_card(rng: random.Random, job_id: int) -> str:
+    """案件カード1件分のHTML"""
+    is_pr = rng.random() < 0.1
+    title = rng.choice(_TITLES)
+    category = rng.choice(_CATEGORIES)
+    client = rng.choice(_CLIENTS)
+    day = rng.randint(1, 28)
+    posted = f"2024年{rng.randint(1, 12):02d}月{day:02d}日"
+    description = " ".join(rng.sample(_DESCRIPTIONS, k=rng.randint(1, 3)))
+    has_url = rng.random() > 0.05
+    has_date = rng.random() > 0.03
+
+    title_html = escape(f"{title} {category}".strip())
+    parts = [
+        '<div class="UNzN7 job-card">',
+        f'<div class="hd2ei">{"<span>PR</span>" if is_pr else ""}'
+        + (f'<a href="/public/jobs/{job_id}">{title_html}</a>' if has_url else title_html)
+        + "</div>\n",
+        f'<div class="desc"><!-- description -->{description}\n</div>\n',
+        f'<div class="mLant">{_budget(rng)}</div>\n',
+        f'<div class="mLant">あと{rng.randint(1, 14)}日（2024年12月{day:02d}日まで）</div>\n',
+        f'<div class="rGkuO"><span>{escape(client)}</span>掲載日：{posted}</div>\n',
+    ]
+    if has_date:
+        parts.append(f'<div class="cAtkF">{posted}</div>\n')
+    parts.append("</div>\n")
+    return "".join(parts)
+
+def generate_page(num_cards: int = 50, seed: int = 0) -> str:
+    """num_cards件の案件カードを含む一覧ページのHTML"""
+    rng = random.Random(seed)
+    cards = "".join(generate_card(rng, 10_000_000 + seed * 100_000 + i) for i in range(num_cards))
+    sidebar = "".join(f'<li><a href="/public/jobs/category/{i}">カテゴリ{i}</a></li>' for i in range(40))
+    return (
+        "<!DOCTYPE html><html lang=\"ja\"><head><meta charset=\"utf-8\"><title>仕事一覧</title>"
+        "<script>window.__INITIAL_STATE__ = {\"jobs\": []};</script>"
+        "<style>.UNzN7{display:block}</style></head><body>"
+        "<header><nav><a href=\"/\">CrowdWorks</a></nav></header>"
+        f"<aside><ul>{sidebar}</ul></aside>"
+        f"<main><div class=\"list\">{cards}</div>"
+        "<nav><a href=\"?page=2\">次のページ</a></nav></main>"
+        "<footer><p>&copy; CrowdWorks</p><script>console.log('footer')</script></footer>"
+        "</body></html>"
+    )
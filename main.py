@@ -1,16 +1,26 @@
 import json
 import sys
-import time
 from pathlib import Path
 from typing import Dict, List, Optional
 from datetime import datetime
 
 from src.scrapers.html_scraper import HTMLScraper
-from src.processors.job_extractor import JobExtractor
+from src.scrapers.async_html_scraper import AsyncHTMLScraper
+from src.scrapers.http_fetcher import HTTPFetcher
+from src.scrapers.seen_jobs import SeenJobsStore
+from src.scrapers.screenshot import ScreenshotWriter, screenshot_paths_for
+from src.scrapers.html_archiver import HTMLArchiver
+from src.storage.html_archive import HTMLArchive
+from src.storage.extraction_cache import ExtractionCache
+from src.storage.job_store import JobStore
+from src.storage.score_cache import ScoreCache
+from src.storage.jsonl import JSONLWriter, jsonl_path
+from src.processors.job_extractor import JobExtractor, JobView, job_to_dict
 from src.processors.job_matcher import JobMatcher
+from src.filters.prefilter import create_prefilter
 from src.models.user_profile import UserProfile
 from src.utils.config import (
-    SCRAPING_CONFIG, MATCHING_CONFIG, 
+    JOBS_DIR, MATCHES_DIR, SCRAPING_CONFIG, MATCHING_CONFIG, 
     USER_PROFILE_CONFIG, EXECUTION_CONFIG, OUTPUT_CONFIG, LLM_CATEGORY_SELECTION_CONFIG
 )
 from api import generate_chat_completion
@@ -19,9 +29,28 @@ class CrowdWorksCategoryExplorer:
     """カテゴリベースのCrowdWorks案件探索システム"""
     
     def __init__(self):
-        self.html_scraper = HTMLScraper()
-        self.job_extractor = JobExtractor()
-        self.job_matcher = JobMatcher()
+        # 差分取得用の取得済み案件の記録
+        self.seen_jobs = SeenJobsStore() if EXECUTION_CONFIG.get("incremental_crawl", False) else None
+        self.screenshots = ScreenshotWriter.from_config()
+        self.html_scraper = HTMLScraper(seen_jobs=self.seen_jobs, screenshots=self.screenshots)
+        self.http_fetcher = HTTPFetcher(fallback=self.html_scraper, seen_jobs=self.seen_jobs)
+        self.async_scraper = AsyncHTMLScraper(seen_jobs=self.seen_jobs, screenshots=self.screenshots)
+        # ストリーミング抽出時に生のHTMLを保存する場合の書き込み先
+        self.html_archiver = None
+        if EXECUTION_CONFIG.get("archive_raw_html", True):
+            archive_max_mb = EXECUTION_CONFIG.get("archive_max_mb")
+            self.html_archiver = HTMLArchiver(HTMLArchive(
+                max_bytes=archive_max_mb * 1024 * 1024 if archive_max_mb else None,
+                retention_days=EXECUTION_CONFIG.get("archive_retention_days")
+            ))
+        self.job_extractor = JobExtractor(cache=ExtractionCache.from_config())
+        self.job_store = JobStore()
+        # 実行中に抽出済みの案件ID（カテゴリをまたいだ重複除去用）
+        self.run_job_ids = set()
+        # 抽出した案件を1件ずつ追記するJSON Linesファイル（run()の中で作成）
+        self.jobs_writer = None
+        self.job_matcher = JobMatcher(store=self.job_store, score_cache=ScoreCache.from_config(),
+                                      prefilter=create_prefilter())
         self.categories_file = Path("categories.json")
         
         # セッション中に保存されたファイルを追跡
@@ -74,7 +103,13 @@ class CrowdWorksCategoryExplorer:
             
             # 複数ページ対応のチェック
             max_pages = EXECUTION_CONFIG.get("max_pages_per_category", 1)
-            if max_pages > 1:
+            if SCRAPING_CONFIG.get("fetch_backend", "browser") == "http":
+                # ブラウザを使わずにHTTPで取得（必要な場合はブラウザにフォールバック）
+                html_files = self.http_fetcher.save_html_with_pagination(
+                    category_url=category_url,
+                    max_pages=max_pages
+                )
+            elif max_pages > 1:
                 # 複数ページスクレイピング
                 html_files = self.html_scraper.save_html_with_pagination(
                     category_url=category_url, 
@@ -85,17 +120,7 @@ class CrowdWorksCategoryExplorer:
                 html_file = self.html_scraper.save_html_single()
                 html_files = [html_file]
             
-            # 保存されたファイルを記録
-            self.saved_files['html_files'].extend(html_files)
-            
-            # スクリーンショットファイルも記録
-            if EXECUTION_CONFIG["save_screenshots"]:
-                for html_file in html_files:
-                    timestamp = html_file.stem.replace('page_', '')
-                    screenshot_file = html_file.parent / f'screenshot_{timestamp}.png'
-                    if screenshot_file.exists():
-                        self.saved_files['screenshot_files'].append(screenshot_file)
-            
+            self._record_html_files(html_files)
             return html_files
         
         except Exception as e:
@@ -106,29 +131,91 @@ class CrowdWorksCategoryExplorer:
             # 設定を元に戻す
             SCRAPING_CONFIG["base_url"] = original_url
     
+    def scrape_categories_concurrently(self, category_urls: List[str]) -> Dict[str, List[Path]]:
+        """複数カテゴリの案件を並行スクレイピング"""
+        max_pages = EXECUTION_CONFIG.get("max_pages_per_category", 1)
+        try:
+            html_files_by_url = self.async_scraper.scrape_categories(category_urls, max_pages=max_pages)
+        except Exception as e:
+            print(f"並行スクレイピング中にエラーが発生しました: {e}")
+            return {}
+        
+        for html_files in html_files_by_url.values():
+            self._record_html_files(html_files)
+        return html_files_by_url
+    
+    def _record_html_files(self, html_files: List[Path]) -> None:
+        """保存されたHTMLファイルとスクリーンショットを記録"""
+        self.saved_files['html_files'].extend(html_files)
+        self._record_screenshots(html_files)
+    
+    def _record_screenshots(self, html_files: List[Path]) -> None:
+        """HTMLファイル（名）に対応するスクリーンショットを記録"""
+        # 書き込み待ちの分を保存し終えてから確認
+        if self.screenshots.mode != "off":
+            self.screenshots.flush()
+            for html_file in html_files:
+                for screenshot_file in screenshot_paths_for(html_file):
+                    if screenshot_file.exists():
+                        self.saved_files['screenshot_files'].append(screenshot_file)
+    
     def extract_jobs_only(self, html_files: List[Path]) -> List:
         """HTMLファイルから案件を抽出するのみ（ファイル保存なし）"""
         if OUTPUT_CONFIG["console_output"]:
             print("案件情報を抽出中...")
         
-        all_jobs = []
+        extracted_count = 0
+        unique_jobs = []
         
-        # 複数のHTMLファイルから案件を抽出
-        for i, html_file in enumerate(html_files, 1):
+        # 複数のHTMLファイルから案件を抽出（ファイル数が多い場合は複数プロセスで並列に抽出）
+        extracted = self.job_extractor.extract_jobs_parallel(html_files)
+        for i, (html_file, jobs) in enumerate(zip(html_files, extracted), 1):
             if OUTPUT_CONFIG["console_output"]:
                 print(f"  ファイル {i}/{len(html_files)}: {html_file.name}")
             
-            jobs = self.job_extractor.extract_jobs(html_file)
-            all_jobs.extend(jobs)
+            # 重複案件を除去し、新しい案件はすぐに書き出す
+            extracted_count += len(jobs)
+            unique_jobs.extend(self._accept_new_jobs(jobs))
             
             if OUTPUT_CONFIG["console_output"]:
                 print(f"    抽出件数: {len(jobs)}件")
         
-        # 重複案件の除去
-        unique_jobs = self._remove_duplicate_jobs(all_jobs)
+        if OUTPUT_CONFIG["console_output"]:
+            print(f"合計抽出件数: {extracted_count}件")
+            print(f"重複除去後: {len(unique_jobs)}件")
+        
+        return unique_jobs
+    
+    def scrape_and_extract_streaming(self, category_url: str) -> List:
+        """カテゴリの案件を取得しながら抽出する（HTMLの保存はバックグラウンドで任意）"""
+        if OUTPUT_CONFIG["console_output"]:
+            print(f"カテゴリページを取得しながら案件を抽出中: {category_url}")
+        
+        max_pages = EXECUTION_CONFIG.get("max_pages_per_category", 1)
+        if SCRAPING_CONFIG.get("fetch_backend", "browser") == "http":
+            pages = self.http_fetcher.iter_pages(category_url, max_pages)
+        else:
+            pages = self.html_scraper.iter_pages(category_url, max_pages)
+        
+        extracted_count = 0
+        unique_jobs = []
+        page_files = []  # スクリーンショットの照合用（HTMLファイル自体は作成しない）
+        for page, jobs in self.job_extractor.extract_jobs_streaming(pages):
+            if self.html_archiver is not None:
+                self.html_archiver.archive(page)
+            page_files.append(self.html_scraper.save_dir / page.html_filename)
+            
+            # 重複案件を除去し、新しい案件はすぐに書き出す
+            extracted_count += len(jobs)
+            unique_jobs.extend(self._accept_new_jobs(jobs))
+            
+            if OUTPUT_CONFIG["console_output"]:
+                print(f"    ページ {page.page_num} の抽出件数: {len(jobs)}件")
+        
+        self._record_screenshots(page_files)
         
         if OUTPUT_CONFIG["console_output"]:
-            print(f"合計抽出件数: {len(all_jobs)}件")
+            print(f"合計抽出件数: {extracted_count}件")
             print(f"重複除去後: {len(unique_jobs)}件")
         
         return unique_jobs
@@ -143,10 +230,10 @@ class CrowdWorksCategoryExplorer:
         if OUTPUT_CONFIG["console_output"]:
             print("案件のマッチング評価を実行中...")
         
-        # 一時的に案件を設定してマッチング実行
-        self.job_matcher.jobs = jobs
+        # 抽出した案件を辞書にコピーせずに渡してマッチング実行
         matches = self.job_matcher.find_matching_jobs(
             user_profile=self.user_profile,
+            jobs=[JobView(job) for job in jobs],
             min_score=MATCHING_CONFIG["min_score"],
             max_jobs=MATCHING_CONFIG["max_jobs"]
         )
@@ -160,10 +247,13 @@ class CrowdWorksCategoryExplorer:
             print(f"   総案件数: {len(all_jobs)}件")
             print(f"   マッチング結果: {len(all_matches)}件")
         
-        # 全案件をJSONで保存
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        job_file = self.job_extractor.save_jobs_to_json(all_jobs, timestamp)
-        self.saved_files['job_files'].append(job_file)
+        # 全案件を案件ストアに保存（設定により従来のJSONにも保存）
+        self.job_extractor.save_jobs(all_jobs, self.job_store)
+        job_file = self.job_store.path
+        if EXECUTION_CONFIG.get("save_jobs_json", False):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            job_file = self.job_extractor.save_jobs_to_json(all_jobs, timestamp)
+            self.saved_files['job_files'].append(job_file)
         
         # 全マッチング結果を保存
         if all_matches:
@@ -186,16 +276,21 @@ class CrowdWorksCategoryExplorer:
             if latest_match_file not in self.saved_files['match_files']:
                 self.saved_files['match_files'].append(latest_match_file)
     
+    def _accept_new_jobs(self, jobs: List) -> List:
+        """重複案件を除去し、残った案件をJSON Linesファイルに追記する"""
+        unique_jobs = self._remove_duplicate_jobs(jobs)
+        if self.jobs_writer is not None:
+            self.jobs_writer.write_all(job_to_dict(job) for job in unique_jobs)
+        return unique_jobs
+    
     def _remove_duplicate_jobs(self, jobs: List) -> List:
-        """重複案件を除去する"""
+        """重複案件を除去する（この実行で他のカテゴリから抽出済みの案件も除く）"""
         unique_jobs = []
-        seen_titles = set()
         
         for job in jobs:
-            # タイトルとクライアント名の組み合わせで重複チェック
-            job_key = (job.title, job.client_name)
-            if job_key not in seen_titles:
-                seen_titles.add(job_key)
+            # 案件IDで重複チェック
+            if job.job_id not in self.run_job_ids:
+                self.run_job_ids.add(job.job_id)
                 unique_jobs.append(job)
         
         return unique_jobs
@@ -263,6 +358,23 @@ class CrowdWorksCategoryExplorer:
                     print(f"   - {file_path}")
                 total_files += 1
         
+        if self.html_archiver is not None:
+            self.html_archiver.flush()
+            stats = self.html_archiver.archive_store.stats()
+            if stats['pages']:
+                print(f"\n🗄️  HTMLアーカイブ: {stats['pages']}ページ / {stats['blobs']}件の内容"
+                      f"（{stats['raw_bytes'] / 1024:.1f}KB → 圧縮後 {stats['stored_bytes'] / 1024:.1f}KB）")
+        
+        if self.job_extractor.cache is not None:
+            stats = self.job_extractor.cache.stats()
+            if stats['hits'] + stats['misses']:
+                print(f"\n♻️  抽出結果キャッシュ: ヒット率 {stats['hit_rate']:.0%}（{stats['hits']}/{stats['hits'] + stats['misses']}ページ、"
+                      f"保存済み {stats['entries']}件 {stats['bytes'] / 1024:.1f}KB）")
+        
+        stored_jobs = self.job_store.count()
+        if stored_jobs:
+            print(f"\n🗃️  案件ストア: {self.job_store.path}（保存済み {stored_jobs}件）")
+        
         if self.saved_files['screenshot_files']:
             print(f"\n📸 スクリーンショット ({len(self.saved_files['screenshot_files'])}件):")
             for file_path in self.saved_files['screenshot_files']:
@@ -274,7 +386,7 @@ class CrowdWorksCategoryExplorer:
                 total_files += 1
         
         if self.saved_files['job_files']:
-            print(f"\n📋 案件データ (JSON) ({len(self.saved_files['job_files'])}件):")
+            print(f"\n📋 案件データ (JSON/JSONL) ({len(self.saved_files['job_files'])}件):")
             for file_path in self.saved_files['job_files']:
                 if OUTPUT_CONFIG["show_file_sizes"]:
                     file_size = file_path.stat().st_size / 1024  # KB
@@ -284,7 +396,7 @@ class CrowdWorksCategoryExplorer:
                 total_files += 1
         
         if self.saved_files['match_files']:
-            print(f"\n📊 マッチング結果 (CSV) ({len(self.saved_files['match_files'])}件):")
+            print(f"\n📊 マッチング結果 (CSV/JSONL) ({len(self.saved_files['match_files'])}件):")
             for file_path in self.saved_files['match_files']:
                 if OUTPUT_CONFIG["show_file_sizes"]:
                     file_size = file_path.stat().st_size / 1024  # KB
@@ -327,19 +439,36 @@ class CrowdWorksCategoryExplorer:
             # 全カテゴリの案件を収集
             all_jobs = []
             all_matches = []
+            self.run_job_ids.clear()
+            self._open_jsonl_writers()
+            
+            # 並行モードでは全カテゴリを先にまとめて取得する
+            async_scraping = EXECUTION_CONFIG.get("async_scraping", False)
+            stream_extraction = EXECUTION_CONFIG.get("stream_extraction", False) and not async_scraping
+            if async_scraping:
+                prefetched = self.scrape_categories_concurrently(
+                    [category['url'] for category in selected_categories]
+                )
             
             # 選択されたカテゴリでスクレイピング実行
             for i, selected_category in enumerate(selected_categories, 1):
                 if OUTPUT_CONFIG["console_output"]:
                     print(f"\n🎯 実行 {i}/{len(selected_categories)}: {selected_category['name']}")
                 
-                # カテゴリページをスクレイピング
-                html_files = self.scrape_category_jobs(selected_category['url'])
-                if not html_files:
-                    continue
-                
-                # 案件抽出（ファイル保存は行わない）
-                category_jobs = self.extract_jobs_only(html_files)
+                if stream_extraction:
+                    # 取得しながらメモリ上のHTMLから抽出
+                    category_jobs = self.scrape_and_extract_streaming(selected_category['url'])
+                else:
+                    # カテゴリページをスクレイピング
+                    if async_scraping:
+                        html_files = prefetched.get(selected_category['url'], [])
+                    else:
+                        html_files = self.scrape_category_jobs(selected_category['url'])
+                    if not html_files:
+                        continue
+                    
+                    # 案件抽出（ファイル保存は行わない）
+                    category_jobs = self.extract_jobs_only(html_files)
                 all_jobs.extend(category_jobs)
                 
                 # マッチング評価（ファイル保存は行わない）
@@ -348,13 +477,6 @@ class CrowdWorksCategoryExplorer:
                 
                 # 結果表示
                 self.display_matches(category_matches)
-                
-                # 連続実行の場合は待機
-                if i < len(selected_categories):
-                    delay = EXECUTION_CONFIG.get("delay_between_categories", 5)
-                    if OUTPUT_CONFIG["console_output"]:
-                        print(f"\n⏳ 次のカテゴリまで {delay} 秒待機...")
-                    time.sleep(delay)
             
             # 全カテゴリの案件を統合して保存
             if all_jobs:
@@ -365,11 +487,58 @@ class CrowdWorksCategoryExplorer:
                 print("\n\n⚠️  プログラムが中断されました。")
         
         finally:
+            # ブラウザプールとHTTP接続プールを終了
+            self.html_scraper.stop()
+            self.http_fetcher.close()
+            self.screenshots.close()
+            
+            # 取得済み案件の記録を保存
+            if self.seen_jobs is not None:
+                self.seen_jobs.save()
+                pages_skipped = (self.html_scraper.pages_skipped + self.http_fetcher.pages_skipped
+                                 + self.async_scraper.pages_skipped)
+                if OUTPUT_CONFIG["console_output"]:
+                    print(f"\n⏭️  取得済み案件のためスキップしたページ: {pages_skipped}ページ")
+            
             # 保存されたファイルの情報を表示
             self.display_saved_files_summary()
+            
+            # 案件ストア・キャッシュとJSON Linesファイルを閉じる
+            self.job_store.close()
+            if self.job_extractor.cache is not None:
+                self.job_extractor.cache.close()
+            if self.job_matcher.score_cache is not None:
+                self.job_matcher.score_cache.close()
+            if self.job_matcher.prefilter is not None:
+                self.job_matcher.prefilter.close()
+            self._close_jsonl_writers()
+            
+            # HTMLアーカイブを閉じる（保存期間・容量の上限もここで適用）
+            if self.html_archiver is not None:
+                self.html_archiver.close()
             if OUTPUT_CONFIG["console_output"]:
                 print("\nお疲れ様でした！")
 
+    def _open_jsonl_writers(self) -> None:
+        """案件と評価結果を1件ずつ追記するJSON Linesファイルを作成する"""
+        if not OUTPUT_CONFIG.get("jsonl_output", True):
+            return
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        compress = OUTPUT_CONFIG.get("jsonl_compress", False)
+        self.jobs_writer = JSONLWriter(jsonl_path(JOBS_DIR, "jobs", timestamp, compress), compress)
+        self.job_matcher.evaluation_writer = JSONLWriter(
+            jsonl_path(MATCHES_DIR, "evaluations", timestamp, compress), compress
+        )
+        self.saved_files['job_files'].append(self.jobs_writer.path)
+        self.saved_files['match_files'].append(self.job_matcher.evaluation_writer.path)
+    
+    def _close_jsonl_writers(self) -> None:
+        for writer in (self.jobs_writer, self.job_matcher.evaluation_writer):
+            if writer is not None:
+                writer.close()
+        self.jobs_writer = None
+        self.job_matcher.evaluation_writer = None
+    
     def select_categories_by_llm(self, categories: Dict, user_profile: UserProfile) -> List[Dict]:
         """LLMを使用してユーザープロファイルに基づいて最適なカテゴリを選択"""
         if OUTPUT_CONFIG["console_output"]:
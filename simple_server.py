@@ -7,6 +7,9 @@ import json
 import glob
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
+
+from src.storage.job_store import JobStore
 
 app = FastAPI()
 
@@ -107,6 +110,15 @@ def get_all_matching_results():
     
     return results
 
+_job_store = None
+
+def get_job_store():
+    """案件ストアを取得（初回アクセス時に開く）"""
+    global _job_store
+    if _job_store is None:
+        _job_store = JobStore()
+    return _job_store
+
 def get_matching_result_by_filename(filename):
     """指定されたファイル名のマッチング結果を取得"""
     matches_dir = Path("data/matches")
@@ -843,6 +855,34 @@ async def get_result_by_filename(filename: str):
     else:
         return {"success": False, "error": "マッチング結果が見つかりません"}
 
+@app.get("/api/jobs")
+async def get_jobs(category: Optional[str] = None, budget_type: Optional[str] = None,
+                   min_amount: Optional[int] = None, posted_since: Optional[str] = None,
+                   limit: int = 100, offset: int = 0):
+    """保存済みの案件を条件で絞り込んで取得（掲載日の新しい順）"""
+    try:
+        # totalはlimit・offsetを適用する前の、条件に合う案件の件数
+        filters = {
+            "category": category,
+            "budget_type": budget_type,
+            "min_amount": min_amount,
+            "posted_since": datetime.fromisoformat(posted_since) if posted_since else None,
+        }
+        store = get_job_store()
+        jobs = store.query(**filters, limit=min(limit, 1000), offset=offset)
+        return {"success": True, "jobs": jobs, "total": store.count(**filters)}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    """案件IDを指定して案件を取得"""
+    job = get_job_store().get(job_id)
+    if job:
+        return {"success": True, "job": job}
+    else:
+        return {"success": False, "error": "案件が見つかりません"}
+
 @app.get("/api/settings")
 async def get_settings():
     """設定を取得"""
@@ -0,0 +1,254 @@
+import unicodedata
+from functools import lru_cache
+from typing import List, Mapping, Optional, Sequence, Tuple
+import numpy as np
+from ..models.user_profile import UserProfile
+from .prefilter import job_text, profile_text
+
+# n-gramに含めない文字（空白・句読点・記号）。これらをまたぐn-gramは作らない
+_SEPARATORS = " \t\r\n\x00　、。，．,.!?！？()（）[]［］{}｛｝「」『』【】〈〉《》・:：;；/／\\\"'“”‘’`~〜-－_＿|｜+＋=＝*＊#＃&＆%％@＠^<>＜＞"
+
+# コードポイントごとの区切り文字かどうかの表（np.isinより速く引ける）
+_UNICODE_SIZE = 0x110000
+_IS_SEPARATOR = np.zeros(_UNICODE_SIZE, dtype=bool)
+_IS_SEPARATOR[[ord(char) for char in _SEPARATORS]] = True
+
+@lru_cache(maxsize=None)
+def _lowercase_table() -> np.ndarray:
+    """コードポイントごとの小文字のコードポイントの表（小文字にすると2文字になる「İ」は先頭の1文字にする）"""
+    table = np.arange(_UNICODE_SIZE, dtype=np.uint32)
+    # 大文字・小文字の区別がある文字はU+20000より前にしかない
+    for code in range(0x20000):
+        lower = chr(code).lower()
+        if lower != chr(code):
+            table[code] = ord(lower[0])
+    return table
+
+def _codepoints(texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """NFKCで正規化したテキストを区切り文字（\\x00）でつないだコードポイントの配列と、
+    各テキストの開始位置（末尾に全体の長さ）
+
+    全角英数字と半角カナを揃える（正規化済みのテキストは飛ばす）。大文字小文字はここでは揃えず、
+    採点時の文字の表で同じ文字として扱う（文書全体を小文字にするより速いため）。
+    """
+    normalized = [text if unicodedata.is_normalized('NFKC', text) else unicodedata.normalize('NFKC', text)
+                  for text in texts]
+    codes = np.frombuffer(("\x00".join(normalized) + "\x00").encode('utf-32-le'), dtype=np.uint32)
+    lengths = np.fromiter((len(text) + 1 for text in normalized), dtype=np.int64, count=len(normalized))
+    return codes, np.concatenate(([0], np.cumsum(lengths)))
+
+def ngram_keys(symbols: np.ndarray, separator: np.ndarray, base: int,
+               sizes: Sequence[int] = (2, 3)) -> Tuple[np.ndarray, np.ndarray]:
+    """文字n-gramを整数に変換し、(n-gramの値, 開始位置) の配列を返す
+
+    symbolsは0〜base-1の文字番号の配列。日本語は単語の区切りが無いため、形態素解析の代わりに
+    文字2-gram・3-gramを単語として扱う。区切り文字をまたぐn-gramは除き、
+    前後を区切り文字に挟まれた1文字（「C」「R」など）は1-gramとして残す。
+    n-gramの値はnごとに重ならない範囲（3-gramが0〜base^3、その後ろに2-gram・1-gram）に割り当てる。
+    """
+    values = symbols.astype(np.int64)
+    positions = np.arange(len(values))
+    unigram_offset = base ** 3 + base ** 2
+    keys, starts = [], []
+    for size in sizes:
+        if size == 1:
+            valid = ~separator
+            key = values + unigram_offset
+        elif size == 2:
+            valid = ~separator[:-1] & ~separator[1:]
+            key = values[:-1] * base + values[1:] + base ** 3
+        elif size == 3:
+            valid = ~separator[:-2] & ~separator[1:-1] & ~separator[2:]
+            key = (values[:-2] * base + values[1:-1]) * base + values[2:]
+        else:
+            raise ValueError(f"未対応のn-gramの長さです: {size}")
+        keys.append(key[valid])
+        starts.append(positions[:len(valid)][valid])
+    if 1 not in sizes:
+        isolated = ~separator
+        isolated[1:] &= separator[:-1]
+        isolated[:-1] &= separator[1:]
+        keys.append(values[isolated] + unigram_offset)
+        starts.append(positions[isolated])
+    return np.concatenate(keys), np.concatenate(starts)
+
+def _ngram_counts(separator: np.ndarray, sizes: Sequence[int]) -> np.ndarray:
+    """位置ごとの、そこから始まるn-gramの数（ngram_keysと同じ数え方）"""
+    counts = np.zeros(len(separator), dtype=np.int8)
+    letter = ~separator
+    for size in sizes:
+        if size == 1:
+            counts += letter
+        elif size == 2:
+            counts[:-1] += letter[:-1] & letter[1:]
+        elif size == 3:
+            counts[:-2] += letter[:-2] & letter[1:-1] & letter[2:]
+        else:
+            raise ValueError(f"未対応のn-gramの長さです: {size}")
+    if 1 not in sizes:
+        isolated = letter.copy()
+        isolated &= np.roll(separator, 1)
+        isolated[:-1] &= separator[1:]
+        counts += isolated
+    return counts
+
+class BM25Index:
+    """文字n-gramのBM25インデックス
+
+    作成時は正規化したテキストのコードポイントの配列と文書ごとのn-gram数（文書長）だけを作る。
+    採点時はクエリに現れる文字だけに番号を振り、クエリの文字だけからなる文書中のn-gramを数えて
+    (n-gram, 文書番号) ごとの出現回数と文書頻度を求め、np.bincountで全文書を一度に採点する。
+    全てのn-gramの転置インデックスは作らない（作成に時間がかかり、クエリに無いn-gramは採点に使わないため）。
+    """
+
+    def __init__(self, texts: Sequence[str], sizes: Sequence[int] = (2, 3), k1: float = 1.5, b: float = 0.75):
+        self.sizes = tuple(sizes)
+        self.k1 = k1
+        self.b = b
+        self.num_docs = len(texts)
+        self.codes, self.offsets = _codepoints(texts)
+        self.doc_ids = np.repeat(np.arange(self.num_docs, dtype=np.int32), np.diff(self.offsets))
+        self.separator = _IS_SEPARATOR[self.codes]
+        counts = _ngram_counts(self.separator, self.sizes)
+        self.doc_lengths = (
+            np.add.reduceat(counts, self.offsets[:-1], dtype=np.int64).astype(np.float32)
+            if self.num_docs else np.zeros(0, dtype=np.float32)
+        )
+        self.average_length = float(self.doc_lengths.mean()) if self.num_docs else 0.0
+
+    def score(self, query: str) -> np.ndarray:
+        """クエリに対する全文書のBM25スコア"""
+        lowercase = _lowercase_table()
+        query_codes, _ = _codepoints([query])
+        query_separator = _IS_SEPARATOR[query_codes]
+        alphabet = np.unique(lowercase[query_codes[~query_separator]])
+        if self.num_docs == 0 or len(alphabet) == 0:
+            return np.zeros(self.num_docs, dtype=np.float32)
+
+        # クエリの文字（小文字）に1からの番号を振り、大文字も同じ番号にする（クエリに無い文字は0で、n-gramに含めない）
+        base = len(alphabet) + 1
+        if (base ** 3 + base ** 2 + base) * self.num_docs >= 2 ** 63:
+            raise ValueError("クエリの文字の種類と文書数が多すぎるため、採点できません")
+        table = np.zeros(_UNICODE_SIZE, dtype=np.int32)
+        table[alphabet] = np.arange(1, base, dtype=np.int32)
+        table = table[lowercase]
+        query_keys, _ = ngram_keys(table[query_codes], query_separator, base, self.sizes)
+        query_keys, query_tf = np.unique(query_keys, return_counts=True)
+
+        # 文書の文字の番号は、クエリの文字の種類が少なければ1バイトで持つ（表を引く量を減らす）
+        symbols = table.astype(np.uint8 if base <= 2 ** 8 else np.uint16)[self.codes]
+        terms, starts = self._match(symbols, query_keys, base)
+        if len(terms) == 0:
+            return np.zeros(self.num_docs, dtype=np.float32)
+        owners = self.doc_ids[starts]
+
+        # (クエリのn-gram, 文書番号) ごとの出現回数と、n-gramごとの出現文書数
+        pairs, tf = np.unique(terms * self.num_docs + owners, return_counts=True)
+        terms, docs = np.divmod(pairs, self.num_docs)
+        df = np.bincount(terms, minlength=len(query_keys))
+        idf = np.log1p((self.num_docs - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[docs] / (self.average_length or 1.0))
+        weights = tf * (self.k1 + 1) / (tf + norm) * idf[terms] * query_tf[terms]
+        return np.bincount(docs, weights=weights, minlength=self.num_docs).astype(np.float32)
+
+    def _match(self, symbols: np.ndarray, query_keys: np.ndarray, base: int) -> Tuple[np.ndarray, np.ndarray]:
+        """文書中でクエリのn-gramと一致する位置を探し、(query_keysでの番号, 開始位置) の配列を返す
+
+        symbolsはクエリの文字の番号（クエリに無い文字と区切り文字は0）。クエリのn-gramの値は0の桁を含まないため、
+        0を含む文字の並びは表を引いても一致しない。文書全体では2文字ずつの値で1回だけ表を引き、
+        クエリの2-gramか3-gramの先頭2文字と一致した位置だけで、2-gramと3-gramの表を引く。
+        """
+        term_ids = np.arange(len(query_keys), dtype=np.int32)
+        unigram_offset = base ** 3 + base ** 2
+        is_trigram = query_keys < base ** 3
+        is_bigram = ~is_trigram & (query_keys < unigram_offset)
+        is_unigram = query_keys >= unigram_offset
+        terms, starts = [], []
+
+        if is_bigram.any() or is_trigram.any():
+            bigram_dtype = np.uint16 if base * base <= 2 ** 16 else np.int32
+            bigrams = symbols[:-1].astype(bigram_dtype) * bigram_dtype(base) + symbols[1:]
+            bigram_table = np.full(base * base, -1, dtype=np.int32)
+            bigram_table[query_keys[is_bigram] - base ** 3] = term_ids[is_bigram]
+            # 3-gramの先頭2文字ごとの番号
+            prefix_keys, prefix_ids = np.unique(query_keys[is_trigram] // base, return_inverse=True)
+            prefixes = np.full(base * base, -1, dtype=np.int32)
+            prefixes[prefix_keys] = np.arange(len(prefix_keys), dtype=np.int32)
+
+            candidates = np.flatnonzero(((bigram_table >= 0) | (prefixes >= 0))[bigrams])
+            candidate_bigrams = bigrams[candidates]
+            found = bigram_table[candidate_bigrams]
+            hits = found >= 0
+            terms.append(found[hits])
+            starts.append(candidates[hits])
+
+            if is_trigram.any():
+                # (先頭2文字の番号, 3文字目) の表。末尾は区切り文字のため、3文字目の位置は範囲内に収まる
+                trigram_table = np.full(len(prefix_keys) * base, -1, dtype=np.int32)
+                trigram_table[prefix_ids * base + query_keys[is_trigram] % base] = term_ids[is_trigram]
+                found_prefixes = prefixes[candidate_bigrams]
+                candidates = candidates[found_prefixes >= 0]
+                found = trigram_table[found_prefixes[found_prefixes >= 0] * base + symbols[candidates + 2]]
+                hits = found >= 0
+                terms.append(found[hits])
+                starts.append(candidates[hits])
+
+        if is_unigram.any():
+            table = np.full(base, -1, dtype=np.int32)
+            table[query_keys[is_unigram] - unigram_offset] = term_ids[is_unigram]
+            found = table[symbols]
+            hits = np.flatnonzero(found >= 0)
+            if 1 not in self.sizes:
+                # 前後を区切り文字に挟まれた1文字だけ（先頭の文字の前は、配列の末尾の区切り文字を参照する）
+                hits = hits[self.separator[hits - 1] & self.separator[hits + 1]]
+            terms.append(found[hits])
+            starts.append(hits)
+
+        if not terms:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(terms).astype(np.int64), np.concatenate(starts)
+
+class BM25Prefilter:
+    """プロファイルとのBM25スコアで、LLMで評価する案件を絞り込む（埋め込みモデルやLLMを使わない）
+
+    案件のタイトル・説明文から文字n-gramのインデックスを作り、プロファイルのスキル・
+    希望カテゴリ・説明をクエリとして全案件を採点する。スコアの高い順にtop_k件、
+    またはスコアがmin_score以上の案件を残す。LLMを使わない採点（relevance_scores）にも使う。
+    直前と同じ案件のテキストで呼ばれた場合は、作成済みのインデックスを使い回す。
+    """
+
+    name = "BM25スコア"
+
+    def __init__(self, top_k: Optional[int] = None, min_score: Optional[float] = None,
+                 sizes: Sequence[int] = (2, 3), k1: float = 1.5, b: float = 0.75):
+        self.top_k = top_k
+        self.min_score = min_score
+        self.sizes = tuple(sizes)
+        self.k1 = k1
+        self.b = b
+        self._texts: Optional[List[str]] = None
+        self._index: Optional[BM25Index] = None
+
+    def close(self):
+        self._texts = None
+        self._index = None
+
+    def index(self, jobs: List[Mapping]) -> BM25Index:
+        """案件のBM25インデックス（直前と同じテキストの案件なら作成済みのものを返す）"""
+        texts = [job_text(job) for job in jobs]
+        if self._index is None or texts != self._texts:
+            self._index = BM25Index(texts, self.sizes, self.k1, self.b)
+            self._texts = texts
+        return self._index
+
+    def scores(self, jobs: List[Mapping], user_profile: UserProfile) -> np.ndarray:
+        """各案件のBM25スコア"""
+        if not jobs:
+            return np.zeros(0, dtype=np.float32)
+        return self.index(jobs).score(profile_text(user_profile))
+
+    def relevance_scores(self, jobs: List[Mapping], user_profile: UserProfile) -> np.ndarray:
+        """LLMの関連度スコアと同じ0〜100の範囲に換算したスコア（最も高い案件を100とする）"""
+        scores = self.scores(jobs, user_profile)
+        top = scores.max() if len(scores) else 0.0
+        return scores / top * 100 if top > 0 else np.zeros_like(scores)
@@ -0,0 +1,70 @@
+from typing import List, Mapping, Optional, Tuple
+import numpy as np
+from ..models.user_profile import UserProfile
+from ..utils.config import PREFILTER_CONFIG
+from ..utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+def profile_text(user_profile: UserProfile) -> str:
+    """プロファイルのうち、案件との類似度の計算に使うテキスト"""
+    return "\n".join([
+        "スキル: " + ", ".join(user_profile.skills),
+        "希望カテゴリ: " + ", ".join(user_profile.preferred_categories),
+        user_profile.description,
+    ])
+
+def job_text(job: Mapping) -> str:
+    """案件のうち、プロファイルとの類似度の計算に使うテキスト"""
+    return f"{job['title']}\n{job['description']}"
+
+def select_candidates(scores: np.ndarray, top_k: Optional[int] = None,
+                      min_score: Optional[float] = None) -> np.ndarray:
+    """スコアの高い順にtop_k件、かつmin_score以上の要素をTrueにした配列を返す（指定が無い条件は適用しない）"""
+    selected = np.ones(len(scores), dtype=bool)
+    if min_score is not None:
+        selected &= scores >= min_score
+    if top_k is not None and top_k < len(scores):
+        # 同点の場合は先に現れた案件を優先する
+        top = np.argsort(-scores, kind='stable')[:top_k]
+        in_top = np.zeros(len(scores), dtype=bool)
+        in_top[top] = True
+        selected &= in_top
+    return selected
+
+def apply_prefilter(prefilter, jobs: List[Mapping], user_profile: UserProfile) -> Tuple[np.ndarray, np.ndarray]:
+    """プレフィルターでLLMに送る案件を選び、(選ばれたかどうか, スコア) の配列を返す
+
+    スコアの計算に失敗した場合は、全ての案件を選ぶ（LLMでの評価は続ける）。
+    """
+    try:
+        scores = np.asarray(prefilter.scores(jobs, user_profile), dtype=np.float32)
+    except Exception as e:
+        logger.error(f"プレフィルター（{prefilter.name}）の計算中にエラーが発生しました。絞り込まずに評価します: {e}")
+        return np.ones(len(jobs), dtype=bool), np.zeros(len(jobs), dtype=np.float32)
+    selected = select_candidates(scores, prefilter.top_k, prefilter.min_score)
+    logger.info(f"プレフィルター（{prefilter.name}）: {len(jobs)}件中{int(selected.sum())}件をLLMで評価します")
+    return selected, scores
+
+def create_prefilter():
+    """PREFILTER_CONFIGからプレフィルターを作成する（methodがNoneならNone）"""
+    method = PREFILTER_CONFIG.get("method")
+    if method is None:
+        return None
+    if method == "embedding":
+        from ..storage.embedding_cache import EmbeddingCache
+        from .semantic_prefilter import EmbeddingPrefilter
+        return EmbeddingPrefilter(
+            model=PREFILTER_CONFIG["embedding_model"],
+            top_k=PREFILTER_CONFIG.get("top_k"),
+            min_score=PREFILTER_CONFIG.get("min_similarity"),
+            cache=EmbeddingCache(),
+            max_chars=PREFILTER_CONFIG.get("max_chars", 2000)
+        )
+    if method == "bm25":
+        from .lexical_scorer import BM25Prefilter
+        return BM25Prefilter(
+            top_k=PREFILTER_CONFIG.get("top_k"),
+            min_score=PREFILTER_CONFIG.get("min_bm25_score")
+        )
+    raise ValueError(f"未対応のプレフィルターです: {method}")
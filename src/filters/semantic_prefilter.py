@@ -0,0 +1,53 @@
+from typing import List, Mapping, Optional
+import numpy as np
+from api import generate_embeddings
+from ..models.user_profile import UserProfile
+from ..storage.embedding_cache import EmbeddingCache, text_hash
+from .prefilter import job_text, profile_text
+
+class EmbeddingPrefilter:
+    """埋め込みベクトルのコサイン類似度で、LLMで評価する案件を絞り込む
+
+    プロファイルと各案件（タイトル・説明文）をOllamaの埋め込みモデルでベクトルにし、
+    類似度の高い順にtop_k件、または類似度がmin_score以上の案件だけを残す（両方指定時は両方を満たすもの）。
+    案件のベクトルはEmbeddingCacheに保存し、次回以降は埋め込みを生成しない。
+    """
+
+    name = "埋め込みの類似度"
+
+    def __init__(self, model: str, top_k: Optional[int] = None, min_score: Optional[float] = None,
+                 cache: Optional[EmbeddingCache] = None, max_chars: int = 2000):
+        self.model = model
+        self.top_k = top_k
+        self.min_score = min_score  # コサイン類似度の下限（-1〜1）
+        self.cache = cache
+        self.max_chars = max_chars  # 埋め込むテキストの最大文字数（長い説明文は切り詰める）
+
+    def close(self):
+        if self.cache is not None:
+            self.cache.close()
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """テキストごとの正規化済みベクトル（行がテキスト）"""
+        texts = [text[:self.max_chars] for text in texts]
+        keys = [text_hash(text) for text in texts]
+        vectors = self.cache.get_many(keys, self.model) if self.cache is not None else {}
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            generated = [np.asarray(vector, dtype=np.float32)
+                         for vector in generate_embeddings(list(missing.values()), self.model)]
+            vectors.update(zip(missing, generated))
+            if self.cache is not None:
+                self.cache.put_many(zip(missing, generated), self.model)
+
+        matrix = np.vstack([vectors[key] for key in keys])
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
+
+    def scores(self, jobs: List[Mapping], user_profile: UserProfile) -> np.ndarray:
+        """各案件とプロファイルのコサイン類似度"""
+        if not jobs:
+            return np.zeros(0, dtype=np.float32)
+        profile_vector = self.embed([profile_text(user_profile)])[0]
+        return self.embed([job_text(job) for job in jobs]) @ profile_vector
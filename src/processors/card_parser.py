@@ -0,0 +1,217 @@
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxmlはrequirements.txtに含まれるが、無い環境ではBeautifulSoup（html.parser）のみ使用できる
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+# 案件カードと、その中の要素のクラス名
+CARD_CLASS = "UNzN7"
+CLIENT_CLASS = "rGkuO"
+BUDGET_CLASS = "mLant"
+DATE_CLASS = "cAtkF"
+
+_CARD_CLASS_PATTERN = re.compile(rf'(?:^|\s){CARD_CLASS}(?:\s|$)')
+
+# BeautifulSoupのget_text()がテキストとして扱わない要素（中の文字列は専用の型になる）
+_NON_TEXT_TAGS = frozenset({"script", "style", "template", "rt", "rp"})
+
+@dataclass
+class CardFields:
+    """案件カード1件から取り出した生のテキスト（JobItemへの変換はJobExtractorで行う）"""
+    client_text: Optional[str]  # div.rGkuO のテキスト（無い場合はNone）
+    job_text: str  # カード全体のテキスト
+    budget_texts: List[str]  # div.mLant のテキスト（出現順）
+    date_text: Optional[str]  # div.cAtkF のテキスト（無い場合はNone）
+    url: Optional[str]  # href属性を持つ最初のaタグのリンク先
+
+class SoupCardParser:
+    """BeautifulSoupで案件カードを取り出す（features='html.parser'が従来の動作）
+
+    partial=Trueの場合はSoupStrainerで案件カードの部分木だけを構築し、
+    ヘッダーやサイドバーなどカード外の要素は読み込み時に捨てる。
+    """
+
+    def __init__(self, features: str = "html.parser", partial: bool = False):
+        self.features = features
+        # 解析中のclass属性は分割前の文字列のため、単語単位の正規表現で照合する
+        self.parse_only = SoupStrainer('div', class_=_CARD_CLASS_PATTERN) if partial else None
+
+    def iter_cards(self, html: str) -> Iterator[CardFields]:
+        soup = BeautifulSoup(html, self.features, parse_only=self.parse_only)
+        for container in soup.find_all('div', class_=CARD_CLASS):
+            client_div = container.find('div', class_=CLIENT_CLASS)
+            date_div = container.find('div', class_=DATE_CLASS)
+            url_element = container.find('a', href=True)
+            yield CardFields(
+                client_text=client_div.get_text() if client_div else None,
+                job_text=container.get_text(),
+                budget_texts=[element.get_text() for element in container.find_all('div', class_=BUDGET_CLASS)],
+                date_text=date_div.get_text() if date_div else None,
+                url=url_element['href'] if url_element else None
+            )
+
+def _class_xpath(tag: str, class_name: str) -> str:
+    """class属性にclass_nameを含む要素のXPath（BeautifulSoupのclass_指定と同じく単語単位で一致）"""
+    return f"{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+class LxmlCardParser:
+    """lxmlのツリーをXPathで直接たどって案件カードを取り出す
+
+    BeautifulSoupのツリーを構築しない分だけ高速。テキストの取り出し方は
+    get_text()に合わせており（script・style・ルビ等の文字列は含めない）、
+    SoupCardParserと同じCardFieldsを返す。
+
+    partial=Trueの場合はツリーを構築せず、パーサーのイベントから案件カード内の
+    テキストだけを集める（_CardTarget）。カード外の要素は読み込んだそばから捨てるため、
+    ページが大きくてもメモリ使用量はカードのテキスト分しか増えない。
+    """
+
+    def __init__(self, partial: bool = False):
+        if lxml is None:
+            raise ImportError("lxmlパーサーを使用するにはlxmlが必要です")
+        self.partial = partial
+        self._parser = lxml.html.HTMLParser(encoding='utf-8')
+        self._cards = etree.XPath("//" + _class_xpath("div", CARD_CLASS))
+        self._client = etree.XPath(".//" + _class_xpath("div", CLIENT_CLASS))
+        self._budgets = etree.XPath(".//" + _class_xpath("div", BUDGET_CLASS))
+        self._date = etree.XPath(".//" + _class_xpath("div", DATE_CLASS))
+        self._link = etree.XPath(".//a[@href]")
+
+    def iter_cards(self, html: str) -> Iterator[CardFields]:
+        # XML宣言付きの文字列もそのまま読めるよう、バイト列で渡す
+        data = html.encode('utf-8')
+        if self.partial:
+            yield from etree.fromstring(data, etree.HTMLParser(target=_CardTarget(), encoding='utf-8'))
+            return
+        root = lxml.html.document_fromstring(data, parser=self._parser)
+        for container in self._cards(root):
+            yield self._fields(container)
+
+    def _fields(self, container) -> CardFields:
+        client_divs = self._client(container)
+        date_divs = self._date(container)
+        links = self._link(container)
+        return CardFields(
+            client_text=_text_of(client_divs[0]) if client_divs else None,
+            job_text=_text_of(container),
+            budget_texts=[_text_of(element) for element in self._budgets(container)],
+            date_text=_text_of(date_divs[0]) if date_divs else None,
+            url=links[0].get('href') if links else None
+        )
+
+class _PartialCard:
+    """_CardTargetが集めている途中の案件カード"""
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.client: Optional[List[str]] = None
+        self.budgets: List[List[str]] = []
+        self.date: Optional[List[str]] = None
+        self.url: Optional[str] = None
+
+    def fields(self) -> CardFields:
+        return CardFields(
+            client_text="".join(self.client) if self.client is not None else None,
+            job_text="".join(self.parts),
+            budget_texts=["".join(parts) for parts in self.budgets],
+            date_text="".join(self.date) if self.date is not None else None,
+            url=self.url
+        )
+
+class _CardTarget:
+    """lxmlのパーサーイベントを受け取り、案件カード内のテキストだけを集めるターゲット
+
+    テキストは開いている収集先（カード本体・div.rGkuOなど）全てに追加する。
+    find()と同様に、カード内で最初に現れたdiv.rGkuO・div.cAtkF・a[href]だけを使い、
+    入れ子のカードも含めて開始タグの順（文書順）に返す。
+    """
+
+    def __init__(self):
+        self._cards: List[_PartialCard] = []  # 開始順の全カード
+        self._open_cards: List[_PartialCard] = []
+        self._stack: List[tuple] = []  # 開いている要素ごとの (タグ, 有効にした収集先の数, カードかどうか)
+        self._collectors: List[List[str]] = []  # テキストを受け取る収集先
+        self._excluded = 0  # 開いているscript・style等の数
+
+    def start(self, tag, attrib):
+        classes = attrib.get("class", "").split() if tag == "div" else ()
+        collectors = []
+        if self._open_cards:
+            if CLIENT_CLASS in classes or DATE_CLASS in classes or BUDGET_CLASS in classes:
+                texts: List[str] = []
+                for card in self._open_cards:
+                    if CLIENT_CLASS in classes and card.client is None:
+                        card.client = texts
+                    if DATE_CLASS in classes and card.date is None:
+                        card.date = texts
+                    if BUDGET_CLASS in classes:
+                        card.budgets.append(texts)
+                collectors.append(texts)
+            if tag == "a" and "href" in attrib:
+                for card in self._open_cards:
+                    if card.url is None:
+                        card.url = attrib["href"]
+        is_card = CARD_CLASS in classes
+        if is_card:
+            card = _PartialCard()
+            self._cards.append(card)
+            self._open_cards.append(card)
+            collectors.append(card.parts)
+        if tag in _NON_TEXT_TAGS:
+            self._excluded += 1
+        self._collectors.extend(collectors)
+        self._stack.append((tag, len(collectors), is_card))
+
+    def end(self, tag):
+        tag, collector_count, is_card = self._stack.pop()
+        if collector_count:
+            del self._collectors[-collector_count:]
+        if is_card:
+            self._open_cards.pop()
+        if tag in _NON_TEXT_TAGS:
+            self._excluded -= 1
+
+    def data(self, text):
+        if self._excluded:
+            return
+        for collector in self._collectors:
+            collector.append(text)
+
+    def close(self) -> List[CardFields]:
+        return [card.fields() for card in self._cards]
+
+def _text_of(element) -> str:
+    """BeautifulSoupのget_text()と同じ規則で要素内のテキストを連結する"""
+    parts: List[str] = []
+    excluded = any(ancestor.tag in _NON_TEXT_TAGS for ancestor in element.iterancestors())
+    _collect_text(element, parts, excluded)
+    return "".join(parts)
+
+def _collect_text(element, parts: List[str], excluded: bool):
+    excluded = excluded or element.tag in _NON_TEXT_TAGS
+    if element.text and not excluded:
+        parts.append(element.text)
+    for child in element:
+        # コメント・処理命令は本文を含めず、後続のテキスト（tail）だけを拾う
+        if isinstance(child.tag, str):
+            _collect_text(child, parts, excluded)
+        if child.tail and not excluded:
+            parts.append(child.tail)
+
+PARSER_BACKENDS: Dict[str, Callable[[bool], object]] = {
+    "html.parser": lambda partial: SoupCardParser("html.parser", partial),  # 従来の実装（基準）
+    "bs4-lxml": lambda partial: SoupCardParser("lxml", partial),
+    "lxml": lambda partial: LxmlCardParser(partial),
+}
+
+def create_card_parser(backend: str, partial: bool = False):
+    """名前を指定してカードパーサーを作成する（partial=Trueで案件カードの部分木だけを解析）"""
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"未対応のパーサーです: {backend}（{', '.join(PARSER_BACKENDS)}）")
+    return PARSER_BACKENDS[backend](partial)
@@ -1,22 +1,41 @@
-from bs4 import BeautifulSoup
-from dataclasses import dataclass
-from typing import List, Optional, Dict
+from dataclasses import dataclass, field
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Dict, Pattern, Tuple, Union
 from datetime import datetime
+import hashlib
+import os
+import sys
 import re
 import json
 from pathlib import Path
+from ..utils.config import EXTRACTION_CONFIG
+from ..scrapers.seen_jobs import JOB_URL_ID_PATTERN
+from ..storage.extraction_cache import ExtractionCache, content_hash
+from .card_parser import CardFields, create_card_parser
 
-@dataclass
+# 抽出結果の内容や判定の仕方を変えたら上げる（抽出結果キャッシュのキーに含める）
+EXTRACTOR_VERSION = "2"
+
+@dataclass(frozen=True, slots=True)
 class Budget:
-    """予算情報を格納するデータクラス"""
+    """予算情報を格納するデータクラス（変更不可。同じ内容のものはmake_budgetで共有する）"""
     type: str  # 固定報酬制、時間単価制など
     min_amount: Optional[int]  # 最小金額（円）
     max_amount: Optional[int]  # 最大金額（円）
     is_negotiable: bool  # 相談可能かどうか
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class JobItem:
-    """案件情報を格納するデータクラス"""
+    """案件情報を格納するデータクラス
+    
+    大量の案件を保持できるよう__slots__を使い、変更不可にしている。
+    カテゴリ・報酬形態・クライアント名などの繰り返し現れる文字列はインターンし、
+    予算と掲載日は同じ値のオブジェクトを共有する。
+    """
     title: str
     category: str
     description: str
@@ -26,20 +45,191 @@ class JobItem:
     client_name: str
     url: Optional[str]
     is_pr: bool
+    job_id: str = ""  # 案件ID（URLの/public/jobs/<id>、URLが無い場合は内容のハッシュ）
+
+@lru_cache(maxsize=4096)
+def make_budget(type_: str, min_amount: Optional[int], max_amount: Optional[int], is_negotiable: bool) -> Budget:
+    """Budgetを作成する（同じ内容であれば同じオブジェクトを返す）"""
+    return Budget(type=sys.intern(type_), min_amount=min_amount, max_amount=max_amount, is_negotiable=is_negotiable)
+
+@lru_cache(maxsize=4096)
+def _posted_date(year: int, month: int, day: int) -> datetime:
+    return datetime(year, month, day)
+
+def _intern(text: Optional[str]) -> Optional[str]:
+    return sys.intern(text) if text is not None else None
+
+def make_job_id(url: Optional[str], title: str, client_name: str, description: str) -> str:
+    """案件の安定したIDを返す
+    
+    URLに含まれる案件番号を優先し、無い場合はタイトル・クライアント名・説明文の
+    ハッシュを"h"付きで返す（同じ内容であれば実行をまたいでも同じIDになる）。
+    """
+    if url:
+        match = JOB_URL_ID_PATTERN.search(url)
+        if match:
+            return match.group(1)
+    content = "\x1f".join((title, client_name, description))
+    return "h" + hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]
+
+def job_from_dict(data: Dict) -> JobItem:
+    """job_to_dictで変換した辞書（JobViewも可）からJobItemを復元する"""
+    budget = data['budget']
+    posted_date = datetime.fromisoformat(data['posted_date']) if data['posted_date'] else None
+    if posted_date is not None and posted_date == datetime(posted_date.year, posted_date.month, posted_date.day):
+        posted_date = _posted_date(posted_date.year, posted_date.month, posted_date.day)
+    return JobItem(
+        title=data['title'],
+        category=sys.intern(data['category']),
+        description=data['description'],
+        budget=make_budget(budget['type'], budget['min_amount'], budget['max_amount'], budget['is_negotiable']),
+        deadline=_intern(data['deadline']),
+        posted_date=posted_date,
+        client_name=sys.intern(data['client_name']),
+        url=data['url'],
+        is_pr=data['is_pr'],
+        job_id=data['job_id']
+    )
+
+def job_to_dict(job: JobItem) -> Dict:
+    """JobItemをJSONに保存する形式の辞書に変換する"""
+    return {
+        'job_id': job.job_id,
+        'title': job.title,
+        'category': job.category,
+        'description': job.description,
+        'budget': {
+            'type': job.budget.type,
+            'min_amount': job.budget.min_amount,
+            'max_amount': job.budget.max_amount,
+            'is_negotiable': job.budget.is_negotiable
+        },
+        'deadline': job.deadline,
+        'posted_date': job.posted_date.isoformat() if job.posted_date else None,
+        'client_name': job.client_name,
+        'url': job.url,
+        'is_pr': job.is_pr
+    }
+
+_JOB_KEYS = ('job_id', 'title', 'category', 'description', 'budget', 'deadline',
+             'posted_date', 'client_name', 'url', 'is_pr')
+_BUDGET_KEYS = ('type', 'min_amount', 'max_amount', 'is_negotiable')
+
+class BudgetView(Mapping):
+    """Budgetをjob_to_dictの'budget'と同じ形の読み取り専用マッピングとして見せる"""
+    __slots__ = ('_budget',)
+    
+    def __init__(self, budget: Budget):
+        self._budget = budget
+    
+    def __getitem__(self, key):
+        if key not in _BUDGET_KEYS:
+            raise KeyError(key)
+        return getattr(self._budget, key)
+    
+    def __iter__(self):
+        return iter(_BUDGET_KEYS)
+    
+    def __len__(self):
+        return len(_BUDGET_KEYS)
+
+class JobView(Mapping):
+    """JobItemをjob_to_dictと同じ形の読み取り専用マッピングとして見せる
+    
+    辞書にコピーせずに、辞書を受け取るマッチング処理やフィルターへ渡すためのもの。
+    JSONに書き出す際はjson.dumpsのdefaultにdictを指定する（ネストしたBudgetViewも変換される）。
+    """
+    __slots__ = ('_job',)
+    
+    def __init__(self, job: JobItem):
+        self._job = job
+    
+    @property
+    def item(self) -> JobItem:
+        return self._job
+    
+    def __getitem__(self, key):
+        if key == 'budget':
+            return BudgetView(self._job.budget)
+        if key == 'posted_date':
+            return self._job.posted_date.isoformat() if self._job.posted_date else None
+        if key not in _JOB_KEYS:
+            raise KeyError(key)
+        return getattr(self._job, key)
+    
+    def __iter__(self):
+        return iter(_JOB_KEYS)
+    
+    def __len__(self):
+        return len(_JOB_KEYS)
+    
+    def __repr__(self):
+        return f"JobView({self._job.job_id!r}, {self._job.title!r})"
+
+def _keyword_pattern(keywords: Tuple[str, ...]) -> Pattern:
+    """いずれかのキーワードを含むかを1回の検索で判定する正規表現"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+@dataclass(frozen=True)
+class ExtractionRules:
+    """案件カードのテキストから各項目を判定する規則
+    
+    正規表現はここで1度だけコンパイルし、全てのカードで使い回す。
+    """
+    # タイトルから判定するカテゴリ（先頭から順に照合し、最初に含まれるものを採用）
+    categories: Tuple[str, ...] = (
+        'AI・機械学習', '機械学習・ディープラーニング', 'AI・チャットボット開発',
+        'ChatGPT開発', 'AIアノテーション', 'データサイエンス'
+    )
+    budget_keywords: Tuple[str, ...] = ('円', '報酬')  # 予算の行と判定するキーワード
+    deadline_keyword: str = 'まで'  # 期限の行と判定するキーワード
+    description_excluded_keywords: Tuple[str, ...] = ('円', 'まで', '掲載日：')  # 説明文から除く行のキーワード
+    client_pattern: Pattern = re.compile(r'^(.+?)掲載日：')
+    amount_pattern: Pattern = re.compile(r'(\d{1,3}(?:,\d{3})*)')
+    date_pattern: Pattern = re.compile(r'(\d{4})年(\d{2})月(\d{2})日')
+    budget_keyword_pattern: Pattern = field(init=False, repr=False)
+    description_excluded_pattern: Pattern = field(init=False, repr=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'budget_keyword_pattern', _keyword_pattern(self.budget_keywords))
+        object.__setattr__(self, 'description_excluded_pattern', _keyword_pattern(self.description_excluded_keywords))
+
+DEFAULT_RULES = ExtractionRules()
+
+# 並列抽出のワーカープロセスごとに1つ作成するJobExtractor
+_worker_extractor: Optional["JobExtractor"] = None
+
+def _init_worker(save_dir: str, parser: str, partial_parse: bool, rules: ExtractionRules):
+    global _worker_extractor
+    _worker_extractor = JobExtractor(save_dir, parser=parser, partial_parse=partial_parse, rules=rules)
+
+def _extract_in_worker(item: Union[Path, str]) -> List["JobItem"]:
+    return _worker_extractor._extract_item(item)
 
 class JobExtractor:
     """HTMLから案件情報を抽出するクラス"""
     
-    def __init__(self, save_dir: str = "data/jobs"):
+    def __init__(self, save_dir: str = "data/jobs", parser: Optional[str] = None,
+                 partial_parse: Optional[bool] = None, rules: ExtractionRules = DEFAULT_RULES,
+                 cache: Optional[ExtractionCache] = None):
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.rules = rules
+        # 指定時は同じ内容のHTMLの抽出結果を再利用する（キーは抽出処理のバージョンと判定規則を含む）
+        self.cache = cache
+        self.cache_version = f"{EXTRACTOR_VERSION}-{hashlib.sha1(repr(rules).encode('utf-8')).hexdigest()[:12]}"
+        # HTMLの解析方法（"html.parser" / "bs4-lxml" / "lxml"、いずれも同じ結果になる）
+        self.parser = parser or EXTRACTION_CONFIG["parser_backend"]
+        # 案件カードの部分木だけを解析するかどうか（結果は同じで、メモリと時間を節約できる）
+        self.partial_parse = EXTRACTION_CONFIG["partial_parse"] if partial_parse is None else partial_parse
+        self.card_parser = create_card_parser(self.parser, self.partial_parse)
     
     def parse_budget_text(self, budget_text: str) -> Budget:
         """予算テキストをパースしてBudgetオブジェクトを返す"""
         budget_text = budget_text.strip()
         
-        # 相談可能かどうかを判定
-        is_negotiable = "相談" in budget_text or "応相談" in budget_text
+        # 相談可能かどうかを判定（「応相談」も含む）
+        is_negotiable = "相談" in budget_text
         
         # 報酬形態を判定
         if "固定報酬制" in budget_text:
@@ -49,105 +239,132 @@ class JobExtractor:
         else:
             type_ = "その他"
         
-        # 金額を抽出
-        amount_pattern = r'(\d{1,3}(?:,\d{3})*)'
-        amounts = re.findall(amount_pattern, budget_text)
-        
-        # 金額をint型に変換（カンマを除去）
-        amounts = [int(amount.replace(',', '')) for amount in amounts]
+        # 金額を抽出し、int型に変換（カンマを除去）
+        amounts = [int(amount.replace(',', '')) for amount in self.rules.amount_pattern.findall(budget_text)]
         
         if not amounts:
-            return Budget(type=type_, min_amount=None, max_amount=None, is_negotiable=is_negotiable)
+            return make_budget(type_, None, None, is_negotiable)
         elif len(amounts) == 1:
-            return Budget(type=type_, min_amount=amounts[0], max_amount=amounts[0], is_negotiable=is_negotiable)
+            return make_budget(type_, amounts[0], amounts[0], is_negotiable)
         else:
-            return Budget(type=type_, min_amount=min(amounts), max_amount=max(amounts), is_negotiable=is_negotiable)
+            return make_budget(type_, min(amounts), max(amounts), is_negotiable)
     
     def parse_date_text(self, date_text: str) -> datetime:
         """日付テキストをパースしてdatetimeオブジェクトを返す"""
-        pattern = r'(\d{4})年(\d{2})月(\d{2})日'
-        match = re.search(pattern, date_text)
+        match = self.rules.date_pattern.search(date_text)
         if match:
             year, month, day = map(int, match.groups())
-            return datetime(year, month, day)
+            return _posted_date(year, month, day)
         raise ValueError(f"Invalid date format: {date_text}")
     
     def extract_jobs(self, html_file: Path) -> List[JobItem]:
         """HTMLファイルから案件情報を抽出する"""
         with open(html_file, 'r', encoding='utf-8') as f:
-            soup = BeautifulSoup(f.read(), 'html.parser')
+            return self.extract_jobs_from_html(f.read())
+    
+    def extract_jobs_streaming(self, pages: Iterable) -> Iterator[Tuple[object, List[JobItem]]]:
+        """取得したページ（htmlを持つオブジェクト）を順に受け取り、(ページ, 案件リスト)を返す
+        
+        抽出は別スレッドで行うため、pagesがジェネレーターであれば
+        次のページの取得と前のページの抽出が並行して進む。結果はページ順に返す。
+        """
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="extract") as executor:
+            pending = None
+            for page in pages:
+                future = executor.submit(self.extract_jobs_from_html, page.html)
+                if pending is not None:
+                    yield pending[0], pending[1].result()
+                pending = (page, future)
+            if pending is not None:
+                yield pending[0], pending[1].result()
+    
+    def extract_jobs_parallel(self, items: Iterable[Union[Path, str]], workers: Optional[int] = None,
+                              min_items: Optional[int] = None) -> Iterator[List[JobItem]]:
+        """HTMLファイル（Path）またはHTML文字列を複数プロセスで抽出し、入力順に案件リストを返す
+        
+        件数がmin_items未満、またはworkersが1の場合は現在のプロセスで順に抽出する。
+        処理中の件数はworkersの2倍までに抑えるため、itemsがジェネレーターであれば
+        全件をメモリに読み込むことはない。キャッシュの参照と保存はこのプロセスで行い、
+        キャッシュに無いページだけをワーカーに渡す。
+        """
+        workers = workers or EXTRACTION_CONFIG["parallel_workers"] or os.cpu_count() or 1
+        min_items = EXTRACTION_CONFIG["parallel_min_items"] if min_items is None else min_items
         
+        items = iter(items)
+        head = list(islice(items, min_items))
+        if workers <= 1 or len(head) < min_items:
+            for item in chain(head, items):
+                yield self._extract_item(item)
+            return
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(str(self.save_dir), self.parser, self.partial_parse, self.rules)) as executor:
+            pending = deque()
+            for item in chain(head, items):
+                pending.append(self._submit_to_worker(executor, item))
+                if len(pending) >= workers * 2:
+                    yield self._worker_result(*pending.popleft())
+            while pending:
+                yield self._worker_result(*pending.popleft())
+    
+    def _submit_to_worker(self, executor: ProcessPoolExecutor, item: Union[Path, str]) -> Tuple:
+        """(Future, キャッシュのキー) または (None, キャッシュ済みの案件リスト) を返す"""
+        if self.cache is None:
+            return executor.submit(_extract_in_worker, item), None
+        html = item.read_text(encoding='utf-8') if isinstance(item, Path) else item
+        key = content_hash(html)
+        cached = self.cache.get(key, self.cache_version)
+        if cached is not None:
+            return None, [job_from_dict(data) for data in cached]
+        return executor.submit(_extract_in_worker, html), key
+    
+    def _worker_result(self, future, value) -> List[JobItem]:
+        if future is None:
+            return value
+        jobs = future.result()
+        if value is not None:
+            self.cache.put(value, self.cache_version, [job_to_dict(job) for job in jobs])
+        return jobs
+    
+    def _extract_item(self, item: Union[Path, str]) -> List[JobItem]:
+        if isinstance(item, Path):
+            return self.extract_jobs(item)
+        return self.extract_jobs_from_html(item)
+    
+    def extract_jobs_from_archive(self, archive, category_url: Optional[str] = None,
+                                  since: Optional[datetime] = None) -> List[JobItem]:
+        """HTMLアーカイブ（HTMLArchive）の保存済みページから案件情報を抽出する
+        
+        同じ内容のページは1回だけ抽出する。ページ数が多い場合は複数プロセスで抽出する。
+        """
         jobs = []
-        # 案件カードのコンテナを取得
-        job_containers = soup.find_all('div', class_='UNzN7')
+        pages = archive.iter_pages(category_url, since, unique=True)
+        for page_jobs in self.extract_jobs_parallel(page.html for page in pages):
+            jobs.extend(page_jobs)
+        return jobs
+    
+    def extract_jobs_from_html(self, html: str) -> List[JobItem]:
+        """HTML文字列から案件情報を抽出する（キャッシュにあれば解析しない）"""
+        if self.cache is None:
+            return self._parse_jobs(html)
         
-        for container in job_containers:
+        key = content_hash(html)
+        cached = self.cache.get(key, self.cache_version)
+        if cached is not None:
+            return [job_from_dict(data) for data in cached]
+        jobs = self._parse_jobs(html)
+        self.cache.put(key, self.cache_version, [job_to_dict(job) for job in jobs])
+        return jobs
+    
+    def _parse_jobs(self, html: str) -> List[JobItem]:
+        """HTMLを解析して案件情報を抽出する"""
+        jobs = []
+        # 案件カードごとのテキストを取得
+        for card in self.card_parser.iter_cards(html):
             try:
-                # タイトル情報を含むdivを取得
-                title_div = container.find('div', class_='rGkuO')
-                if not title_div:
-                    continue
-                
-                # クライアント名と掲載日を分離
-                title_text = title_div.get_text().strip()
-                client_match = re.match(r'^(.+?)掲載日：', title_text)
-                client_name = client_match.group(1) if client_match else "不明"
-                
-                # 案件本文を取得
-                job_text = container.get_text().strip()
-                
-                # PRかどうかを判定
-                is_pr = job_text.startswith('PR')
-                
-                # タイトルを抽出（PRプレフィックスを除去）
-                title = job_text.split('\n')[0]
-                if is_pr:
-                    title = title[2:].strip()
-                
-                # カテゴリを判定
-                categories = [
-                    'AI・機械学習', '機械学習・ディープラーニング', 'AI・チャットボット開発',
-                    'ChatGPT開発', 'AIアノテーション', 'データサイエンス'
-                ]
-                category = next((cat for cat in categories if cat in title), '')
-                
-                # 予算と期限を取得
-                budget_elements = container.find_all('div', class_='mLant')
-                budget = None
-                deadline = None
-                
-                for element in budget_elements:
-                    text = element.get_text().strip()
-                    if any(keyword in text for keyword in ['円', '報酬']):
-                        budget = self.parse_budget_text(text)
-                    elif 'まで' in text:
-                        deadline = text
-                
-                # 掲載日を取得
-                date_div = container.find('div', class_='cAtkF')
-                posted_date = self.parse_date_text(date_div.get_text()) if date_div else None
-                
-                # 説明文を取得
-                description_lines = [line.strip() for line in job_text.split('\n')[1:] 
-                                   if line.strip() and not any(keyword in line for keyword in ['円', 'まで', '掲載日：'])]
-                description = '\n'.join(description_lines)
-                
-                # URLを取得
-                url_element = container.find('a', href=True)
-                url = url_element['href'] if url_element else None
-                
-                job = JobItem(
-                    title=title,
-                    category=category,
-                    description=description,
-                    budget=budget or Budget(type="不明", min_amount=None, max_amount=None, is_negotiable=True),
-                    deadline=deadline,
-                    posted_date=posted_date,
-                    client_name=client_name,
-                    url=url,
-                    is_pr=is_pr
-                )
-                jobs.append(job)
+                job = self._build_job(card)
+                if job:
+                    jobs.append(job)
                 
             except Exception as e:
                 print(f"案件の解析中にエラーが発生しました: {e}")
@@ -155,30 +372,78 @@ class JobExtractor:
         
         return jobs
     
+    def _build_job(self, card: CardFields) -> Optional[JobItem]:
+        """案件カードのテキストからJobItemを作成する（タイトル情報が無いカードはNone）"""
+        # タイトル情報を含むdivが無ければスキップ
+        if card.client_text is None:
+            return None
+        
+        rules = self.rules
+        
+        # クライアント名と掲載日を分離
+        client_match = rules.client_pattern.match(card.client_text.strip())
+        client_name = client_match.group(1) if client_match else "不明"
+        
+        # 案件本文を行に分割（以降の判定はこの行リストだけを使う）
+        job_text = card.job_text.strip()
+        lines = job_text.split('\n')
+        
+        # PRかどうかを判定
+        is_pr = job_text.startswith('PR')
+        
+        # タイトルを抽出（PRプレフィックスを除去）
+        title = lines[0]
+        if is_pr:
+            title = title[2:].strip()
+        
+        # カテゴリを判定
+        category = next((cat for cat in rules.categories if cat in title), '')
+        
+        # 予算と期限を取得
+        budget = None
+        deadline = None
+        
+        for budget_text in card.budget_texts:
+            text = budget_text.strip()
+            if rules.budget_keyword_pattern.search(text):
+                budget = self.parse_budget_text(text)
+            elif rules.deadline_keyword in text:
+                deadline = text
+        
+        # 掲載日を取得
+        posted_date = self.parse_date_text(card.date_text) if card.date_text is not None else None
+        
+        # 説明文を取得
+        is_excluded = rules.description_excluded_pattern.search
+        description = '\n'.join(
+            line for line in map(str.strip, lines[1:]) if line and not is_excluded(line)
+        )
+        
+        return JobItem(
+            title=title,
+            category=category,
+            description=description,
+            budget=budget or make_budget("不明", None, None, True),
+            deadline=_intern(deadline),
+            posted_date=posted_date,
+            client_name=sys.intern(client_name),
+            url=card.url,
+            is_pr=is_pr,
+            job_id=make_job_id(card.url, title, client_name, description)
+        )
+    
+    def save_jobs(self, jobs: List[JobItem], store) -> int:
+        """案件情報を案件ストア（JobStore）に保存し、新規に追加した件数を返す"""
+        new_count = store.upsert_jobs(jobs)
+        print(f"\n案件情報を {store.path} に保存しました（新規 {new_count}件 / 更新 {len(jobs) - new_count}件）。")
+        return new_count
+    
     def save_jobs_to_json(self, jobs: List[JobItem], timestamp: str = None):
         """案件情報をJSONファイルとして保存"""
         if timestamp is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         
-        jobs_data = [
-            {
-                'title': job.title,
-                'category': job.category,
-                'description': job.description,
-                'budget': {
-                    'type': job.budget.type,
-                    'min_amount': job.budget.min_amount,
-                    'max_amount': job.budget.max_amount,
-                    'is_negotiable': job.budget.is_negotiable
-                },
-                'deadline': job.deadline,
-                'posted_date': job.posted_date.isoformat() if job.posted_date else None,
-                'client_name': job.client_name,
-                'url': job.url,
-                'is_pr': job.is_pr
-            }
-            for job in jobs
-        ]
+        jobs_data = [job_to_dict(job) for job in jobs]
         
         output_file = self.save_dir / f'extracted_jobs_{timestamp}.json'
         with open(output_file, 'w', encoding='utf-8') as f:
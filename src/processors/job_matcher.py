@@ -1,40 +1,123 @@
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Tuple
 from datetime import datetime
 import json
 import csv
 import re
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
 from tqdm import tqdm
 from ..models.user_profile import UserProfile
 from src.utils.config import MATCHING_CONFIG
-from api import get_client, generate_chat_completion
+from api import get_client, get_model_name, get_token_usage, generate_chat_completion
 from openai import OpenAI
 from ..utils.logger import setup_logger
+from ..utils.tokens import estimate_tokens, truncate_to_tokens
 from ..filters.job_filters import apply_filters
+from ..filters.lexical_scorer import BM25Prefilter
+from ..filters.prefilter import apply_prefilter
+from ..storage.job_store import JobStore
+from ..storage.jsonl import JSONLWriter
+from ..storage.score_cache import ScoreCache, job_score_key, profile_hash
 
 logger = setup_logger(__name__)
 
+# 評価プロンプトや採点基準を変えたら上げる（スコアキャッシュのキーに含める）
+PROMPT_VERSION = "2"
+
+SYSTEM_PROMPT = "You are a helpful assistant that evaluates job matches based on user profile requirements."
+
 @dataclass
 class JobMatch:
     """案件とマッチング結果"""
-    job: Dict  # 案件情報
+    job: Mapping  # 案件情報（job_to_dict形式の辞書、またはJobView）
     relevance_score: float  # 関連度スコア（0-100）
     quick_filtered: bool = False  # クイックフィルタリングで除外されたかどうか
     filter_reason: str = ""  # フィルタリングされた理由
 
+@dataclass
+class BatchUsage:
+    """1回のLLM呼び出し（1バッチ）のトークン数"""
+    jobs: int  # バッチの案件数
+    estimated_prompt_tokens: int  # 送信前に見積もったプロンプトのトークン数
+    prompt_tokens: Optional[int]  # LLMが返した実際のプロンプトのトークン数（不明な場合はNone）
+    completion_tokens: Optional[int]  # LLMが返した実際の出力のトークン数（不明な場合はNone）
+
+class BatchPacker:
+    """案件を順にバッチに詰める（batch_size件まで、かつ推定トークン数の合計がtoken_limitを超えない範囲で）"""
+
+    def __init__(self, batch_size: int, token_limit: float, estimate_tokens: Callable[[Mapping], int]):
+        self.batch_size = batch_size
+        self.token_limit = token_limit
+        self.estimate_tokens = estimate_tokens
+        self.jobs: List[Mapping] = []
+        self.tokens = 0
+
+    def add(self, job: Mapping) -> List[List[Mapping]]:
+        """案件を追加し、詰め終わったバッチ（無ければ空のリスト）を返す
+
+        追加するとトークン数の上限を超える場合は、先にそれまでのバッチを詰め終わる。
+        上限を1件で超える案件も、1件だけのバッチとして返す。
+        """
+        done = []
+        job_tokens = self.estimate_tokens(job)
+        if self.jobs and self.tokens + job_tokens > self.token_limit:
+            done.append(self.flush())
+        self.jobs.append(job)
+        self.tokens += job_tokens
+        if len(self.jobs) >= self.batch_size:
+            done.append(self.flush())
+        return done
+
+    def flush(self) -> List[Mapping]:
+        """詰めかけのバッチを返して空にする"""
+        jobs = self.jobs
+        self.jobs, self.tokens = [], 0
+        return jobs
+
+def match_to_dict(match: JobMatch) -> Dict:
+    """JobMatchを評価結果のJSON Lines 1行分の辞書に変換する"""
+    return {
+        'job_id': match.job.get('job_id'),
+        'relevance_score': match.relevance_score,
+        'quick_filtered': match.quick_filtered,
+        'filter_reason': match.filter_reason,
+        'evaluated_at': datetime.now().isoformat(timespec='seconds'),
+        'job': match.job
+    }
+
 class JobMatcher:
     """案件マッチングクラス"""
     
-    def __init__(self, save_dir: str = "data/matches"):
+    def __init__(self, save_dir: str = "data/matches", store: Optional[JobStore] = None,
+                 score_cache: Optional[ScoreCache] = None, prefilter=None):
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
-        self.jobs = []
+        self.store = store  # jobsを指定しない場合の読み込み先（省略時は既定のJobStore）
+        self.evaluation_writer: Optional[JSONLWriter] = None  # 指定時は評価結果を1件ずつ追記する
+        self.score_cache = score_cache  # 指定時は評価済みのスコアを再利用し、未評価の案件だけをLLMに送る
+        self.prefilter = prefilter  # 指定時はクイックフィルタを通過した案件をさらに絞り込んでからLLMに送る
+        # 採点方法が"bm25"の場合はLLMを使わない
+        scoring = MATCHING_CONFIG.get("scoring", "llm")
+        if scoring not in ("llm", "bm25"):
+            raise ValueError(f"未対応の採点方法です: {scoring}")
+        self.lexical_scorer = BM25Prefilter() if scoring == "bm25" else None
         # 設定からLLMタイプを取得してクライアントを初期化
         llm_type = MATCHING_CONFIG.get("llm_type", "local")
-        self.client = get_client(llm_type)
-        # 設定からbatch_sizeを取得
+        self.client = get_client(llm_type) if self.lexical_scorer is None else None
+        # 設定からbatch_size（1バッチの案件数の上限）を取得
         self.batch_size = MATCHING_CONFIG.get("batch_size", 3)
+        # 1回のプロンプトの推定トークン数の上限（モデルごと。設定が無いモデルは件数だけで分ける）
+        self.prompt_token_limit = (
+            MATCHING_CONFIG.get("prompt_token_limits", {}).get(get_model_name(self.client))
+            if self.client is not None else None
+        )
+        self.max_description_tokens = MATCHING_CONFIG.get("max_description_tokens")
+        self.num_ctx = MATCHING_CONFIG.get("ollama_num_ctx")
+        self.token_usage: List[BatchUsage] = []  # LLM呼び出しごとのトークン数（呼び出し順）
+        # 同時にLLMへ送るバッチ数（1の場合は1バッチずつ順に評価する）
+        self.max_concurrent_batches = max(1, MATCHING_CONFIG.get("max_concurrent_batches", 1))
 
     def quick_filter_job(self, job: Dict, user_profile: UserProfile) -> Tuple[bool, str]:
         """基本的な条件でジョブをフィルタリング
@@ -45,61 +128,91 @@ class JobMatcher:
         return apply_filters(job, user_profile)
 
     def evaluate_jobs_batch(self, jobs: List[Dict], user_profile: UserProfile) -> List[JobMatch]:
-        """複数の案件を一括で評価"""
-        prompt = f"""
-以下のユーザープロファイルと案件情報を基に、各案件の関連度スコアを評価してください。
+        """複数の案件を一括で評価（スコアキャッシュにある案件はLLMに送らない）
+        
+        batch_size件を超える場合やプロンプトの推定トークン数がprompt_token_limitを超える場合は、
+        _evaluate_in_orderと同じ詰め方で複数回に分けてLLMに送る。
+        採点方法が"bm25"の場合はLLMを使わずBM25で採点する。
+        """
+        if self.lexical_scorer is not None:
+            return self._score_lexically(jobs, user_profile)
+        context = self._score_context(user_profile) if self.score_cache is not None else None
+        cached = [self._cached_match(job, context) if context is not None else None for job in jobs]
+        uncached = [job for job, match in zip(jobs, cached) if match is None]
+        evaluated = iter([
+            match
+            for batch_jobs in self._split_batches(uncached, user_profile)
+            for match in self._evaluate_with_llm(batch_jobs, user_profile, context)
+        ])
+        return [match if match is not None else next(evaluated) for match in cached]
 
-【評価基準】
-スコアの基準:
-- 0-20点: ユーザープロファイルと全く合致しない
-- 21-40点: ユーザープロファイルとの合致が低い
-- 41-60点: ユーザープロファイルと部分的に合致
-- 61-80点: ユーザープロファイルと良く合致
-- 81-100点: ユーザープロファイルと非常に良く合致
+    def _split_batches(self, jobs: List[Mapping], user_profile: UserProfile) -> List[List[Mapping]]:
+        """案件を順にバッチに分ける（BatchPackerの詰め方）"""
+        packer = self._batch_packer(user_profile)
+        batches = [batch_jobs for job in jobs for batch_jobs in packer.add(job)]
+        rest = packer.flush()
+        return batches + [rest] if rest else batches
 
-以下の要素を総合的に評価してください：
-1. スキルの合致度
-2. 希望カテゴリとの合致度
-3. 希望する働き方との合致度
-4. 案件内容とユーザー詳細情報の親和性
+    def _batch_packer(self, user_profile: UserProfile) -> BatchPacker:
+        return BatchPacker(self.batch_size, self._job_token_limit(user_profile), self._estimate_job_tokens)
 
-【ユーザープロファイル】
-- スキル: {', '.join(user_profile.skills)}
-- 希望カテゴリ: {', '.join(user_profile.preferred_categories)}
-- 希望する働き方: {', '.join(user_profile.preferred_work_type)}
-- 追加情報: {user_profile.description}
+    def _job_token_limit(self, user_profile: UserProfile) -> float:
+        """1バッチの案件部分に使える推定トークン数（プロンプトの上限から案件以外の部分を引いたもの）"""
+        if self.prompt_token_limit is None:
+            return float('inf')
+        return self.prompt_token_limit - self._estimate_prompt_tokens(self._build_prompt([], user_profile))
 
-【評価対象案件】
-{json.dumps([{
-    'id': i,
-    'title': job['title'],
-    'category': job['category'],
-    'budget': job['budget'],
-    'description': job['description']
-} for i, job in enumerate(jobs)], ensure_ascii=False, indent=2)}
+    def _estimate_job_tokens(self, job: Mapping) -> int:
+        """プロンプト上の案件1件分の推定トークン数（説明文は切り詰めた後の長さ）"""
+        # リストの要素としての字下げと区切りの分も含めて数える
+        return estimate_tokens(json.dumps([self._prompt_entry(0, job)], ensure_ascii=False, indent=2, default=dict))
 
-以下の形式でJSONを出力してください:
-{{
-    "scores": [
-        {{ 
-            "id": 案件ID,
-            "score": 0-100のスコア
-        }},
-        ...
-    ]
-}}
-"""
+    def _estimate_prompt_tokens(self, prompt: str) -> int:
+        return estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(prompt)
+
+    def _prompt_entry(self, i: int, job: Mapping) -> Dict:
+        """プロンプトに含める案件情報（説明文が長すぎる案件は説明文を切り詰める）"""
+        description = job['description']
+        if self.max_description_tokens is not None:
+            description = truncate_to_tokens(description, self.max_description_tokens)
+        return {
+            'id': i,
+            'title': job['title'],
+            'category': job['category'],
+            'budget': job['budget'],
+            'description': description
+        }
+
+    def _score_context(self, user_profile: UserProfile) -> Tuple[str, str, str]:
+        """スコアキャッシュのキーのうち、案件によらない部分"""
+        return profile_hash(user_profile), get_model_name(self.client), PROMPT_VERSION
+
+    def _cached_match(self, job: Mapping, context: Tuple[str, str, str]) -> Optional[JobMatch]:
+        score = self.score_cache.get(job_score_key(job), context)
+        if score is None:
+            return None
+        return JobMatch(job=job, relevance_score=score, quick_filtered=False)
+
+    def _evaluate_with_llm(self, jobs: List[Mapping], user_profile: UserProfile,
+                           context: Optional[Tuple[str, str, str]] = None) -> List[JobMatch]:
+        """LLMで複数の案件を一括で評価する（スコアキャッシュがあれば結果を保存する）"""
+        if not jobs:
+            return []
+        prompt = self._build_prompt([self._prompt_entry(i, job) for i, job in enumerate(jobs)], user_profile)
+        estimated_tokens = self._estimate_prompt_tokens(prompt)
 
         try:
             response = generate_chat_completion(
                 client=self.client,
                 messages=[
-                    {"role": "system", "content": "You are a helpful assistant that evaluates job matches based on user profile requirements."},
+                    {"role": "system", "content": SYSTEM_PROMPT},
                     {"role": "user", "content": prompt}
                 ],
                 response_format={"type": "json_object"},
                 temperature=0.1,
+                num_ctx=self.num_ctx,
             )
+            self._record_usage(len(jobs), estimated_tokens, response)
 
             if isinstance(self.client, OpenAI):
                 result = json.loads(response.choices[0].message.content)
@@ -108,11 +221,14 @@ class JobMatcher:
 
             # スコアを各案件に割り当て
             job_matches = []
+            scored = []  # キャッシュに保存する (案件のキー, スコア)（LLMがスコアを返した案件のみ）
             for job in jobs:
                 score_info = next((s for s in result['scores'] if s['id'] == len(job_matches)), None)
                 score = float(score_info['score']) if score_info else 0.0
                 # スコアの範囲を確認
                 score = max(0.0, min(100.0, score))
+                if score_info:
+                    scored.append((job_score_key(job), score))
                 
                 job_matches.append(JobMatch(
                     job=job,
@@ -120,6 +236,8 @@ class JobMatcher:
                     quick_filtered=False
                 ))
             
+            if self.score_cache is not None:
+                self.score_cache.put_many(scored, context or self._score_context(user_profile))
             return job_matches
 
         except Exception as e:
@@ -130,67 +248,103 @@ class JobMatcher:
                 quick_filtered=False
             ) for job in jobs]
 
+    def _build_prompt(self, entries: List[Dict], user_profile: UserProfile) -> str:
+        """評価プロンプト（entriesは_prompt_entryで作った案件情報のリスト）"""
+        return f"""
+以下のユーザープロファイルと案件情報を基に、各案件の関連度スコアを評価してください。
+
+【評価基準】
+スコアの基準:
+- 0-20点: ユーザープロファイルと全く合致しない
+- 21-40点: ユーザープロファイルとの合致が低い
+- 41-60点: ユーザープロファイルと部分的に合致
+- 61-80点: ユーザープロファイルと良く合致
+- 81-100点: ユーザープロファイルと非常に良く合致
+
+以下の要素を総合的に評価してください：
+1. スキルの合致度
+2. 希望カテゴリとの合致度
+3. 希望する働き方との合致度
+4. 案件内容とユーザー詳細情報の親和性
+
+【ユーザープロファイル】
+- スキル: {', '.join(user_profile.skills)}
+- 希望カテゴリ: {', '.join(user_profile.preferred_categories)}
+- 希望する働き方: {', '.join(user_profile.preferred_work_type)}
+- 追加情報: {user_profile.description}
+
+【評価対象案件】
+{json.dumps(entries, ensure_ascii=False, indent=2, default=dict)}
+
+以下の形式でJSONを出力してください:
+{{
+    "scores": [
+        {{ 
+            "id": 案件ID,
+            "score": 0-100のスコア
+        }},
+        ...
+    ]
+}}
+"""
+
+    def _log_token_usage(self, usage: List[BatchUsage]):
+        """LLM呼び出しの回数と1回あたりの案件数、トークン数の合計を出力する"""
+        if not usage:
+            return
+        num_jobs = sum(u.jobs for u in usage)
+        estimated = sum(u.estimated_prompt_tokens for u in usage)
+        prompt = sum(u.prompt_tokens or 0 for u in usage)
+        completion = sum(u.completion_tokens or 0 for u in usage)
+        logger.info(
+            f"LLM呼び出し: {len(usage)}回（1回あたり平均{num_jobs / len(usage):.1f}件）、"
+            f"プロンプト {prompt:,}トークン（推定 {estimated:,}）、出力 {completion:,}トークン"
+        )
+
+    def _record_usage(self, num_jobs: int, estimated_tokens: int, response):
+        """LLM呼び出し1回分のトークン数を記録する（実際のプロンプトが上限を超えていれば警告する）"""
+        prompt_tokens, completion_tokens = get_token_usage(response)
+        self.token_usage.append(BatchUsage(num_jobs, estimated_tokens, prompt_tokens, completion_tokens))
+        logger.debug(f"バッチ評価: {num_jobs}件、プロンプト {prompt_tokens}トークン（推定 {estimated_tokens}）、出力 {completion_tokens}トークン")
+        if prompt_tokens is not None and self.prompt_token_limit is not None and prompt_tokens > self.prompt_token_limit:
+            logger.warning(f"プロンプトが上限を超えました（{prompt_tokens} > {self.prompt_token_limit}トークン）。prompt_token_limitsを見直してください")
+
     def find_matching_jobs(
         self,
         user_profile: UserProfile,
         min_score: float = 70.0,
-        max_jobs: int = 5
+        max_jobs: int = 5,
+        jobs: Optional[List[Mapping]] = None
     ) -> List[JobMatch]:
-        """ユーザープロファイルに合致する案件を探す"""
-        # 最新の分析済み案件を読み込む
-        analyzed_files = sorted(
-            Path("data/jobs").glob("extracted_jobs_*.json"),
-            key=lambda x: x.stat().st_mtime,
-            reverse=True
-        )
-        
-        if not analyzed_files:
-            raise FileNotFoundError("分析済みの案件ファイルが見つかりません")
+        """ユーザープロファイルに合致する案件を探す
         
-        with open(analyzed_files[0], 'r', encoding='utf-8') as f:
-            jobs = json.load(f)
+        jobsを省略した場合は、案件ストアに最後に保存された案件を評価する。
+        """
+        if jobs is None:
+            jobs = self._load_latest_jobs()
         
         logger.info(f"合計{len(jobs)}件の案件を評価します...")
         
-        # 各案件を評価
+        # 各案件を評価（結果は同時評価の有無によらずjobsの順に返る）
         matches = []
         all_evaluations = []
+        cache_counts = (self.score_cache.hits, self.score_cache.misses) if self.score_cache is not None else None
+        usage_start = len(self.token_usage)
+        if self.lexical_scorer is not None:
+            evaluations = self._evaluate_lexically(jobs, user_profile)
+        else:
+            evaluations = self._evaluate_in_order(jobs, user_profile)
+        for match in evaluations:
+            self._add_evaluation(all_evaluations, match)
+            if not match.quick_filtered and match.relevance_score >= min_score:
+                matches.append(match)
         
-        # バッチ処理用の一時リスト
-        batch_jobs = []
-        
-        for job in tqdm(jobs, desc="案件評価の進捗", unit="件"):
-            # クイックフィルタを適用
-            should_filter, reason = self.quick_filter_job(job, user_profile)
-            if should_filter:
-                match = JobMatch(
-                    job=job,
-                    relevance_score=0.0,
-                    quick_filtered=True,
-                    filter_reason=reason
-                )
-                all_evaluations.append(match)
-                continue
-            
-            # フィルタを通過した案件をバッチに追加
-            batch_jobs.append(job)
-            
-            # バッチサイズに達したら評価実行
-            if len(batch_jobs) >= self.batch_size:
-                batch_matches = self.evaluate_jobs_batch(batch_jobs, user_profile)
-                for match in batch_matches:
-                    all_evaluations.append(match)
-                    if match.relevance_score >= min_score:
-                        matches.append(match)
-                batch_jobs = []  # バッチをクリア
-        
-        # 残りの案件を評価
-        if batch_jobs:
-            batch_matches = self.evaluate_jobs_batch(batch_jobs, user_profile)
-            for match in batch_matches:
-                all_evaluations.append(match)
-                if match.relevance_score >= min_score:
-                    matches.append(match)
+        if cache_counts is not None:
+            hits = self.score_cache.hits - cache_counts[0]
+            lookups = hits + self.score_cache.misses - cache_counts[1]
+            if lookups:
+                logger.info(f"スコアキャッシュ: ヒット率 {hits / lookups:.0%}（{hits}/{lookups}件、LLMで評価 {lookups - hits}件）")
+        self._log_token_usage(self.token_usage[usage_start:])
         
         # 全案件の評価結果をCSVに保存
         self.save_all_evaluations_to_csv(all_evaluations)
@@ -199,6 +353,110 @@ class JobMatcher:
         matches.sort(key=lambda x: x.relevance_score, reverse=True)
         return matches[:max_jobs]
 
+    def _evaluate_in_order(self, jobs: List[Mapping], user_profile: UserProfile) -> Iterator[JobMatch]:
+        """クイックフィルタ・プレフィルターとバッチ評価を行い、1バッチずつ順に評価した場合と同じ順で結果を返す
+        
+        スコアキャッシュにある案件はバッチに入れず、クイックフィルタの結果と同様にすぐ返す。
+        バッチにはbatch_size件まで、プロンプトの推定トークン数がprompt_token_limitを超えない範囲で案件を詰める。
+        max_concurrent_batchesが2以上の場合は、その数までのバッチをスレッドで同時にLLMへ送る。
+        先頭のバッチの評価が終わるまで後続の結果は返さないため、順序は変わらない。
+        """
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrent_batches) if self.max_concurrent_batches > 1 else None
+        context = self._score_context(user_profile) if self.score_cache is not None else None
+        # 返す順に並べた結果（評価済みの結果のリスト、または評価中のバッチのFuture）
+        pending = deque()
+        in_flight = 0
+        packer = self._batch_packer(user_profile)
+        decisions = self._filter_jobs(jobs, user_profile)
+        try:
+            for job, (should_filter, reason) in tqdm(zip(jobs, decisions), total=len(jobs), desc="案件評価の進捗", unit="件"):
+                # 評価済みの案件はLLMに送らない
+                cached = self._cached_match(job, context) if context is not None and not should_filter else None
+                if should_filter:
+                    pending.append([JobMatch(
+                        job=job,
+                        relevance_score=0.0,
+                        quick_filtered=True,
+                        filter_reason=reason
+                    )])
+                elif cached is not None:
+                    pending.append([cached])
+                else:
+                    # フィルタを通過した案件をバッチに追加し、詰め終わったバッチを評価実行
+                    for batch_jobs in packer.add(job):
+                        pending.append(self._submit_batch(executor, batch_jobs, user_profile, context))
+                        if executor is not None:
+                            in_flight += 1
+                
+                # 先頭から評価済みの結果を返す（同時評価数の上限に達していれば先頭の完了を待つ）
+                while pending and (not isinstance(pending[0], Future) or in_flight >= self.max_concurrent_batches):
+                    entry = pending.popleft()
+                    if isinstance(entry, Future):
+                        in_flight -= 1
+                        entry = entry.result()
+                    yield from entry
+            
+            # 残りの案件を評価
+            batch_jobs = packer.flush()
+            if batch_jobs:
+                pending.append(self._submit_batch(executor, batch_jobs, user_profile, context))
+            while pending:
+                entry = pending.popleft()
+                yield from (entry.result() if isinstance(entry, Future) else entry)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    def _evaluate_lexically(self, jobs: List[Mapping], user_profile: UserProfile) -> Iterator[JobMatch]:
+        """LLMを使わず、フィルタを通過した案件をBM25でまとめて採点し、jobsの順に結果を返す"""
+        decisions = self._filter_jobs(jobs, user_profile)
+        candidates = [i for i, (should_filter, _) in enumerate(decisions) if not should_filter]
+        matches = dict(zip(candidates, self._score_lexically([jobs[i] for i in candidates], user_profile)))
+        for i, (job, (should_filter, reason)) in enumerate(zip(jobs, decisions)):
+            if should_filter:
+                yield JobMatch(job=job, relevance_score=0.0, quick_filtered=True, filter_reason=reason)
+            else:
+                yield matches[i]
+
+    def _score_lexically(self, jobs: List[Mapping], user_profile: UserProfile) -> List[JobMatch]:
+        """案件をBM25でまとめて採点する（フィルタは適用しない）"""
+        scores = self.lexical_scorer.relevance_scores(jobs, user_profile)
+        return [JobMatch(job=job, relevance_score=round(float(score), 1), quick_filtered=False)
+                for job, score in zip(jobs, scores)]
+
+    def _filter_jobs(self, jobs: List[Mapping], user_profile: UserProfile) -> List[Tuple[bool, str]]:
+        """案件ごとに (除外すべきか, 除外理由) を返す（クイックフィルタの後にプレフィルターを適用）"""
+        decisions = [self.quick_filter_job(job, user_profile) for job in jobs]
+        if self.prefilter is None:
+            return decisions
+        
+        candidates = [i for i, (should_filter, _) in enumerate(decisions) if not should_filter]
+        selected, scores = apply_prefilter(self.prefilter, [jobs[i] for i in candidates], user_profile)
+        for i, keep, score in zip(candidates, selected, scores):
+            if not keep:
+                decisions[i] = (True, f"{self.prefilter.name}が低いため除外（{score:.3f}）")
+        return decisions
+
+    def _submit_batch(self, executor: Optional[ThreadPoolExecutor], batch_jobs: List[Mapping],
+                      user_profile: UserProfile, context: Optional[Tuple[str, str, str]]):
+        # キャッシュは参照済みのため、LLMでの評価を直接行う
+        if executor is None:
+            return self._evaluate_with_llm(batch_jobs, user_profile, context)
+        return executor.submit(self._evaluate_with_llm, batch_jobs, user_profile, context)
+
+    def _add_evaluation(self, all_evaluations: List[JobMatch], match: JobMatch):
+        all_evaluations.append(match)
+        if self.evaluation_writer is not None:
+            self.evaluation_writer.write(match_to_dict(match))
+
+    def _load_latest_jobs(self) -> List[Dict]:
+        """案件ストアに最後に保存された案件を読み込む"""
+        store = self.store or JobStore()
+        jobs = store.latest_jobs()
+        if not jobs:
+            raise FileNotFoundError(f"保存済みの案件が見つかりません: {store.path}")
+        return jobs
+
     def save_matching_results(self, matches: List[JobMatch], user_profile: UserProfile):
         """マッチング結果をJSONファイルとして保存"""
         results = {
@@ -225,7 +483,7 @@ class JobMatcher:
         output_file = self.save_dir / f"matching_results_{timestamp}.json"
         
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+            json.dump(results, f, ensure_ascii=False, indent=2, default=dict)
         
         logger.info(f"\nマッチング結果を {output_file} に保存しました。")
         
@@ -0,0 +1,195 @@
+from playwright.async_api import async_playwright
+import asyncio
+import re
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from ..utils.config import SCRAPING_CONFIG
+from ..utils.rate_limiter import RetryPolicy, get_retry_policy
+from .browser_pool import BROWSER_LAUNCH_ARGS, CONTEXT_OPTIONS
+from .html_scraper import build_search_url, is_next_page_link
+from .page_readiness import PageTiming, load_listing_page_async
+from .resource_blocker import ResourceBlocker
+from .seen_jobs import SeenJobsStore
+from .screenshot import ScreenshotWriter, screenshot_paths_for
+
+class AsyncHTMLScraper:
+    """asyncio版のHTMLスクレイパー
+
+    複数ページ・複数カテゴリを別タブで並行取得する。
+    同一ホストへの同時接続数はmax_concurrency_per_hostで制限する。
+    戻り値はHTMLScraperと同じく保存したHTMLファイルのパスのリスト。
+    """
+
+    def __init__(self, save_dir: str = "data/html", max_concurrency_per_host: Optional[int] = None,
+                 seen_jobs: Optional[SeenJobsStore] = None, screenshots: Optional[ScreenshotWriter] = None,
+                 retry: Optional[RetryPolicy] = None):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.max_concurrency_per_host = (
+            max_concurrency_per_host
+            if max_concurrency_per_host is not None
+            else SCRAPING_CONFIG.get("max_concurrency_per_host", 3)
+        )
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.retry = retry or get_retry_policy()  # 取得間隔の制御とリトライ（同時接続数とは別に適用）
+        self._context = None
+        self.screenshots = screenshots or ScreenshotWriter.from_config()
+        self.seen_jobs = seen_jobs  # 指定時は取得済み案件だけのページでページ送りを打ち切る
+        self.pages_skipped = 0  # 取得済み案件のため取得しなかったページ数
+        self.page_timings: List[PageTiming] = []  # ページごとの読み込み時間の記録
+
+    def scrape_categories(self, category_urls: List[str], max_pages: int = 3) -> Dict[str, List[Path]]:
+        """複数カテゴリを並行スクレイピングする（同期呼び出し用）"""
+        return asyncio.run(self.scrape_categories_async(category_urls, max_pages))
+
+    async def scrape_categories_async(self, category_urls: List[str], max_pages: int = 3) -> Dict[str, List[Path]]:
+        """複数カテゴリを並行スクレイピングし、カテゴリURLごとの保存パスを返す"""
+        print(f"📄 並行スクレイピング開始: {len(category_urls)}カテゴリ × 最大{max_pages}ページ")
+        # セマフォはイベントループごとに作り直す
+        self._host_semaphores = {}
+
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+            self._context = await browser.new_context(**CONTEXT_OPTIONS)
+            try:
+                results = await asyncio.gather(*[
+                    self.save_html_with_pagination(url, max_pages)
+                    for url in category_urls
+                ])
+            finally:
+                self._context = None
+                await browser.close()
+                self.screenshots.flush()
+
+        total = sum(len(files) for files in results)
+        print(f"🎉 並行スクレイピング完了: {total}ページ保存")
+        return dict(zip(category_urls, results))
+
+    async def save_html_with_pagination(self, category_url: str, max_pages: int = 3) -> List[Path]:
+        """1カテゴリの全ページを並行取得する
+
+        全ページを同時に取得した後、次ページが存在しなかったページ以降と
+        取得に失敗したページ以降は破棄する（逐次版と同じ結果になるようにする）。
+        差分取得が有効な場合は1ページ目だけを先に取得し、全て取得済みの案件なら
+        残りのページは取得しない。
+        """
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        prefix = f"{timestamp}_c{_category_slug(category_url)}"
+
+        def fetch(page_num: int):
+            return self._fetch_page(build_search_url(category_url, page_num), prefix, page_num, max_pages)
+
+        if self.seen_jobs is not None:
+            results = list(await asyncio.gather(fetch(1), return_exceptions=True))
+            first = results[0]
+            if isinstance(first, BaseException) or not self.seen_jobs.is_page_known(category_url, first[2]):
+                results += await asyncio.gather(*[
+                    fetch(page_num) for page_num in range(2, max_pages + 1)
+                ], return_exceptions=True)
+        else:
+            results = await asyncio.gather(*[
+                fetch(page_num) for page_num in range(1, max_pages + 1)
+            ], return_exceptions=True)
+
+        saved_files = []
+        kept_html = []
+        discarded = []
+        stopped = False
+        for page_num, result in enumerate(results, 1):
+            if stopped:
+                if not isinstance(result, BaseException):
+                    discarded.append(result[0])
+                continue
+            if isinstance(result, BaseException):
+                print(f"  ❌ ページ {page_num} の取得中にエラー: {result}")
+                stopped = True
+                continue
+            save_path, has_next, html_content = result
+            saved_files.append(save_path)
+            kept_html.append(html_content)
+            if self.seen_jobs is not None and self.seen_jobs.is_page_known(category_url, html_content):
+                # 以降のページは取得しなかった（または破棄する）ためスキップ数に加算
+                skipped = max_pages - page_num
+                if skipped > 0:
+                    self.pages_skipped += skipped
+                    print(f"  ⏭️  全て取得済みの案件です。残り{skipped}ページをスキップします。")
+                stopped = True
+            elif page_num < max_pages and not has_next:
+                print(f"  ⚠️  ページ {page_num + 1} は存在しません。{page_num}ページで終了します。")
+                stopped = True
+
+        # 存在しないページとして取得した分は削除
+        if discarded:
+            # 書き込み待ちのスクリーンショットを保存し終えてから削除する
+            self.screenshots.flush()
+        for path in discarded:
+            path.unlink(missing_ok=True)
+            for screenshot_path in screenshot_paths_for(path):
+                screenshot_path.unlink(missing_ok=True)
+
+        if self.seen_jobs is not None:
+            for html_content in kept_html:
+                self.seen_jobs.remember(category_url, html_content)
+
+        return saved_files
+
+    async def _fetch_page(self, url: str, prefix: str, page_num: int, max_pages: int) -> Tuple[Path, bool, str]:
+        """1ページを新しいタブで取得し、保存パス・次ページの有無・HTMLを返す"""
+        async with self._semaphore_for(url):
+            print(f"🔍 ページ {page_num}/{max_pages} を処理中: {url}")
+            page = await self._context.new_page()
+            try:
+                blocker = ResourceBlocker.from_config()
+                if blocker:
+                    await blocker.attach_async(page)
+                timing = await self.retry.call_async(url, lambda: load_listing_page_async(page, url, blocker))
+                self.page_timings.append(timing)
+                print(f"  p{page_num} {timing.summary()}")
+
+                html_content = await page.content()
+                save_path = self.save_dir / f'page_{prefix}_p{page_num}.html'
+                save_path.write_text(html_content, encoding='utf-8')
+                print(f"  ✅ 保存完了: {save_path}")
+
+                await self.screenshots.capture_async(page, self.save_dir, f'{prefix}_p{page_num}')
+
+                has_next = page_num >= max_pages or await _check_next_page_exists(page, page_num + 1)
+                return save_path, has_next, html_content
+            except Exception:
+                await self.screenshots.capture_error_async(page, self.save_dir, f'{prefix}_p{page_num}')
+                raise
+            finally:
+                await page.close()
+
+    def _semaphore_for(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.max_concurrency_per_host)
+        return self._host_semaphores[host]
+
+def _category_slug(category_url: str) -> str:
+    """ファイル名に使うカテゴリ識別子（URL末尾）"""
+    tail = urlparse(category_url).path.rstrip('/').rsplit('/', 1)[-1]
+    return re.sub(r'[^0-9A-Za-z_-]', '', tail) or 'x'
+
+async def _check_next_page_exists(page, next_page_num: int) -> bool:
+    """次のページが存在するかチェックする（HTMLScraper._check_next_page_existsの非同期版）"""
+    next_page_selectors = [
+        'a:has-text("次のページ")',
+        f'a:has-text("{next_page_num}")',
+        'nav a'
+    ]
+
+    for selector in next_page_selectors:
+        try:
+            for elem in await page.query_selector_all(selector):
+                text = (await elem.text_content() or '').strip()
+                href = await elem.get_attribute('href')
+                if is_next_page_link(text, href, next_page_num):
+                    return True
+        except Exception:
+            continue
+
+    return False
@@ -0,0 +1,120 @@
+from playwright.sync_api import sync_playwright
+from contextlib import contextmanager
+from typing import Optional
+from ..utils.config import SCRAPING_CONFIG
+
+# Chromium起動時の引数
+BROWSER_LAUNCH_ARGS = ['--disable-blink-features=AutomationControlled']
+
+# ブラウザコンテキストの共通設定
+CONTEXT_OPTIONS = {
+    "user_agent": 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
+    "viewport": {'width': 1280, 'height': 800},
+    "accept_downloads": True,
+    "java_script_enabled": True,
+    "bypass_csp": True,
+}
+
+class BrowserPool:
+    """Chromiumブラウザとコンテキストを使い回すためのプール
+
+    start()で起動したブラウザとコンテキストを保持し、page()でタブを貸し出す。
+    1つのタブで複数のページを順に開くため、タブの数ではなくページ遷移の回数を
+    record_navigation()で数える。回数がrecycle_after_pagesに達するか、ブラウザとの接続が
+    切れていた場合は、次にタブを貸し出すときにブラウザを起動し直す（使用中のタブは閉じない）。
+    """
+
+    def __init__(self, headless: bool = True, recycle_after_pages: Optional[int] = None):
+        self.headless = headless
+        self.recycle_after_pages = (
+            recycle_after_pages
+            if recycle_after_pages is not None
+            else SCRAPING_CONFIG.get("browser_recycle_pages", 50)
+        )
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self.pages_served = 0  # 現在のブラウザで読み込んだページ数（ページ遷移の回数）
+        self.launch_count = 0  # ブラウザを起動した回数
+
+    @property
+    def is_started(self) -> bool:
+        return self._browser is not None
+
+    def start(self) -> "BrowserPool":
+        """Playwrightを起動し、ブラウザとコンテキストを作成する"""
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        if self._browser is None:
+            self._launch()
+        return self
+
+    def stop(self):
+        """ブラウザとPlaywrightを終了する"""
+        self._close_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            finally:
+                self._playwright = None
+
+    def is_healthy(self) -> bool:
+        """ブラウザが起動済みで接続が生きているかどうか"""
+        try:
+            return self._browser is not None and self._browser.is_connected()
+        except Exception:
+            return False
+
+    def recycle(self):
+        """ブラウザを閉じて起動し直す"""
+        self._close_browser()
+        self._launch()
+
+    def record_navigation(self):
+        """貸し出したタブでページを1回読み込んだことを記録する"""
+        self.pages_served += 1
+
+    @contextmanager
+    def page(self):
+        """プールからページを借りる（使用後は自動的に閉じる）"""
+        if not self.is_started:
+            self.start()
+        if not self.is_healthy() or self.pages_served >= self.recycle_after_pages:
+            self.recycle()
+
+        page = self._context.new_page()
+        try:
+            yield page
+        finally:
+            try:
+                page.close()
+            except Exception:
+                # ブラウザが落ちている場合は次回の貸し出し時に再起動する
+                pass
+
+    def _launch(self):
+        self._browser = self._playwright.chromium.launch(
+            headless=self.headless,
+            args=BROWSER_LAUNCH_ARGS
+        )
+        self._context = self._browser.new_context(**CONTEXT_OPTIONS)
+        self.pages_served = 0
+        self.launch_count += 1
+
+    def _close_browser(self):
+        try:
+            if self._context is not None:
+                self._context.close()
+            if self._browser is not None:
+                self._browser.close()
+        except Exception:
+            pass
+        finally:
+            self._context = None
+            self._browser = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
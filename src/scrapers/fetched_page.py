@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+@dataclass
+class FetchedPage:
+    """取得した一覧ページ（ファイルに保存する前のHTML）"""
+    category_url: str
+    page_num: int
+    url: str
+    html: str
+    timestamp: str  # 取得日時（YYYYmmdd_HHMMSS）
+
+    @property
+    def html_filename(self) -> str:
+        """保存時のファイル名（従来のpage_*.htmlと同じ形式）"""
+        return f'page_{self.timestamp}_p{self.page_num}.html'
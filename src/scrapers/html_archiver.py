@@ -0,0 +1,37 @@
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import List, Optional
+from ..storage.html_archive import HTMLArchive
+from .fetched_page import FetchedPage
+
+class HTMLArchiver:
+    """取得したHTMLをバックグラウンドでアーカイブに保存する
+
+    抽出はメモリ上のHTMLから行うため、保存は記録用の副経路として扱い、
+    ページ取得や抽出の処理は書き込み（圧縮を含む）を待たない。
+    """
+
+    def __init__(self, archive: Optional[HTMLArchive] = None):
+        self.archive_store = archive or HTMLArchive()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="html-archive")
+        self._pending: List[Future] = []
+
+    def archive(self, page: FetchedPage):
+        """ページの保存を予約する"""
+        self._pending.append(self._executor.submit(self.archive_store.put_page, page))
+
+    def flush(self):
+        """保存待ちのページを全て書き終えるまで待つ"""
+        pending, self._pending = self._pending, []
+        wait(pending)
+        for future in pending:
+            if future.exception() is not None:
+                print(f"HTMLの保存に失敗しました: {future.exception()}")
+
+    def close(self):
+        """保存待ちを書き終え、保存期間・容量の上限を適用して終了する"""
+        self.flush()
+        self._executor.shutdown(wait=True)
+        removed = self.archive_store.enforce_retention()
+        if removed:
+            print(f"🗄️  HTMLアーカイブから古いページを{removed}件削除しました")
+        self.archive_store.close()
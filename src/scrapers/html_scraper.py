@@ -1,50 +1,80 @@
-from playwright.sync_api import sync_playwright
+import re
 import time
 from pathlib import Path
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional
 from ..utils.config import SCRAPING_CONFIG
+from ..utils.rate_limiter import RetryPolicy, get_retry_policy
+from .browser_pool import BrowserPool
+from .page_readiness import PageTiming, load_listing_page
+from .resource_blocker import ResourceBlocker
+from .seen_jobs import SeenJobsStore
+from .screenshot import ScreenshotWriter
+from .fetched_page import FetchedPage
+
+def build_search_url(base_url: str, page_num: int = 1) -> str:
+    """検索条件付きのページURLを構築する"""
+    params = "&".join([f"{k}={v}" for k, v in SCRAPING_CONFIG["search_params"].items()])
+    if page_num == 1:
+        return f"{base_url}?{params}"
+    return f"{base_url}?{params}&page={page_num}"
+
+def is_next_page_link(text: str, href: Optional[str], next_page_num: int) -> bool:
+    """リンクが次のページ（「次のページ」またはページ番号next_page_num）を指しているかどうか
+
+    hrefは`page=N`の直後が区切り文字（&・#）か末尾の場合だけ一致とみなす（page=2とpage=20を区別する）。
+    """
+    if '次のページ' in text or text == str(next_page_num):
+        return True
+    return bool(href) and re.search(rf'[?&]page={next_page_num}(?:[&#]|$)', href) is not None
 
 class HTMLScraper:
-    """CrowdWorksのHTMLをスクレイピングするクラス"""
+    """CrowdWorksのHTMLをスクレイピングするクラス
+    
+    ブラウザはBrowserPoolで保持し、全カテゴリ・全ページで使い回す。
+    使い終わったらstop()を呼ぶか、withブロックで使用すること。
+    """
     
-    def __init__(self, save_dir: str = "data/html"):
+    def __init__(self, save_dir: str = "data/html", pool: Optional[BrowserPool] = None,
+                 seen_jobs: Optional[SeenJobsStore] = None, screenshots: Optional[ScreenshotWriter] = None,
+                 retry: Optional[RetryPolicy] = None):
         self.save_dir = Path(save_dir)
         self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.pool = pool or BrowserPool()
+        self.retry = retry or get_retry_policy()  # 取得間隔の制御とリトライ
+        self.screenshots = screenshots or ScreenshotWriter.from_config()
+        self.seen_jobs = seen_jobs  # 指定時は取得済み案件だけのページでページ送りを打ち切る
+        self.page_timings: List[PageTiming] = []  # ページごとの読み込み時間の記録
+        self.pages_skipped = 0  # 取得済み案件のため取得しなかったページ数
+    
+    def start(self) -> "HTMLScraper":
+        """ブラウザプールを起動する"""
+        self.pool.start()
+        return self
+    
+    def stop(self):
+        """ブラウザプールを終了し、書き込み待ちのスクリーンショットを保存する"""
+        self.pool.stop()
+        self.screenshots.flush()
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
     
     def save_html_single(self) -> Path:
         """1回分のHTML保存を行う"""
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                viewport={'width': 1280, 'height': 800},
-                accept_downloads=True,
-                java_script_enabled=True,
-                bypass_csp=True,
-            )
-            page = context.new_page()
-            
+        with self.pool.page() as page:
+            blocker = self._attach_blocker(page)
             try:
                 # 設定から検索URLを構築
-                params = "&".join([f"{k}={v}" for k, v in SCRAPING_CONFIG["search_params"].items()])
-                url = f"{SCRAPING_CONFIG['base_url']}?{params}"
-                page.goto(url, wait_until='networkidle', timeout=30000)
-                
-                # 動的コンテンツの完全な読み込みを待機
-                page.wait_for_load_state('networkidle')
+                url = build_search_url(SCRAPING_CONFIG['base_url'])
                 
-                # スクロールして遅延読み込みコンテンツを表示
-                page.evaluate("""
-                    window.scrollTo(0, document.body.scrollHeight);
-                    new Promise((resolve) => setTimeout(resolve, 2000));
-                """)
-                
-                # さらに待機
-                time.sleep(3)
+                # 案件カードが揃うまで待機
+                timing = self._load_page(page, url, blocker)
+                self.page_timings.append(timing)
+                print(timing.summary())
                 
                 # HTMLを取得
                 html_content = page.content()
@@ -56,20 +86,20 @@ class HTMLScraper:
                 # HTMLを保存
                 save_path.write_text(html_content, encoding='utf-8')
                 print(f"Saved HTML to: {save_path}")
+                if self.seen_jobs is not None:
+                    self.seen_jobs.remember(SCRAPING_CONFIG['base_url'], html_content)
                 
-                # スクリーンショットも保存
-                screenshot_path = self.save_dir / f'screenshot_{timestamp}.png'
-                page.screenshot(path=screenshot_path, full_page=True)
-                print(f"Saved screenshot to: {screenshot_path}")
+                # スクリーンショットも保存（書き込みはバックグラウンド）
+                screenshot_path = self.screenshots.capture(page, self.save_dir, timestamp)
+                if screenshot_path:
+                    print(f"Saved screenshot to: {screenshot_path}")
                 
                 return save_path
                 
             except Exception as e:
                 print(f"Error occurred: {str(e)}")
+                self.screenshots.capture_error(page, self.save_dir, datetime.now().strftime('%Y%m%d_%H%M%S'))
                 raise
-            
-            finally:
-                browser.close()
     
     def save_html_multiple(self, times: int = 1, delay_seconds: int = 5) -> List[Path]:
         """指定回数分のHTML保存を実行（デフォルトは1回）"""
@@ -85,61 +115,63 @@ class HTMLScraper:
     
     def save_html_with_pagination(self, category_url: str, max_pages: int = 3) -> List[Path]:
         """複数ページに跨ったHTML保存を行う（シンプル版）"""
+        saved_files = []
+        for fetched in self.iter_pages(category_url, max_pages):
+            save_path = self.save_dir / fetched.html_filename
+            save_path.write_text(fetched.html, encoding='utf-8')
+            saved_files.append(save_path)
+            print(f"  ✅ 保存完了: {save_path}")
+        return saved_files
+    
+    def iter_pages(self, category_url: str, max_pages: int = 3, start_page: int = 1) -> Iterator[FetchedPage]:
+        """複数ページを順に取得し、1ページずつHTMLを返す（ファイルには保存しない）
+        
+        呼び出し側が返されたページを処理している間は次のページを取得しないため、
+        抽出処理を別スレッドで行えば次のページの読み込みと並行して進められる。
+        エラーが起きた場合は、それまでに返したページで終了する。
+        """
         print(f"📄 複数ページスクレイピング開始: 最大{max_pages}ページ")
         
-        saved_files = []
+        fetched_html = []  # 取得済み案件として記録するページ
+        timings_start = len(self.page_timings)
+        page_num = start_page
         
-        with sync_playwright() as p:
-            browser = p.chromium.launch(
-                headless=True,
-                args=['--disable-blink-features=AutomationControlled']
-            )
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36',
-                viewport={'width': 1280, 'height': 800},
-                accept_downloads=True,
-                java_script_enabled=True,
-                bypass_csp=True,
-            )
-            page = context.new_page()
-            
+        with self.pool.page() as page:
+            blocker = self._attach_blocker(page)
             try:
-                for page_num in range(1, max_pages + 1):
+                for page_num in range(start_page, max_pages + 1):
                     print(f"🔍 ページ {page_num}/{max_pages} を処理中...")
                     
                     # ページURLを構築
-                    params = "&".join([f"{k}={v}" for k, v in SCRAPING_CONFIG["search_params"].items()])
-                    if page_num == 1:
-                        url = f"{category_url}?{params}"
-                    else:
-                        url = f"{category_url}?{params}&page={page_num}"
+                    url = build_search_url(category_url, page_num)
                     
                     print(f"  URL: {url}")
                     
-                    # ページにアクセス
-                    page.goto(url, wait_until='networkidle', timeout=30000)
-                    page.wait_for_load_state('networkidle')
+                    # ページにアクセスし、案件カードが揃うまで待機
+                    timing = self._load_page(page, url, blocker)
+                    self.page_timings.append(timing)
+                    print(f"  {timing.summary()}")
                     
-                    # 既存と同じ待機処理
-                    page.evaluate("""
-                        window.scrollTo(0, document.body.scrollHeight);
-                        new Promise((resolve) => setTimeout(resolve, 2000));
-                    """)
-                    time.sleep(3)
-                    
-                    # HTMLを取得して保存
+                    # HTMLを取得
                     html_content = page.content()
                     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                    save_path = self.save_dir / f'page_{timestamp}_p{page_num}.html'
+                    fetched_html.append(html_content)
                     
-                    save_path.write_text(html_content, encoding='utf-8')
-                    saved_files.append(save_path)
+                    # スクリーンショットも保存（書き込みはバックグラウンド）
+                    self.screenshots.capture(page, self.save_dir, f'{timestamp}_p{page_num}')
                     
-                    print(f"  ✅ 保存完了: {save_path}")
+                    reached_seen_jobs = self._reached_seen_jobs(category_url, html_content, page_num, max_pages)
+                    yield FetchedPage(
+                        category_url=category_url,
+                        page_num=page_num,
+                        url=url,
+                        html=html_content,
+                        timestamp=timestamp
+                    )
                     
-                    # スクリーンショットも保存
-                    screenshot_path = self.save_dir / f'screenshot_{timestamp}_p{page_num}.png'
-                    page.screenshot(path=screenshot_path, full_page=True)
+                    # 全て取得済みの案件であれば以降のページは取得しない
+                    if reached_seen_jobs:
+                        break
                     
                     # 次のページがあるかチェック（簡易版）
                     if page_num < max_pages:
@@ -148,19 +180,66 @@ class HTMLScraper:
                         if not next_page_exists:
                             print(f"  ⚠️  ページ {page_num + 1} は存在しません。{page_num}ページで終了します。")
                             break
-                        
-                        # ページ間の待機
-                        time.sleep(2)
                 
-                print(f"🎉 複数ページスクレイピング完了: {len(saved_files)}ページ保存")
-                return saved_files
+                print(f"🎉 複数ページスクレイピング完了: {len(fetched_html)}ページ取得")
+                self._print_timing_summary(self.page_timings[timings_start:])
                 
             except Exception as e:
                 print(f"❌ 複数ページスクレイピング中にエラー: {e}")
-                return saved_files  # 途中まで保存されたファイルを返す
+                self.screenshots.capture_error(
+                    page, self.save_dir, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_p{page_num}"
+                )
             
             finally:
-                browser.close()
+                self._remember_pages(category_url, fetched_html)
+    
+    def _load_page(self, page, url: str, blocker) -> PageTiming:
+        """ページを開いて案件カードが揃うまで待つ（リトライを含め、ページ遷移ごとにブラウザプールに記録する）"""
+        def attempt():
+            try:
+                return load_listing_page(page, url, blocker)
+            finally:
+                self.pool.record_navigation()
+        return self.retry.call(url, attempt)
+    
+    def _print_timing_summary(self, timings: List[PageTiming]):
+        """ページ読み込み時間の集計を表示する"""
+        if not timings:
+            return
+        total = sum(t.total_sec for t in timings)
+        saved = sum(t.saved_sec for t in timings)
+        timeouts = sum(1 for t in timings if t.timed_out)
+        print(f"⏱️  読み込み合計 {total:.1f}秒（平均 {total / len(timings):.2f}秒/ページ, "
+              f"固定待機比で {saved:.1f}秒短縮, タイムアウト {timeouts}件）")
+        block_stats = [t.block_stats for t in timings if t.block_stats is not None]
+        if block_stats:
+            blocked = sum(b.blocked_requests for b in block_stats)
+            saved_kb = sum(b.estimated_bytes_saved for b in block_stats) / 1024
+            print(f"🚫 リソースブロック合計 {blocked}件（推定 {saved_kb:.0f}KB 削減）")
+    
+    def _reached_seen_jobs(self, category_url: str, html_content: str, page_num: int, max_pages: int) -> bool:
+        """ページが取得済みの案件だけで構成されているか（残りのページはスキップ数に加算）"""
+        if self.seen_jobs is None or not self.seen_jobs.is_page_known(category_url, html_content):
+            return False
+        skipped = max_pages - page_num
+        if skipped > 0:
+            self.pages_skipped += skipped
+            print(f"  ⏭️  全て取得済みの案件です。残り{skipped}ページをスキップします。")
+        return True
+    
+    def _remember_pages(self, category_url: str, pages_html: List[str]):
+        """取得したページの案件を取得済みとして記録する"""
+        if self.seen_jobs is None:
+            return
+        for html_content in pages_html:
+            self.seen_jobs.remember(category_url, html_content)
+    
+    def _attach_blocker(self, page) -> Optional[ResourceBlocker]:
+        """設定で有効な場合、ページにリソースブロックを設定する"""
+        blocker = ResourceBlocker.from_config()
+        if blocker:
+            blocker.attach(page)
+        return blocker
     
     def _check_next_page_exists(self, page, next_page_num: int) -> bool:
         """次のページが存在するかチェックする"""
@@ -180,9 +259,7 @@ class HTMLScraper:
                         href = elem.get_attribute('href')
                         
                         # 次のページリンクまたはページ番号リンクを確認
-                        if (('次のページ' in text) or 
-                            (text == str(next_page_num)) or 
-                            (href and f'page={next_page_num}' in href)):
+                        if is_next_page_link(text, href, next_page_num):
                             return True
                 except Exception:
                     continue
@@ -0,0 +1,220 @@
+import re
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from html import unescape
+from pathlib import Path
+from typing import Iterator, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from ..utils.rate_limiter import RETRYABLE_STATUS_CODES, RetryableStatusError, RetryPolicy, get_retry_policy
+from .browser_pool import CONTEXT_OPTIONS
+from .html_scraper import HTMLScraper, build_search_url, is_next_page_link
+from .seen_jobs import SeenJobsStore
+from .fetched_page import FetchedPage
+
+# brotli/HTTP/2は対応ライブラリがインストールされている場合のみ使用する
+try:
+    import brotli  # noqa: F401
+    _ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    _ACCEPT_ENCODING = "gzip, deflate"
+
+try:
+    import httpx
+    try:
+        import h2  # noqa: F401
+        _HTTP2_AVAILABLE = True
+    except ImportError:
+        _HTTP2_AVAILABLE = False
+except ImportError:
+    httpx = None
+    _HTTP2_AVAILABLE = False
+
+# 案件カードのコンテナ（JobExtractorが参照するクラス）
+_JOB_CARD_PATTERN = re.compile(r'<div[^>]+class="[^"]*\bUNzN7\b')
+# JavaScriptで描画する前提の埋め込みJSON（Next.js / Vueのdata属性など）
+_EMBEDDED_PAYLOAD_PATTERN = re.compile(
+    r'<script[^>]+id="__NEXT_DATA__"|<script[^>]+type="application/(?:ld\+)?json"|data="\{&quot;'
+)
+# ページ送りの判定に使うリンク（属性と中身）
+_ANCHOR_PATTERN = re.compile(r'<a\b([^>]*)>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+_HREF_PATTERN = re.compile(r'\bhref\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+@dataclass
+class FetchResult:
+    """HTTP取得の結果"""
+    url: str
+    status_code: int
+    html: str
+    elapsed_sec: float
+    card_count: int  # HTMLに含まれる案件カード数
+    has_embedded_payload: bool  # 埋め込みJSONがあるかどうか
+
+    @property
+    def needs_browser(self) -> bool:
+        """ブラウザでの描画が必要かどうか
+
+        JobExtractorは案件カードのHTMLを前提としているため、カードが無ければ
+        （埋め込みJSONだけの場合も含めて）ブラウザ取得に切り替える。
+        """
+        return self.status_code != 200 or self.card_count == 0
+
+class HTTPFetcher:
+    """ブラウザを使わずにHTTPで一覧ページを取得するクラス
+
+    keep-aliveの接続プールを使い回し、gzip（brotli/HTTP/2は利用可能な場合）で取得する。
+    サーバー側で案件カードが描画されていないページはfallbackのHTMLScraperで取得し直す。
+    """
+
+    def __init__(self, save_dir: str = "data/html", fallback: Optional[HTMLScraper] = None,
+                 pool_size: int = 10, timeout: float = 30.0, seen_jobs: Optional[SeenJobsStore] = None,
+                 retry: Optional[RetryPolicy] = None):
+        self.save_dir = Path(save_dir)
+        self.save_dir.mkdir(parents=True, exist_ok=True)
+        self.fallback = fallback
+        self.retry = retry or get_retry_policy()  # 取得間隔の制御とリトライ
+        self.seen_jobs = seen_jobs
+        self.pages_skipped = 0  # 取得済み案件のため取得しなかったページ数
+        self.timeout = timeout
+        self.headers = {
+            "User-Agent": CONTEXT_OPTIONS["user_agent"],
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "ja,en;q=0.8",
+            "Accept-Encoding": _ACCEPT_ENCODING,
+        }
+        if httpx is not None:
+            self.session = httpx.Client(
+                http2=_HTTP2_AVAILABLE,
+                headers=self.headers,
+                timeout=timeout,
+                follow_redirects=True,
+                limits=httpx.Limits(max_keepalive_connections=pool_size, max_connections=pool_size),
+            )
+        else:
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            self.session.mount("http://", adapter)
+            self.session.mount("https://", adapter)
+        self.fallback_count = 0  # ブラウザにフォールバックした回数
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def fetch(self, url: str) -> FetchResult:
+        """1ページをHTTPで取得する"""
+        started = time.perf_counter()
+        response = self.session.get(url, timeout=self.timeout)
+        html = response.text
+        return FetchResult(
+            url=url,
+            status_code=response.status_code,
+            html=html,
+            elapsed_sec=time.perf_counter() - started,
+            card_count=len(_JOB_CARD_PATTERN.findall(html)),
+            has_embedded_payload=bool(_EMBEDDED_PAYLOAD_PATTERN.search(html)),
+        )
+
+    def fetch_with_retry(self, url: str) -> FetchResult:
+        """レート制限を通して取得し、429/5xxやタイムアウトはリトライする"""
+        def attempt():
+            result = self.fetch(url)
+            if result.status_code in RETRYABLE_STATUS_CODES:
+                raise RetryableStatusError(result.status_code, url)
+            return result
+        return self.retry.call(url, attempt)
+
+    def save_html_with_pagination(self, category_url: str, max_pages: int = 3) -> List[Path]:
+        """HTMLScraper.save_html_with_paginationと同じ形式でHTMLを保存する"""
+        saved_files = []
+        for fetched in self.iter_pages(category_url, max_pages):
+            save_path = self.save_dir / fetched.html_filename
+            save_path.write_text(fetched.html, encoding='utf-8')
+            saved_files.append(save_path)
+            print(f"  ✅ 保存完了: {save_path}")
+        return saved_files
+
+    def iter_pages(self, category_url: str, max_pages: int = 3) -> Iterator[FetchedPage]:
+        """HTTPで複数ページを順に取得し、1ページずつHTMLを返す（ファイルには保存しない）
+
+        ブラウザでの描画が必要なページに達した場合は、そのページ以降を
+        fallbackのHTMLScraperで取得する。
+        """
+        print(f"📄 HTTP取得開始: 最大{max_pages}ページ")
+
+        fetched_html = []  # 取得済み案件として記録するページ
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+
+        try:
+            for page_num in range(1, max_pages + 1):
+                url = build_search_url(category_url, page_num)
+                print(f"🔍 ページ {page_num}/{max_pages} を処理中...")
+                print(f"  URL: {url}")
+
+                try:
+                    result = self.fetch_with_retry(url)
+                except Exception as e:
+                    print(f"❌ HTTP取得中にエラー: {e}")
+                    yield from self._fall_back(category_url, max_pages, page_num)
+                    return
+
+                if result.needs_browser:
+                    reason = "埋め込みJSONのみ" if result.has_embedded_payload else f"案件カードなし (HTTP {result.status_code})"
+                    print(f"  ⚠️  ブラウザでの描画が必要です（{reason}）")
+                    yield from self._fall_back(category_url, max_pages, page_num)
+                    return
+
+                fetched_html.append(result.html)
+                print(f"  ⚡ 取得完了（{result.elapsed_sec:.2f}秒, カード{result.card_count}件）")
+                yield FetchedPage(
+                    category_url=category_url,
+                    page_num=page_num,
+                    url=url,
+                    html=result.html,
+                    timestamp=timestamp
+                )
+
+                # 全て取得済みの案件であれば以降のページは取得しない
+                if self.seen_jobs is not None and self.seen_jobs.is_page_known(category_url, result.html):
+                    skipped = max_pages - page_num
+                    if skipped > 0:
+                        self.pages_skipped += skipped
+                        print(f"  ⏭️  全て取得済みの案件です。残り{skipped}ページをスキップします。")
+                    break
+
+                if page_num < max_pages:
+                    if not _has_next_page(result.html, page_num + 1):
+                        print(f"  ⚠️  ページ {page_num + 1} は存在しません。{page_num}ページで終了します。")
+                        break
+
+            print(f"🎉 HTTP取得完了: {len(fetched_html)}ページ取得")
+
+        finally:
+            if self.seen_jobs is not None:
+                for html in fetched_html:
+                    self.seen_jobs.remember(category_url, html)
+
+    def _fall_back(self, category_url: str, max_pages: int, start_page: int) -> Iterator[FetchedPage]:
+        """start_page以降をブラウザで取得する"""
+        if self.fallback is None:
+            return
+        self.fallback_count += 1
+        print("  🔁 ブラウザでの取得に切り替えます")
+        yield from self.fallback.iter_pages(category_url=category_url, max_pages=max_pages, start_page=start_page)
+
+def _has_next_page(html: str, next_page_num: int) -> bool:
+    """HTML中に次のページへのリンクがあるかどうか（ブラウザ取得時と同じis_next_page_linkで判定する）"""
+    for attrs, inner in _ANCHOR_PATTERN.findall(html):
+        href = _HREF_PATTERN.search(attrs)
+        text = unescape(_TAG_PATTERN.sub('', inner)).strip()
+        if is_next_page_link(text, unescape(href.group(1)) if href else None, next_page_num):
+            return True
+    return False
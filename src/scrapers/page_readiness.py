@@ -0,0 +1,150 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from ..utils.config import SCRAPING_CONFIG
+from ..utils.rate_limiter import RETRYABLE_STATUS_CODES, RetryableStatusError
+from .resource_blocker import BlockStats, ResourceBlocker
+
+# 従来の固定待機時間（スクロール後の2秒 + sleep 3秒）。短縮できた時間の算出に使う
+LEGACY_FIXED_WAIT_SEC = 5.0
+
+# 案件カード数が一定時間変化しなくなったら準備完了とみなすスクリプト
+# カードが0件のページ（案件の無いカテゴリ・最終ページの次など）は、0件の表示があるか、
+# 一覧の枠が現れてから0件のままemptyStableMs経過した時点で準備完了とみなす
+_CARDS_STABLE_SCRIPT = """
+([selector, stableMs, containerSelector, emptyTexts, emptyStableMs]) => {
+    const count = document.querySelectorAll(selector).length;
+    const now = performance.now();
+    const state = window.__jobCardsState || (window.__jobCardsState = {count: -1, since: now, containerSince: null});
+    if (count !== state.count) {
+        state.count = count;
+        state.since = now;
+        return false;
+    }
+    if (count > 0) {
+        return now - state.since >= stableMs;
+    }
+    const text = document.body ? document.body.innerText : "";
+    if (emptyTexts.some((emptyText) => text.includes(emptyText))) {
+        return true;
+    }
+    if (!document.querySelector(containerSelector)) {
+        state.containerSince = null;
+        return false;
+    }
+    if (state.containerSince === null) {
+        state.containerSince = now;
+    }
+    return now - Math.max(state.since, state.containerSince) >= emptyStableMs;
+}
+"""
+
+_COUNT_CARDS_SCRIPT = "(selector) => document.querySelectorAll(selector).length"
+_SCROLL_SCRIPT = "window.scrollTo(0, document.body.scrollHeight)"
+
+@dataclass
+class PageTiming:
+    """1ページ分の読み込み時間の記録"""
+    url: str
+    navigation_sec: float  # page.gotoに要した時間
+    ready_wait_sec: float  # 案件カードが揃うまでの待機時間
+    card_count: int  # 準備完了時点の案件カード数
+    timed_out: bool  # 上限時間まで待っても安定しなかったかどうか
+    block_stats: Optional[BlockStats] = None  # リソースブロックの結果（ブロック無効時はNone）
+
+    @property
+    def total_sec(self) -> float:
+        return self.navigation_sec + self.ready_wait_sec
+
+    @property
+    def saved_sec(self) -> float:
+        """従来の固定待機と比べて短縮できた時間"""
+        return max(0.0, LEGACY_FIXED_WAIT_SEC - self.ready_wait_sec)
+
+    def summary(self) -> str:
+        status = "タイムアウト" if self.timed_out else "準備完了"
+        summary = (f"⏱️  読込 {self.navigation_sec:.2f}秒 + 待機 {self.ready_wait_sec:.2f}秒"
+                   f"（{status}, カード{self.card_count}件, 短縮 {self.saved_sec:.2f}秒）")
+        if self.block_stats is not None:
+            summary += f" {self.block_stats.summary()}"
+        return summary
+
+def _readiness_settings(selector: Optional[str], timeout: Optional[float], stable_ms: Optional[int]) -> Tuple[str, Dict]:
+    """(カードのセレクター, _CARDS_STABLE_SCRIPTを待つwait_for_functionの引数)"""
+    selector = selector or SCRAPING_CONFIG.get("ready_selector", "div.UNzN7")
+    stable_ms = stable_ms if stable_ms is not None else SCRAPING_CONFIG.get("ready_stable_ms", 500)
+    script_args = [
+        selector,
+        stable_ms,
+        SCRAPING_CONFIG.get("ready_container_selector", "main"),
+        list(SCRAPING_CONFIG.get("ready_empty_texts", [])),
+        SCRAPING_CONFIG.get("ready_empty_stable_ms", 2000),
+    ]
+    timeout = timeout if timeout is not None else SCRAPING_CONFIG.get("ready_timeout", 15)
+    return selector, {"arg": script_args, "polling": 100, "timeout": timeout * 1000}
+
+def load_listing_page(page, url: str, blocker: Optional[ResourceBlocker] = None,
+                      selector: Optional[str] = None, timeout: Optional[float] = None, stable_ms: Optional[int] = None) -> PageTiming:
+    """一覧ページを開き、案件カードが揃った時点で戻る
+
+    固定のsleepではなく、selectorに一致する要素が存在し、その数が
+    stable_msの間変化しなくなるまで待つ。timeout秒を上限とする。
+    案件が0件のページは、0件の表示（ready_empty_texts）があるか、一覧の枠（ready_container_selector）が
+    現れてから0件のままready_empty_stable_ms経過した時点で準備完了とする。
+    blockerを渡した場合は、このページ遷移でブロックした件数も記録する。
+    429/5xxの場合はRetryableStatusErrorを送出する。
+    """
+    selector, wait_options = _readiness_settings(selector, timeout, stable_ms)
+
+    started = time.perf_counter()
+    response = page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    navigated = time.perf_counter()
+    _raise_for_retryable_status(response, url)
+
+    # 遅延読み込みコンテンツを表示させるためにスクロール
+    page.evaluate(_SCROLL_SCRIPT)
+
+    timed_out = False
+    try:
+        page.wait_for_function(_CARDS_STABLE_SCRIPT, **wait_options)
+    except Exception:
+        timed_out = True
+    card_count = page.evaluate(_COUNT_CARDS_SCRIPT, selector)
+    return _page_timing(url, started, navigated, card_count, timed_out, blocker)
+
+async def load_listing_page_async(page, url: str, blocker: Optional[ResourceBlocker] = None,
+                                  selector: Optional[str] = None, timeout: Optional[float] = None, stable_ms: Optional[int] = None) -> PageTiming:
+    """load_listing_pageの非同期版（待機の判定と記録はload_listing_pageと共通）"""
+    selector, wait_options = _readiness_settings(selector, timeout, stable_ms)
+
+    started = time.perf_counter()
+    response = await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+    navigated = time.perf_counter()
+    _raise_for_retryable_status(response, url)
+
+    await page.evaluate(_SCROLL_SCRIPT)
+
+    timed_out = False
+    try:
+        await page.wait_for_function(_CARDS_STABLE_SCRIPT, **wait_options)
+    except Exception:
+        timed_out = True
+    card_count = await page.evaluate(_COUNT_CARDS_SCRIPT, selector)
+    return _page_timing(url, started, navigated, card_count, timed_out, blocker)
+
+def _raise_for_retryable_status(response, url: str):
+    """429/5xxの応答ならRetryableStatusErrorを送出する"""
+    if response is not None and response.status in RETRYABLE_STATUS_CODES:
+        raise RetryableStatusError(response.status, url)
+
+def _page_timing(url: str, started: float, navigated: float, card_count: int, timed_out: bool,
+                 blocker: Optional[ResourceBlocker]) -> PageTiming:
+    """ページ遷移の開始・完了時刻から読み込み時間の記録を作る（待機時間は現在時刻まで）"""
+    return PageTiming(
+        url=url,
+        navigation_sec=navigated - started,
+        ready_wait_sec=time.perf_counter() - navigated,
+        card_count=card_count,
+        timed_out=timed_out,
+        block_stats=blocker.take_stats() if blocker else None,
+    )
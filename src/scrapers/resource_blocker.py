@@ -0,0 +1,91 @@
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+from ..utils.config import SCRAPING_CONFIG
+
+# ブロックしたリソースの推定サイズ（バイト）。実際には取得しないため平均値で見積もる
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "font": 50_000,
+    "media": 500_000,
+    "stylesheet": 30_000,
+    "script": 40_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 5_000,
+}
+
+@dataclass
+class BlockStats:
+    """1ページ分のブロック結果"""
+    blocked_requests: int = 0
+    estimated_bytes_saved: int = 0
+    by_type: Counter = field(default_factory=Counter)
+
+    def record(self, resource_type: str):
+        self.blocked_requests += 1
+        self.estimated_bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, ESTIMATED_RESOURCE_BYTES["other"])
+        self.by_type[resource_type] += 1
+
+    def summary(self) -> str:
+        types = ", ".join(f"{k}:{v}" for k, v in self.by_type.most_common())
+        return (f"🚫 ブロック {self.blocked_requests}件"
+                f"（推定 {self.estimated_bytes_saved / 1024:.0f}KB 削減{', ' + types if types else ''}）")
+
+class ResourceBlocker:
+    """Playwrightのルートハンドラで不要なリソースの取得を止める
+
+    リソース種別（image, font, mediaなど）とURLパターン（解析・広告タグなど）で判定する。
+    1ページにつき1インスタンスをattach()し、take_stats()でページ遷移ごとの結果を取り出す。
+    """
+
+    def __init__(self, resource_types: Iterable[str] = (), url_patterns: Iterable[str] = ()):
+        self.resource_types = frozenset(resource_types)
+        self.url_pattern = re.compile("|".join(f"(?:{p})" for p in url_patterns)) if url_patterns else None
+        self.stats = BlockStats()
+
+    @classmethod
+    def from_config(cls) -> Optional["ResourceBlocker"]:
+        """SCRAPING_CONFIG["resource_blocking"]から作成する（無効ならNone）"""
+        config = SCRAPING_CONFIG.get("resource_blocking", {})
+        if not config.get("enabled", False):
+            return None
+        return cls(
+            resource_types=config.get("resource_types", []),
+            url_patterns=config.get("url_patterns", [])
+        )
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        if resource_type in self.resource_types:
+            return True
+        return bool(self.url_pattern and self.url_pattern.search(url))
+
+    def attach(self, page):
+        """ページにルートハンドラを設定する"""
+        page.route("**/*", self._handle)
+
+    async def attach_async(self, page):
+        """ページにルートハンドラを設定する（async API用）"""
+        await page.route("**/*", self._handle_async)
+
+    def take_stats(self) -> BlockStats:
+        """これまでの集計を返してリセットする"""
+        stats, self.stats = self.stats, BlockStats()
+        return stats
+
+    def _handle(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.stats.record(request.resource_type)
+            route.abort()
+        else:
+            route.continue_()
+
+    async def _handle_async(self, route):
+        request = route.request
+        if self.should_block(request.resource_type, request.url):
+            self.stats.record(request.resource_type)
+            await route.abort()
+        else:
+            await route.continue_()
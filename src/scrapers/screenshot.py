@@ -0,0 +1,120 @@
+import io
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import List, Optional
+from ..utils.config import EXECUTION_CONFIG
+
+# 縮小処理はPillowがインストールされている場合のみ行う
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+SCREENSHOT_MODES = ("off", "on_error", "thumbnail", "full")
+
+def screenshot_paths_for(html_file: Path) -> List[Path]:
+    """HTMLファイルに対応するスクリーンショットの候補パス"""
+    stem = html_file.stem.replace('page_', 'screenshot_', 1)
+    return [html_file.with_name(f"{stem}{ext}") for ext in (".jpg", ".png")]
+
+class ScreenshotWriter:
+    """スクリーンショットの取得モードと保存を管理する
+
+    モード:
+        off       : 保存しない
+        on_error  : ページ処理でエラーが起きたときだけフルページPNGを保存
+        thumbnail : 表示領域のみをJPEG（quality指定）で保存し、widthが指定されていれば縮小
+        full      : フルページPNGを保存（従来の動作）
+
+    縮小とファイル書き込みはバックグラウンドスレッドで行うため、ページ取得の処理は書き込みを待たない。
+    ただし撮影（ブラウザでの画像のエンコード）はpage.screenshot()の中で同期的に行われ、
+    その間はページ取得が止まる。thumbnailは表示領域だけをJPEGで撮影してこの時間を抑える。
+    """
+
+    def __init__(self, mode: str = "thumbnail", quality: int = 60, thumbnail_width: Optional[int] = None):
+        if mode not in SCREENSHOT_MODES:
+            raise ValueError(f"未対応のスクリーンショットモードです: {mode}")
+        self.mode = mode
+        self.quality = quality
+        self.thumbnail_width = thumbnail_width
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot")
+        self._pending: List[Future] = []
+
+    @classmethod
+    def from_config(cls) -> "ScreenshotWriter":
+        """EXECUTION_CONFIGから作成する（save_screenshotsがFalseならoff）"""
+        mode = EXECUTION_CONFIG.get("screenshot_mode", "thumbnail")
+        if not EXECUTION_CONFIG.get("save_screenshots", True):
+            mode = "off"
+        return cls(
+            mode=mode,
+            quality=EXECUTION_CONFIG.get("screenshot_quality", 60),
+            thumbnail_width=EXECUTION_CONFIG.get("screenshot_thumbnail_width"),
+        )
+
+    def capture(self, page, save_dir: Path, name: str) -> Optional[Path]:
+        """ページ処理が成功したときのスクリーンショット"""
+        if self.mode == "thumbnail":
+            data = page.screenshot(type="jpeg", quality=self.quality, full_page=False)
+            return self._submit(data, save_dir / f"screenshot_{name}.jpg", resize=True)
+        if self.mode == "full":
+            data = page.screenshot(type="png", full_page=True)
+            return self._submit(data, save_dir / f"screenshot_{name}.png")
+        return None
+
+    def capture_error(self, page, save_dir: Path, name: str) -> Optional[Path]:
+        """ページ処理でエラーが起きたときのスクリーンショット（失敗しても例外は出さない）"""
+        if self.mode == "off":
+            return None
+        try:
+            data = page.screenshot(type="png", full_page=True)
+        except Exception:
+            return None
+        return self._submit(data, save_dir / f"screenshot_{name}_error.png")
+
+    async def capture_async(self, page, save_dir: Path, name: str) -> Optional[Path]:
+        """captureの非同期版"""
+        if self.mode == "thumbnail":
+            data = await page.screenshot(type="jpeg", quality=self.quality, full_page=False)
+            return self._submit(data, save_dir / f"screenshot_{name}.jpg", resize=True)
+        if self.mode == "full":
+            data = await page.screenshot(type="png", full_page=True)
+            return self._submit(data, save_dir / f"screenshot_{name}.png")
+        return None
+
+    async def capture_error_async(self, page, save_dir: Path, name: str) -> Optional[Path]:
+        """capture_errorの非同期版"""
+        if self.mode == "off":
+            return None
+        try:
+            data = await page.screenshot(type="png", full_page=True)
+        except Exception:
+            return None
+        return self._submit(data, save_dir / f"screenshot_{name}_error.png")
+
+    def flush(self):
+        """書き込み待ちのスクリーンショットを全て保存し終えるまで待つ"""
+        pending, self._pending = self._pending, []
+        wait(pending)
+        for future in pending:
+            if future.exception() is not None:
+                print(f"スクリーンショットの保存に失敗しました: {future.exception()}")
+
+    def close(self):
+        self.flush()
+        self._executor.shutdown(wait=True)
+
+    def _submit(self, data: bytes, path: Path, resize: bool = False) -> Path:
+        self._pending.append(self._executor.submit(self._write, data, path, resize))
+        return path
+
+    def _write(self, data: bytes, path: Path, resize: bool):
+        if resize and self.thumbnail_width and Image is not None:
+            image = Image.open(io.BytesIO(data))
+            if image.width > self.thumbnail_width:
+                height = round(image.height * self.thumbnail_width / image.width)
+                image = image.resize((self.thumbnail_width, height))
+                buffer = io.BytesIO()
+                image.convert("RGB").save(buffer, format="JPEG", quality=self.quality)
+                data = buffer.getvalue()
+        path.write_bytes(data)
@@ -0,0 +1,59 @@
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Set
+from ..utils.config import STATE_DIR
+
+# 案件詳細ページのURL（/public/jobs/<id>）から案件IDを取り出すパターン
+JOB_URL_ID_PATTERN = re.compile(r'/public/jobs/(\d+)')
+
+def job_ids_in_html(html: str) -> Set[str]:
+    """HTMLに含まれる案件IDの集合を返す"""
+    return set(JOB_URL_ID_PATTERN.findall(html))
+
+class SeenJobsStore:
+    """カテゴリごとに取得済みの案件IDを記録する
+
+    新着順の一覧で、あるページの案件が全て既知であれば、それ以降のページにも
+    新しい案件は無いと判断してページ送りを打ち切るために使う。
+    同じ実行中に取得したページ同士で判定しないよう、記録（remember）は
+    カテゴリの取得が終わってから行う。
+    """
+
+    def __init__(self, path: Path = STATE_DIR / "seen_jobs.json", max_ids_per_category: int = 5000):
+        self.path = Path(path)
+        self.max_ids_per_category = max_ids_per_category
+        self._seen: Dict[str, Dict[str, str]] = {}  # カテゴリURL -> {案件ID: 最終確認日時}
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._seen = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"取得済み案件の記録を読み込めませんでした: {e}")
+
+    def is_page_known(self, category_url: str, html: str) -> bool:
+        """ページの案件が全て前回までに取得済みかどうか"""
+        ids = job_ids_in_html(html)
+        seen = self._seen.get(category_url, {})
+        return bool(ids) and all(job_id in seen for job_id in ids)
+
+    def remember(self, category_url: str, html: str):
+        """ページの案件IDを取得済みとして記録する"""
+        seen = self._seen.setdefault(category_url, {})
+        now = datetime.now().isoformat(timespec='seconds')
+        for job_id in job_ids_in_html(html):
+            seen[job_id] = now
+
+    def save(self):
+        """記録をファイルに保存する（カテゴリごとに新しいものから上限件数まで）"""
+        for category_url, seen in self._seen.items():
+            if len(seen) > self.max_ids_per_category:
+                newest = sorted(seen.items(), key=lambda item: item[1], reverse=True)
+                self._seen[category_url] = dict(newest[:self.max_ids_per_category])
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._seen, f, ensure_ascii=False)
+        tmp_path.replace(self.path)
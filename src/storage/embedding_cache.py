@@ -0,0 +1,67 @@
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from ..utils.config import CACHE_DIR
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embeddings (
+    text_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    vector BLOB NOT NULL,
+    PRIMARY KEY (text_hash, model)
+);
+"""
+
+# 1回のSELECTで問い合わせるキーの数（SQLiteの変数の上限より小さくする）
+_QUERY_CHUNK = 500
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class EmbeddingCache:
+    """テキストの埋め込みベクトルをテキストのハッシュとモデル名ごとに保存するキャッシュ
+
+    ベクトルはfloat32のバイト列として保存する。
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "embeddings.sqlite3"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get_many(self, hashes: List[str], model: str) -> Dict[str, np.ndarray]:
+        """キャッシュにあるベクトルをテキストのハッシュごとに返す"""
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        with self._lock:
+            for start in range(0, len(unique), _QUERY_CHUNK):
+                chunk = unique[start:start + _QUERY_CHUNK]
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({', '.join('?' * len(chunk))})",
+                    [model, *chunk]
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32)
+            self.hits += len(found)
+            self.misses += len(unique) - len(found)
+        return found
+
+    def put_many(self, vectors: Iterable[Tuple[str, np.ndarray]], model: str):
+        rows = [(key, model, np.asarray(vector, dtype=np.float32).tobytes()) for key, vector in vectors]
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
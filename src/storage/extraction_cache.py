@@ -0,0 +1,119 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..utils.config import CACHE_DIR, EXTRACTION_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    content_hash TEXT NOT NULL,
+    version TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (content_hash, version)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used);
+"""
+
+# 容量超過時に一度に削除する件数
+_EVICT_BATCH = 100
+
+def content_hash(html: str) -> str:
+    """HTMLの内容のハッシュ（HTMLアーカイブのblobと同じsha256）"""
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+class ExtractionCache:
+    """HTMLの内容のハッシュと抽出処理のバージョンごとに抽出結果を保存するキャッシュ
+
+    値は案件の辞書のリストをJSONにしてzlibで圧縮したもの。容量がmax_bytesを超えると
+    最後に使われた日時が古いものから削除する。ヒット・ミスの回数はインスタンスごとに数える。
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "extraction_cache.sqlite3", max_bytes: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @classmethod
+    def from_config(cls) -> Optional["ExtractionCache"]:
+        """EXTRACTION_CONFIGから作成する（cache_enabledがFalseならNone）"""
+        if not EXTRACTION_CONFIG.get("cache_enabled", False):
+            return None
+        max_mb = EXTRACTION_CONFIG.get("cache_max_mb")
+        return cls(max_bytes=max_mb * 1024 * 1024 if max_mb else None)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, content_hash: str, version: str) -> Optional[List[Dict]]:
+        """キャッシュされた抽出結果（無ければNone）"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM entries WHERE content_hash = ? AND version = ?", (content_hash, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE entries SET last_used = ? WHERE content_hash = ? AND version = ?",
+                    (time.time(), content_hash, version)
+                )
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, content_hash: str, version: str, jobs: List[Dict]):
+        payload = zlib.compress(json.dumps(jobs, ensure_ascii=False).encode('utf-8'))
+        with self._lock:
+            with self._conn:
+                old = self._conn.execute(
+                    "SELECT size FROM entries WHERE content_hash = ? AND version = ?", (content_hash, version)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, version, payload, len(payload), time.time())
+                )
+                self._total_bytes += len(payload) - (old[0] if old else 0)
+                self._evict()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": self._total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _evict(self):
+        """容量の上限を超えていれば、最後に使われた日時が古いものから削除する"""
+        if self.max_bytes is None:
+            return
+        while self._total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT rowid, size FROM entries ORDER BY last_used LIMIT ?", (_EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            for rowid, size in rows:
+                self._conn.execute("DELETE FROM entries WHERE rowid = ?", (rowid,))
+                self._total_bytes -= size
+                if self._total_bytes <= self.max_bytes:
+                    break
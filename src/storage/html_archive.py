@@ -0,0 +1,217 @@
+import gzip
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+from ..utils.config import ARCHIVE_DIR
+
+# zstdはzstandardがインストールされている場合のみ使用し、無ければgzipで圧縮する
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    content_hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_url TEXT NOT NULL,
+    page_num INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    content_hash TEXT NOT NULL REFERENCES blobs(content_hash)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_category ON pages(category_url, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_pages_fetched_at ON pages(fetched_at);
+CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash);
+"""
+
+@dataclass
+class ArchivedPage:
+    """アーカイブ内の1ページ（htmlは読み込み時に展開する）"""
+    category_url: str
+    page_num: int
+    url: str
+    fetched_at: str
+    content_hash: str
+    html: str
+
+class HTMLArchive:
+    """生のHTMLを圧縮して内容のハッシュで保存するアーカイブ
+
+    同じ内容のページは1つのblobを共有し、(カテゴリ, ページ番号, 取得日時) → blob の
+    対応はSQLiteの索引に記録する。blobはハッシュの先頭2文字・次の2文字の2段のディレクトリに
+    分けて置くため、履歴が増えてもディレクトリ1つあたりのファイル数は抑えられる。
+    """
+
+    def __init__(self, root: Path = ARCHIVE_DIR, max_bytes: Optional[int] = None,
+                 retention_days: Optional[int] = None):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.retention_days = retention_days
+        self.codec = "zst" if zstandard is not None else "gz"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.root / "index.sqlite3", check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def put(self, category_url: str, page_num: int, url: str, html: str,
+            fetched_at: Optional[datetime] = None) -> str:
+        """ページを保存し、内容のハッシュを返す（同じ内容のblobは再利用）"""
+        raw = html.encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+        fetched_at = (fetched_at or datetime.now()).isoformat(timespec='seconds')
+
+        with self._lock:
+            exists = self._conn.execute(
+                "SELECT 1 FROM blobs WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+            if not exists:
+                stored = self._compress(raw)
+                path = self._blob_path(content_hash, self.codec)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(stored)
+                self._conn.execute(
+                    "INSERT INTO blobs VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, self.codec, len(raw), len(stored), fetched_at)
+                )
+            self._conn.execute(
+                "INSERT INTO pages (category_url, page_num, url, fetched_at, content_hash) VALUES (?, ?, ?, ?, ?)",
+                (category_url, page_num, url, fetched_at, content_hash)
+            )
+            self._conn.commit()
+        return content_hash
+
+    def put_page(self, page) -> str:
+        """FetchedPageを保存する"""
+        fetched_at = datetime.strptime(page.timestamp, '%Y%m%d_%H%M%S')
+        return self.put(page.category_url, page.page_num, page.url, page.html, fetched_at)
+
+    def get_html(self, content_hash: str) -> str:
+        """ハッシュからHTMLを読み込む"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT codec FROM blobs WHERE content_hash = ?", (content_hash,)
+            ).fetchone()
+        if row is None:
+            raise KeyError(content_hash)
+        path = self._blob_path(content_hash, row[0])
+        if not path.exists():
+            path = self._legacy_blob_path(content_hash, row[0])
+        data = path.read_bytes()
+        return self._decompress(data, row[0]).decode('utf-8')
+
+    def iter_pages(self, category_url: Optional[str] = None, since: Optional[datetime] = None,
+                   unique: bool = False) -> Iterator[ArchivedPage]:
+        """保存済みページを取得日時順に返す
+
+        unique=Trueの場合は同じ内容のページを最初の1回だけ返す（再抽出用）。
+        JobExtractor.extract_jobs_streamingにそのまま渡せる。
+        """
+        query = "SELECT category_url, page_num, url, fetched_at, content_hash FROM pages WHERE 1 = 1"
+        params = []
+        if category_url is not None:
+            query += " AND category_url = ?"
+            params.append(category_url)
+        if since is not None:
+            query += " AND fetched_at >= ?"
+            params.append(since.isoformat(timespec='seconds'))
+        query += " ORDER BY fetched_at, id"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        yielded = set()
+        for category, page_num, url, fetched_at, content_hash in rows:
+            if unique:
+                if content_hash in yielded:
+                    continue
+                yielded.add(content_hash)
+            yield ArchivedPage(
+                category_url=category,
+                page_num=page_num,
+                url=url,
+                fetched_at=fetched_at,
+                content_hash=content_hash,
+                html=self.get_html(content_hash)
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            pages = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs, raw, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM blobs"
+            ).fetchone()
+        return {"pages": pages, "blobs": blobs, "raw_bytes": raw, "stored_bytes": stored}
+
+    def enforce_retention(self) -> int:
+        """保存期間と容量の上限を適用し、削除したページ（索引）の数を返す
+
+        保存期間を過ぎた索引を削除した後、容量が上限を超えていれば古い索引から削除する。
+        どの索引からも参照されなくなったblobをファイルごと削除する。
+        """
+        removed = 0
+        with self._lock:
+            if self.retention_days is not None:
+                cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat(timespec='seconds')
+                removed += self._conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            self._remove_orphan_blobs()
+
+            if self.max_bytes is not None:
+                while self._stored_bytes() > self.max_bytes:
+                    oldest = self._conn.execute(
+                        "SELECT fetched_at FROM pages ORDER BY fetched_at LIMIT 1"
+                    ).fetchone()
+                    if oldest is None:
+                        break
+                    removed += self._conn.execute("DELETE FROM pages WHERE fetched_at = ?", oldest).rowcount
+                    self._remove_orphan_blobs()
+            self._conn.commit()
+        return removed
+
+    def _remove_orphan_blobs(self) -> int:
+        orphans = self._conn.execute(
+            "SELECT content_hash, codec FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM pages)"
+        ).fetchall()
+        for content_hash, codec in orphans:
+            self._blob_path(content_hash, codec).unlink(missing_ok=True)
+            self._legacy_blob_path(content_hash, codec).unlink(missing_ok=True)
+            self._conn.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+        return len(orphans)
+
+    def _stored_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM blobs").fetchone()[0]
+
+    def _blob_path(self, content_hash: str, codec: str) -> Path:
+        return self.blob_dir / content_hash[:2] / content_hash[2:4] / f"{content_hash}.html.{codec}"
+
+    def _legacy_blob_path(self, content_hash: str, codec: str) -> Path:
+        # ディレクトリが1段だった頃に保存したblobの置き場所
+        return self.blob_dir / content_hash[:2] / f"{content_hash}.html.{codec}"
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.codec == "zst":
+            return zstandard.ZstdCompressor(level=10).compress(raw)
+        return gzip.compress(raw, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zst":
+            if zstandard is None:
+                raise RuntimeError("zstdで圧縮されたHTMLを読むにはzstandardが必要です")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
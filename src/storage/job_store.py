@@ -0,0 +1,176 @@
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from ..utils.config import JOBS_DIR
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    budget_type TEXT NOT NULL,
+    budget_min INTEGER,
+    budget_max INTEGER,
+    budget_negotiable INTEGER NOT NULL,
+    deadline TEXT,
+    posted_date TEXT,
+    client_name TEXT NOT NULL,
+    url TEXT,
+    is_pr INTEGER NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_category ON jobs(category);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_date ON jobs(posted_date);
+CREATE INDEX IF NOT EXISTS idx_jobs_budget ON jobs(budget_type, budget_min, budget_max);
+CREATE INDEX IF NOT EXISTS idx_jobs_budget_max ON jobs(budget_max);
+CREATE INDEX IF NOT EXISTS idx_jobs_last_seen ON jobs(last_seen);
+"""
+
+_COLUMNS = (
+    "job_id, title, category, description, budget_type, budget_min, budget_max, budget_negotiable, "
+    "deadline, posted_date, client_name, url, is_pr, first_seen, last_seen"
+)
+
+_UPSERT = f"""
+INSERT INTO jobs ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(job_id) DO UPDATE SET
+    title = excluded.title,
+    category = excluded.category,
+    description = excluded.description,
+    budget_type = excluded.budget_type,
+    budget_min = excluded.budget_min,
+    budget_max = excluded.budget_max,
+    budget_negotiable = excluded.budget_negotiable,
+    deadline = excluded.deadline,
+    posted_date = excluded.posted_date,
+    client_name = excluded.client_name,
+    url = excluded.url,
+    is_pr = excluded.is_pr,
+    last_seen = excluded.last_seen
+"""
+
+class JobStore:
+    """抽出した案件を案件IDごとに保存するSQLiteのストア
+
+    同じ案件は上書き（upsert）し、初めて見た日時（first_seen）と最後に見た日時（last_seen）を
+    記録する。WALモードで開くため、スクレイピング中でもWebサーバーから読み込める。
+    読み込み結果はJSONに保存していた形式（job_to_dict）にfirst_seen・last_seenを加えた辞書。
+    """
+
+    def __init__(self, path: Path = JOBS_DIR / "jobs.sqlite3"):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def upsert_jobs(self, jobs: Iterable, seen_at: Optional[datetime] = None) -> int:
+        """案件（JobItem）をまとめて保存し、新規に追加した件数を返す"""
+        seen_at = (seen_at or datetime.now()).isoformat(timespec='seconds')
+        rows = [
+            (
+                job.job_id, job.title, job.category, job.description,
+                job.budget.type, job.budget.min_amount, job.budget.max_amount, int(job.budget.is_negotiable),
+                job.deadline, job.posted_date.isoformat() if job.posted_date else None,
+                job.client_name, job.url, int(job.is_pr), seen_at, seen_at
+            )
+            for job in jobs
+        ]
+        with self._lock:
+            before = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            with self._conn:
+                self._conn.executemany(_UPSERT, rows)
+            after = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        return after - before
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        rows = self._select("WHERE job_id = ?", [job_id])
+        return rows[0] if rows else None
+
+    def query(self, category: Optional[str] = None, budget_type: Optional[str] = None,
+              min_amount: Optional[int] = None, posted_since: Optional[datetime] = None,
+              seen_since: Optional[datetime] = None, limit: Optional[int] = 100, offset: int = 0) -> List[Dict]:
+        """条件に合う案件を掲載日の新しい順に返す
+
+        min_amountは予算の上限額がこの金額以上の案件に絞り込む。
+        """
+        clause, params = _where(category, budget_type, min_amount, posted_since, seen_since)
+        clause += "ORDER BY posted_date DESC, job_id"
+        if limit is not None:
+            clause += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        return self._select(clause, params)
+
+    def latest_jobs(self) -> List[Dict]:
+        """最後に保存した回（last_seenが最新）の案件を返す"""
+        return self._select("WHERE last_seen = (SELECT MAX(last_seen) FROM jobs) ORDER BY rowid", [])
+
+    def count(self, category: Optional[str] = None, budget_type: Optional[str] = None,
+              min_amount: Optional[int] = None, posted_since: Optional[datetime] = None,
+              seen_since: Optional[datetime] = None) -> int:
+        """条件に合う案件の件数（条件はqueryと同じ。省略時は全件）"""
+        clause, params = _where(category, budget_type, min_amount, posted_since, seen_since)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM jobs {clause}", params).fetchone()[0]
+
+    def _select(self, clause: str, params: list) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(f"SELECT {_COLUMNS} FROM jobs {clause}", params).fetchall()
+        return [_row_to_dict(row) for row in rows]
+
+def _where(category: Optional[str], budget_type: Optional[str], min_amount: Optional[int],
+           posted_since: Optional[datetime], seen_since: Optional[datetime]) -> Tuple[str, list]:
+    """queryとcountの絞り込み条件のWHERE句とパラメータ"""
+    conditions = []
+    params: list = []
+    if category is not None:
+        conditions.append("category = ?")
+        params.append(category)
+    if budget_type is not None:
+        conditions.append("budget_type = ?")
+        params.append(budget_type)
+    if min_amount is not None:
+        conditions.append("budget_max >= ?")
+        params.append(min_amount)
+    if posted_since is not None:
+        conditions.append("posted_date >= ?")
+        params.append(posted_since.isoformat())
+    if seen_since is not None:
+        conditions.append("last_seen >= ?")
+        params.append(seen_since.isoformat(timespec='seconds'))
+
+    clause = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    return clause, params
+
+def _row_to_dict(row: tuple) -> Dict:
+    (job_id, title, category, description, budget_type, budget_min, budget_max, budget_negotiable,
+     deadline, posted_date, client_name, url, is_pr, first_seen, last_seen) = row
+    return {
+        'job_id': job_id,
+        'title': title,
+        'category': category,
+        'description': description,
+        'budget': {
+            'type': budget_type,
+            'min_amount': budget_min,
+            'max_amount': budget_max,
+            'is_negotiable': bool(budget_negotiable)
+        },
+        'deadline': deadline,
+        'posted_date': posted_date,
+        'client_name': client_name,
+        'url': url,
+        'is_pr': bool(is_pr),
+        'first_seen': first_seen,
+        'last_seen': last_seen
+    }
@@ -0,0 +1,99 @@
+import gzip
+import json
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Dict, Iterable, Iterator
+
+class JSONLWriter:
+    """1行1レコードのJSON Lines形式で追記していくライター
+
+    レコードごとに書き込んでフラッシュするため、実行が途中で止まっても
+    それまでのレコードは残り、他のプロセスから追記中のファイルを読むこともできる。
+    compress=Trueの場合はgzipで圧縮する（既存ファイルに追記するとgzipメンバーが増えるが、iter_jsonlで読める）。
+    """
+
+    def __init__(self, path: Path, compress: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if compress:
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.count = 0  # 書き込んだレコード数
+
+    def write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, default=_json_default)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def write_all(self, records: Iterable[Dict]):
+        for record in records:
+            self.write(record)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def _json_default(value):
+    # JobViewなどの辞書以外のマッピングは辞書に、それ以外（datetime等）は文字列にする
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+def iter_jsonl(path: Path, follow: bool = False, poll_interval: float = 1.0) -> Iterator[Dict]:
+    """JSON Linesファイルを1レコードずつ読み込む
+
+    末尾の書きかけの行（改行で終わっていない行）は読み飛ばす。
+    follow=Trueの場合はtail -fのようにファイルの末尾で待ち、追記されたレコードを返し続ける
+    （圧縮ファイルは未対応）。
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        if follow:
+            raise ValueError("圧縮されたJSON Linesファイルはfollowで読めません")
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            try:
+                yield from _parse_lines(f)
+            except EOFError:
+                pass  # 書き込み中または途中で止まった圧縮ファイル（読めたところまでで終了）
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        if not follow:
+            yield from _parse_lines(f)
+            return
+        pending = ""
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                time.sleep(poll_interval)
+                continue
+            pending += chunk
+            if not pending.endswith("\n"):
+                continue  # 書きかけの行は続きが追記されるまで待つ
+            line, pending = pending, ""
+            if line.strip():
+                yield json.loads(line)
+
+def _parse_lines(lines: Iterable[str]) -> Iterator[Dict]:
+    for line in lines:
+        if not line.endswith("\n"):
+            break  # 書き込み途中で止まった末尾の行
+        if line.strip():
+            yield json.loads(line)
+
+def jsonl_path(directory: Path, prefix: str, timestamp: str, compress: bool = False) -> Path:
+    """<directory>/<prefix>_<timestamp>.jsonl(.gz) のパス"""
+    return Path(directory) / f"{prefix}_{timestamp}.jsonl{'.gz' if compress else ''}"
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from ..utils.config import CACHE_DIR, MATCHING_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    job_key TEXT NOT NULL,
+    profile_hash TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_version TEXT NOT NULL,
+    score REAL NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (job_key, profile_hash, model, prompt_version)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_last_used ON scores(last_used);
+CREATE INDEX IF NOT EXISTS idx_scores_created_at ON scores(created_at);
+"""
+
+# 件数の上限を超えたときに余分に削除する件数（上限の1割まで。保存のたびに削除が走るのを避ける）
+_EVICT_MARGIN = 100
+
+def job_score_key(job: Mapping) -> str:
+    """案件のキャッシュキー（案件IDと、プロンプトに含める項目のハッシュ）
+
+    案件の内容が更新された場合は別のキーになり、評価し直す。
+    """
+    content = json.dumps(
+        [job['title'], job['category'], dict(job['budget']), job['description']], ensure_ascii=False
+    )
+    return f"{job.get('job_id') or ''}:{hashlib.sha1(content.encode('utf-8')).hexdigest()[:16]}"
+
+def profile_hash(user_profile) -> str:
+    """ユーザープロファイルのハッシュ（内容が同じであれば同じ値）"""
+    content = json.dumps(asdict(user_profile), ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+class ScoreCache:
+    """LLMによる案件の関連度スコアを保存するキャッシュ
+
+    キーは (案件のキー, プロファイルのハッシュ, モデル名, プロンプトのバージョン)。
+    ttl_secondsより前に評価したスコアは使わず、件数がmax_entriesを超えると
+    最後に使われた日時が古いものから削除する。ヒット・ミスの回数はインスタンスごとに数える。
+    """
+
+    def __init__(self, path: Path = CACHE_DIR / "score_cache.sqlite3", ttl_seconds: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._prune_expired()
+
+    @classmethod
+    def from_config(cls) -> Optional["ScoreCache"]:
+        """MATCHING_CONFIGから作成する（score_cache_enabledがFalseならNone）"""
+        if not MATCHING_CONFIG.get("score_cache_enabled", False):
+            return None
+        ttl_hours = MATCHING_CONFIG.get("score_cache_ttl_hours")
+        return cls(
+            ttl_seconds=ttl_hours * 3600 if ttl_hours else None,
+            max_entries=MATCHING_CONFIG.get("score_cache_max_entries")
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def get(self, job_key: str, context: Tuple[str, str, str]) -> Optional[float]:
+        """キャッシュされたスコア（無い・期限切れの場合はNone）
+
+        contextは (プロファイルのハッシュ, モデル名, プロンプトのバージョン)。
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT score, created_at FROM scores "
+                "WHERE job_key = ? AND profile_hash = ? AND model = ? AND prompt_version = ?",
+                (job_key, *context)
+            ).fetchone()
+            if row is None or (self.ttl_seconds is not None and row[1] < now - self.ttl_seconds):
+                self.misses += 1
+                return None
+            self.hits += 1
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE scores SET last_used = ? "
+                    "WHERE job_key = ? AND profile_hash = ? AND model = ? AND prompt_version = ?",
+                    (now, job_key, *context)
+                )
+        return row[0]
+
+    def put_many(self, scores: Iterable[Tuple[str, float]], context: Tuple[str, str, str]):
+        """(案件のキー, スコア) をまとめて保存する"""
+        now = time.time()
+        rows = [(job_key, *context, score, now, now) for job_key, score in scores]
+        if not rows:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+                self._evict()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def _prune_expired(self):
+        """有効期限を過ぎたスコアを削除する"""
+        if self.ttl_seconds is None:
+            return
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM scores WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+
+    def _evict(self):
+        """件数の上限を超えていれば、最後に使われた日時が古いものから削除する"""
+        if self.max_entries is None:
+            return
+        entries = self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        if entries <= self.max_entries:
+            return
+        excess = entries - self.max_entries + min(_EVICT_MARGIN, self.max_entries // 10)
+        self._conn.execute(
+            "DELETE FROM scores WHERE rowid IN (SELECT rowid FROM scores ORDER BY last_used LIMIT ?)", (excess,)
+        )
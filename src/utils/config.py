@@ -8,9 +8,12 @@ DATA_DIR = ROOT_DIR / "data"
 HTML_DIR = DATA_DIR / "html"
 JOBS_DIR = DATA_DIR / "jobs"
 MATCHES_DIR = DATA_DIR / "matches"
+STATE_DIR = DATA_DIR / "state"
+ARCHIVE_DIR = DATA_DIR / "archive"
+CACHE_DIR = DATA_DIR / "cache"
 
 # 各ディレクトリを作成
-for dir_path in [DATA_DIR, HTML_DIR, JOBS_DIR, MATCHES_DIR]:
+for dir_path in [DATA_DIR, HTML_DIR, JOBS_DIR, MATCHES_DIR, STATE_DIR, ARCHIVE_DIR, CACHE_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 # スクレイピング設定
@@ -22,14 +25,61 @@ SCRAPING_CONFIG = {
         "hide_expired": "true"
     },
     "retry_count": 3,
-    "retry_delay": 5  # seconds
+    "retry_delay": 5,  # seconds（失敗ごとに2倍、retry_max_delayまで）
+    "retry_max_delay": 60,  # seconds
+    # ホストごとの取得レート（リクエスト/秒）。成功が続くと上げ、タイムアウトや429/5xxで下げる
+    "rate_limit": {
+        "initial_rate": 0.5,
+        "min_rate": 0.1,
+        "max_rate": 2.0,
+        "burst": 1,
+        "increase_step": 0.05,
+        "decrease_factor": 0.5,
+    },
+    "fetch_backend": "browser",  # "browser"（Playwright）または "http"（ブラウザなし、必要時はブラウザにフォールバック）
+    "browser_recycle_pages": 50,  # 同じブラウザで処理するページ数の上限（超えたら再起動）
+    "max_concurrency_per_host": 3,  # 並行スクレイピング時の同一ホストへの最大同時接続数
+    "ready_selector": "div.UNzN7",  # ページの準備完了を判定する案件カードのセレクター
+    "ready_timeout": 15,  # 案件カードが揃うまでの最大待機時間（秒）
+    "ready_stable_ms": 500,  # カード数がこの時間変化しなければ準備完了とみなす（ミリ秒）
+    "ready_container_selector": "main",  # 一覧の枠のセレクター（案件が0件のページの判定に使う）
+    "ready_empty_texts": ["仕事が見つかりませんでした", "該当する仕事はありません"],  # 検索結果が0件のときに表示される文言（あれば待たずに準備完了）
+    "ready_empty_stable_ms": 2000,  # 一覧の枠が現れてからカードが0件のままこの時間経過したら、案件の無いページとみなす（ミリ秒）
+    # 一覧ページで取得しないリソース（案件カードのDOMには不要なもの）
+    "resource_blocking": {
+        "enabled": True,
+        "resource_types": ["image", "font", "media"],
+        "url_patterns": [
+            r"google-analytics\.com",
+            r"googletagmanager\.com",
+            r"doubleclick\.net",
+            r"googlesyndication\.com",
+            r"connect\.facebook\.net",
+            r"analytics\.twitter\.com",
+            r"bat\.bing\.com",
+            r"hotjar\.com",
+            r"clarity\.ms",
+            r"nr-data\.net",
+        ],
+    },
 }
 
 # マッチング設定
 MATCHING_CONFIG = {
     "min_score": 80,
     "max_jobs": 20,
-    "batch_size": 10,
+    "batch_size": 20,  # 1回のLLM呼び出しで評価する案件数の上限（prompt_token_limitsを超える場合はより少なくなる）
+    "prompt_token_limits": {  # モデルごとの1回のプロンプトの推定トークン数の上限（超えないように案件をバッチに詰める）
+        "qwen2.5:latest": 6000,
+        "deepseek-chat": 24000,
+    },
+    "ollama_num_ctx": 8192,  # Ollamaのコンテキスト長（既定の2048では長いプロンプトが切り捨てられる。プロンプトの上限＋出力分より大きくする）
+    "max_description_tokens": 1500,  # 説明文の推定トークン数がこれを超える案件は、プロンプト上で説明文を切り詰める（Noneで切り詰めない）
+    "scoring": "llm",  # 関連度の採点方法: "llm" / "bm25"（LLMを使わず文字n-gramのBM25で採点、最も高い案件を100点とする）
+    "max_concurrent_batches": 4,  # 同時にLLMへ送るバッチ数（1=順に評価。OllamaはOLLAMA_NUM_PARALLEL以下が目安）
+    "score_cache_enabled": True,  # 評価済みのスコアを保存し、同じ案件・プロファイル・モデルでは再評価しないかどうか
+    "score_cache_ttl_hours": 24 * 7,  # スコアキャッシュの有効期限（時間、Noneで無期限）
+    "score_cache_max_entries": 200_000,  # スコアキャッシュの件数上限（超えた分は最後に使われた日時が古いものから削除）
     "llm_type": "local",
     "llm_model": "qwen2.5:latest",
     "temperature": 0.2,
@@ -38,6 +88,16 @@ MATCHING_CONFIG = {
 
 
 
+# LLM評価の前に案件を絞り込むプレフィルターの設定
+PREFILTER_CONFIG = {
+    "method": None,  # None（絞り込まない） / "embedding"（Ollamaの埋め込みモデルとの類似度） / "bm25"（文字n-gramのBM25、モデル不要）
+    "top_k": 30,  # 類似度・スコアの高い順にLLMで評価する件数（Noneで件数を制限しない）
+    "min_similarity": None,  # embedding: これ未満のコサイン類似度の案件はLLMで評価しない（Noneで下限なし）
+    "min_bm25_score": None,  # bm25: これ未満のBM25スコアの案件はLLMで評価しない（Noneで下限なし）
+    "embedding_model": "nomic-embed-text",  # 埋め込みに使うOllamaのモデル（ollama pullで取得しておく）
+    "max_chars": 2000,  # 埋め込む案件テキストの最大文字数
+}
+
 # LLMカテゴリ選択設定
 LLM_CATEGORY_SELECTION_CONFIG = {
     "max_categories": 2,
@@ -72,14 +132,34 @@ USER_PROFILE_CONFIG = {
 
 
 
+# 案件抽出設定
+EXTRACTION_CONFIG = {
+    "parser_backend": "lxml",  # HTMLの解析方法: "html.parser"（従来のBeautifulSoup） / "bs4-lxml" / "lxml"（XPathで直接取得、最速）
+    "partial_parse": True,  # 案件カードの部分木だけを解析し、ヘッダー・サイドバー等は読み込み時に捨てる
+    "parallel_workers": 0,  # 複数ファイル・アーカイブから抽出するときのプロセス数（0=CPUコア数）
+    "cache_enabled": True,  # 抽出結果をHTMLの内容のハッシュごとにキャッシュし、同じページの再解析を省くかどうか
+    "cache_max_mb": 200,  # 抽出結果キャッシュの容量上限（MB、超えた分は最後に使われた日時が古いものから削除）
+    "parallel_min_items": 50,  # この件数未満のページは並列化せず1プロセスで抽出する（プロセス起動の方が高くつくため）
+}
+
 # 実行オプション設定
 EXECUTION_CONFIG = {
     "save_detailed_logs": True,  # 詳細なログを保存するかどうか
-    "save_screenshots": True,    # スクリーンショットを保存するかどうか
+    "save_screenshots": True,    # スクリーンショットを保存するかどうか（Falseの場合はscreenshot_modeに関わらず保存しない）
+    # 撮影（ブラウザでのエンコード）はページ取得中に同期的に行われ、書き込みだけがバックグラウンドで行われる。fullは1ページごとの時間が長くなる
+    "screenshot_mode": "thumbnail",  # "off" / "on_error"（エラー時のみ） / "thumbnail"（表示領域のJPEG） / "full"（フルページPNG）
+    "screenshot_quality": 60,    # thumbnailモードのJPEG品質（0-100）
+    "screenshot_thumbnail_width": 640,  # thumbnailモードの縮小後の幅（Pillowがある場合のみ縮小）
     "max_pages_per_category": 5, # カテゴリごとの最大取得ページ数（1=単一ページ, 2以上=複数ページ）
     "show_progress": True,       # 進捗表示を行うかどうか
     "auto_open_results": False,  # 結果ファイルを自動で開くかどうか
-    "delay_between_categories": 5,  # カテゴリ間の待機時間（秒）
+    "async_scraping": False,     # 複数ページ・複数カテゴリを並行取得するかどうか
+    "stream_extraction": True,   # 取得したHTMLをファイルを経由せずに抽出するかどうか（async_scraping時は無効）
+    "archive_raw_html": True,    # stream_extraction時に生のHTMLをバックグラウンドでアーカイブ（data/archive）に保存するかどうか
+    "archive_max_mb": 500,       # HTMLアーカイブの容量上限（MB、超えた分は古いものから削除）
+    "archive_retention_days": 90,  # HTMLアーカイブの保存期間（日）
+    "save_jobs_json": False,     # 案件ストア（data/jobs/jobs.sqlite3）に加えて、従来のタイムスタンプ付きJSONにも保存するかどうか
+    "incremental_crawl": True,   # 全て取得済みの案件だけのページに達したらページ送りを打ち切るかどうか
 }
 
 # 出力設定
@@ -89,4 +169,6 @@ OUTPUT_CONFIG = {
     "detailed_summary": True,    # 詳細なサマリーを表示するかどうか
     "show_file_sizes": True,     # ファイルサイズを表示するかどうか
     "export_formats": ["json", "csv"],  # 出力形式
+    "jsonl_output": True,        # 抽出した案件と評価結果を1件ずつJSON Lines（data/jobs/jobs_*.jsonl, data/matches/evaluations_*.jsonl）に追記するかどうか
+    "jsonl_compress": False,     # JSON Linesをgzipで圧縮するかどうか（圧縮時は追記中のファイルをtailできない）
 } 
\ No newline at end of file
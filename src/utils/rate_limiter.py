@@ -0,0 +1,179 @@
+import asyncio
+import random
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+from urllib.parse import urlparse
+from .config import SCRAPING_CONFIG
+
+T = TypeVar("T")
+
+# リトライ対象のHTTPステータス
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+class RetryableStatusError(Exception):
+    """429/5xxなど、時間を置けば成功する可能性のあるレスポンス"""
+
+    def __init__(self, status_code: int, url: str = ""):
+        super().__init__(f"HTTP {status_code}: {url}")
+        self.status_code = status_code
+        self.url = url
+
+def is_retryable_error(error: BaseException) -> bool:
+    """タイムアウトや429/5xxなどリトライすべきエラーかどうか"""
+    if isinstance(error, (RetryableStatusError, TimeoutError, ConnectionError)):
+        return True
+    # Playwright / httpx / requestsのタイムアウト・接続エラーはクラス名で判定する
+    name = type(error).__name__
+    return "Timeout" in name or "Connect" in name
+
+class TokenBucket:
+    """トークンバケット（スレッドセーフ、同期・非同期の両方から使える）
+
+    トークンが足りない場合も先に予約して待ち時間を返すため、
+    同時に待っている呼び出しは到着順にrate間隔で実行される。
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate  # 1秒あたりのトークン補充数
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill()
+            self.rate = rate
+
+    def reserve(self) -> float:
+        """トークンを1つ予約し、使用可能になるまでの待ち時間（秒）を返す"""
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+class AdaptiveRateLimiter:
+    """ホストごとのトークンバケットで取得間隔を制御する
+
+    成功が続くとレートを少しずつ上げ（加算）、タイムアウトや429/5xxでは
+    レートを大きく下げる（乗算）。これによりサイトが許容する範囲で
+    できるだけ速い間隔に収束する。
+    """
+
+    def __init__(self, initial_rate: float = 0.5, min_rate: float = 0.1, max_rate: float = 2.0,
+                 burst: float = 1.0, increase_step: float = 0.05, decrease_factor: float = 0.5):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls) -> "AdaptiveRateLimiter":
+        return cls(**SCRAPING_CONFIG.get("rate_limit", {}))
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.initial_rate, self.burst)
+            return self._buckets[host]
+
+    def rate_for(self, url: str) -> float:
+        return self.bucket_for(url).rate
+
+    def on_success(self, url: str):
+        bucket = self.bucket_for(url)
+        bucket.set_rate(min(self.max_rate, bucket.rate + self.increase_step))
+
+    def on_throttle(self, url: str):
+        bucket = self.bucket_for(url)
+        bucket.set_rate(max(self.min_rate, bucket.rate * self.decrease_factor))
+
+class RetryPolicy:
+    """レート制限を通して処理を実行し、失敗時は指数バックオフでリトライする"""
+
+    def __init__(self, limiter: AdaptiveRateLimiter, retry_count: int = 3, retry_delay: float = 5.0,
+                 max_delay: float = 60.0):
+        self.limiter = limiter
+        self.retry_count = retry_count
+        self.retry_delay = retry_delay
+        self.max_delay = max_delay
+
+    @classmethod
+    def from_config(cls, limiter: AdaptiveRateLimiter) -> "RetryPolicy":
+        return cls(
+            limiter,
+            retry_count=SCRAPING_CONFIG.get("retry_count", 3),
+            retry_delay=SCRAPING_CONFIG.get("retry_delay", 5),
+            max_delay=SCRAPING_CONFIG.get("retry_max_delay", 60),
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """attempt回目（0始まり）の失敗後の待ち時間（±20%のゆらぎ付き）"""
+        delay = min(self.max_delay, self.retry_delay * (2 ** attempt))
+        return delay * random.uniform(0.8, 1.2)
+
+    def call(self, url: str, func: Callable[[], T]) -> T:
+        """funcを実行する（リトライ対象外のエラーはそのまま送出）"""
+        for attempt in range(self.retry_count + 1):
+            self.limiter.bucket_for(url).acquire()
+            try:
+                result = func()
+            except Exception as e:
+                if not is_retryable_error(e) or attempt >= self.retry_count:
+                    raise
+                self.limiter.on_throttle(url)
+                delay = self.backoff(attempt)
+                print(f"  🔁 リトライ {attempt + 1}/{self.retry_count}（{delay:.1f}秒後）: {e}")
+                time.sleep(delay)
+            else:
+                self.limiter.on_success(url)
+                return result
+
+    async def call_async(self, url: str, func: Callable[[], Awaitable[T]]) -> T:
+        """callの非同期版（funcはコルーチンを返す関数）"""
+        for attempt in range(self.retry_count + 1):
+            await self.limiter.bucket_for(url).acquire_async()
+            try:
+                result = await func()
+            except Exception as e:
+                if not is_retryable_error(e) or attempt >= self.retry_count:
+                    raise
+                self.limiter.on_throttle(url)
+                delay = self.backoff(attempt)
+                print(f"  🔁 リトライ {attempt + 1}/{self.retry_count}（{delay:.1f}秒後）: {e}")
+                await asyncio.sleep(delay)
+            else:
+                self.limiter.on_success(url)
+                return result
+
+_shared_policy: Optional[RetryPolicy] = None
+
+def get_retry_policy() -> RetryPolicy:
+    """全てのスクレイパーで共有するリトライポリシー（レート制限込み）"""
+    global _shared_policy
+    if _shared_policy is None:
+        _shared_policy = RetryPolicy.from_config(AdaptiveRateLimiter.from_config())
+    return _shared_policy
@@ -0,0 +1,23 @@
+# ASCIIの文字1文字あたりのトークン数（ASCII以外の文字は1文字1トークンとして数える）
+_ASCII_TOKENS_PER_CHAR = 0.25
+
+def estimate_tokens(text: str) -> int:
+    """トークナイザーを使わないテキストのトークン数の概算
+
+    日本語などASCII以外の文字は1文字1トークン、ASCIIの文字は4文字で1トークンとして数える。
+    Qwen・DeepSeekでは日本語は1文字1トークン未満になることが多いため、多めの見積もりになる。
+    """
+    ascii_chars = len(text.encode('ascii', 'ignore'))
+    return (len(text) - ascii_chars) + -(-ascii_chars // 4)
+
+def truncate_to_tokens(text: str, max_tokens: int, suffix: str = "…（以下省略）") -> str:
+    """推定トークン数がmax_tokensを超えるテキストを、末尾にsuffixを付けて切り詰める"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    budget = max_tokens - estimate_tokens(suffix)
+    tokens = 0.0
+    for i, char in enumerate(text):
+        tokens += _ASCII_TOKENS_PER_CHAR if char < '\x80' else 1.0
+        if tokens > budget:
+            return text[:i] + suffix
+    return text